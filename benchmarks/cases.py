@@ -0,0 +1,348 @@
+"""Benchmark cases covering the image and video hot paths.
+
+Every case is a function taking the frame resolution and box count and
+returning `(run, frames_per_call)`: `run` is the zero-argument callable
+that is timed and `frames_per_call` is the number of frames it processes.
+Setup work (synthetic frames, temporary files) happens before `run` is
+returned and is not timed.
+"""
+
+from __future__ import annotations
+
+import itertools
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+import cv2
+import numpy as np
+
+from cogcvutil.common.converter.color import convert_color
+from cogcvutil.image.annotator.bounding_box import (
+    visualize_bbox,
+    visualize_bbox_batch,
+    visualize_bbox_with_annotations,
+)
+from cogcvutil.image.annotator.overlay_layer import OverlayLayer
+from cogcvutil.image.annotator.text_annotator import TextAnnotator
+from cogcvutil.image.common.utility.frame_store import FrameStore
+from cogcvutil.image.common.utility.image_cache import ImageCache
+from cogcvutil.image.common.utility.io_util import (
+    read_image,
+    read_images_sorted,
+    save_image,
+)
+from cogcvutil.image.filter.image_filter import ImageFilter
+from cogcvutil.video.writer.images_to_video import VideoWriter
+from cogcvutil.video.writer.segmented import SegmentedVideoWriter
+
+RESOLUTIONS = {
+    "480p": (854, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+}
+BOX_COUNTS = (1, 8, 64)
+DIRECTORY_FRAMES = 16
+VIDEO_FRAMES = 16
+
+Case = Callable[[tuple[int, int], int], tuple[Callable[[], object], int]]
+CASES: dict[str, tuple[Case, bool]] = {}
+
+
+def case(uses_boxes: bool = False) -> Callable[[Case], Case]:
+    """Register a benchmark case, optionally parametrized by box count."""
+
+    def register(func: Case) -> Case:
+        CASES[func.__name__] = (func, uses_boxes)
+        return func
+
+    return register
+
+
+def synthetic_frame(size: tuple[int, int], seed: int = 0) -> np.ndarray:
+    """Return a smooth RGB frame with some noise, so codecs do real work."""
+    width, height = size
+    rng = np.random.default_rng(seed)
+    ys, xs = np.mgrid[0:height, 0:width]
+    frame = np.stack(
+        [xs * 255 // width, ys * 255 // height, (xs + ys) * 127 // width],
+        axis=-1,
+    ).astype(np.uint8)
+    frame += rng.integers(0, 16, frame.shape, dtype=np.uint8)
+    return frame
+
+
+def synthetic_boxes(size: tuple[int, int], num_boxes: int) -> np.ndarray:
+    """Return `num_boxes` random boxes of 2-10% of the frame size."""
+    width, height = size
+    rng = np.random.default_rng(num_boxes)
+    box_w = rng.integers(width // 50, width // 10, num_boxes)
+    box_h = rng.integers(height // 50, height // 10, num_boxes)
+    x1 = rng.integers(0, width - box_w)
+    y1 = rng.integers(0, height - box_h)
+    return np.stack([x1, y1, x1 + box_w, y1 + box_h], axis=1)
+
+
+def _temp_dir() -> Path:
+    """Return a temporary directory removed when the process exits."""
+    directory = tempfile.TemporaryDirectory()
+    _TEMP_DIRS.append(directory)
+    return Path(directory.name)
+
+
+_TEMP_DIRS: list[tempfile.TemporaryDirectory] = []
+
+
+@case(uses_boxes=True)
+def filter_black(size: tuple[int, int], num_boxes: int) -> tuple:
+    """ImageFilter.apply_filter_to_bbox with the black filter."""
+    image, boxes = synthetic_frame(size), synthetic_boxes(size, num_boxes)
+    image_filter = ImageFilter()
+    return lambda: image_filter.apply_filter_to_bbox(image, boxes, "black"), 1
+
+
+@case(uses_boxes=True)
+def filter_blur(size: tuple[int, int], num_boxes: int) -> tuple:
+    """ImageFilter.apply_filter_to_bbox with the blur filter."""
+    image, boxes = synthetic_frame(size), synthetic_boxes(size, num_boxes)
+    image_filter = ImageFilter()
+    return (
+        lambda: image_filter.apply_filter_to_bbox(image, boxes, "blur", 51),
+        1,
+    )
+
+
+@case(uses_boxes=True)
+def filter_pyramid_blur(size: tuple[int, int], num_boxes: int) -> tuple:
+    """ImageFilter.apply_filter_to_bbox with the pyramid_blur filter."""
+    image, boxes = synthetic_frame(size), synthetic_boxes(size, num_boxes)
+    image_filter = ImageFilter()
+    return (
+        lambda: image_filter.apply_filter_to_bbox(
+            image, boxes, "pyramid_blur", 51
+        ),
+        1,
+    )
+
+
+@case(uses_boxes=True)
+def filter_box_blur(size: tuple[int, int], num_boxes: int) -> tuple:
+    """ImageFilter.apply_filter_to_bbox with the box_blur filter."""
+    image, boxes = synthetic_frame(size), synthetic_boxes(size, num_boxes)
+    image_filter = ImageFilter()
+    return (
+        lambda: image_filter.apply_filter_to_bbox(image, boxes, "box_blur", 51),
+        1,
+    )
+
+
+@case(uses_boxes=True)
+def filter_mosaic(size: tuple[int, int], num_boxes: int) -> tuple:
+    """ImageFilter.apply_filter_to_bbox with the mosaic filter."""
+    image, boxes = synthetic_frame(size), synthetic_boxes(size, num_boxes)
+    image_filter = ImageFilter()
+    return (
+        lambda: image_filter.apply_filter_to_bbox(image, boxes, "mosaic", 51),
+        1,
+    )
+
+
+@case(uses_boxes=True)
+def bbox(size: tuple[int, int], num_boxes: int) -> tuple:
+    """visualize_bbox on a fresh copy of the frame."""
+    image, boxes = synthetic_frame(size), synthetic_boxes(size, num_boxes)
+    return lambda: visualize_bbox(image.copy(), boxes, 2), 1
+
+
+@case(uses_boxes=True)
+def bbox_with_annotations(size: tuple[int, int], num_boxes: int) -> tuple:
+    """visualize_bbox_with_annotations on a fresh copy of the frame."""
+    image, boxes = synthetic_frame(size), synthetic_boxes(size, num_boxes)
+    labels = [f"class_{idx % 10}" for idx in range(num_boxes)]
+    confs = np.linspace(0.1, 0.99, num_boxes).tolist()
+    return (
+        lambda: visualize_bbox_with_annotations(
+            image.copy(), boxes, labels, confs, 2
+        ),
+        1,
+    )
+
+
+@case(uses_boxes=True)
+def bbox_batch(size: tuple[int, int], num_boxes: int) -> tuple:
+    """visualize_bbox_batch with the labels of bbox_with_annotations."""
+    image, boxes = synthetic_frame(size), synthetic_boxes(size, num_boxes)
+    labels = [f"class_{idx}" for idx in range(10)]
+    label_indices = np.arange(num_boxes) % 10
+    confs = np.linspace(0.1, 0.99, num_boxes)
+    return (
+        lambda: visualize_bbox_batch(
+            image.copy(),
+            boxes,
+            labels=labels,
+            label_indices=label_indices,
+            confs=confs,
+            bbox_border_thickness=2,
+        ),
+        1,
+    )
+
+
+@case()
+def insert_annotation(size: tuple[int, int], _: int) -> tuple:
+    """TextAnnotator.insert_annotation with three overlay lines."""
+    image = synthetic_frame(size)
+    annotator = TextAnnotator()
+    lines = ["camera 01", "job: redaction", "frame 000123"]
+    return lambda: annotator.insert_annotation(image, lines, "upper_right"), 1
+
+
+@case()
+def overlay_layer(size: tuple[int, int], _: int) -> tuple:
+    """OverlayLayer.composite with two static lines and a frame counter."""
+    image = synthetic_frame(size)
+    layer = OverlayLayer(["camera 01", "job: redaction"], "upper_right")
+    counter = itertools.count()
+    return (
+        lambda: layer.composite(image, [f"frame {next(counter):06d}"]),
+        1,
+    )
+
+
+@case()
+def convert_color_batch(size: tuple[int, int], _: int) -> tuple:
+    """convert_color of a 16-frame RGB stack to YUV in one call."""
+    stack = np.stack([synthetic_frame(size, seed=idx) for idx in range(16)])
+    out = np.empty_like(stack)
+    return lambda: convert_color(stack, "rgb", "yuv", out=out), len(stack)
+
+
+@case()
+def read_image_png(size: tuple[int, int], _: int) -> tuple:
+    """read_image of a PNG file."""
+    path = _temp_dir() / "frame.png"
+    save_image(synthetic_frame(size), path)
+    return lambda: read_image(path), 1
+
+
+@case()
+def read_image_jpeg(size: tuple[int, int], _: int) -> tuple:
+    """read_image of a JPEG file."""
+    path = _temp_dir() / "frame.jpg"
+    save_image(synthetic_frame(size), path)
+    return lambda: read_image(path), 1
+
+
+@case()
+def read_image_jpeg_preview(size: tuple[int, int], _: int) -> tuple:
+    """read_image of a JPEG file, decoded to a quarter-scale preview."""
+    path = _temp_dir() / "frame.jpg"
+    save_image(synthetic_frame(size), path)
+    preview_size = (size[0] // 4, size[1] // 4)
+    return lambda: read_image(path, target_size=preview_size), 1
+
+
+@case()
+def read_image_cached(size: tuple[int, int], _: int) -> tuple:
+    """ImageCache.read_image of a PNG file that is already cached."""
+    path = _temp_dir() / "frame.png"
+    save_image(synthetic_frame(size), path)
+    cache = ImageCache()
+    cache.read_image(path)
+    return lambda: cache.read_image(path), 1
+
+
+@case()
+def read_images_sorted_png(size: tuple[int, int], _: int) -> tuple:
+    """read_images_sorted of a directory of PNG frames."""
+    directory = _temp_dir()
+    for idx in range(DIRECTORY_FRAMES):
+        frame = synthetic_frame(size, seed=idx)
+        cv2.imwrite(str(directory / f"frame_{idx}.png"), frame)
+    return lambda: read_images_sorted(str(directory)), DIRECTORY_FRAMES
+
+
+@case()
+def frame_store_read(size: tuple[int, int], _: int) -> tuple:
+    """Reading every frame of a FrameStore, the read_images_sorted analog."""
+    store = FrameStore.create(_temp_dir() / "frames.cgfs", (*size[::-1], 3))
+    store.append(
+        synthetic_frame(size, seed=idx) for idx in range(DIRECTORY_FRAMES)
+    )
+    return lambda: [frame.sum(dtype=np.uint64) for frame in store], (
+        DIRECTORY_FRAMES
+    )
+
+
+@case()
+def save_image_png(size: tuple[int, int], _: int) -> tuple:
+    """save_image to PNG."""
+    image, path = synthetic_frame(size), _temp_dir() / "frame.png"
+    return lambda: save_image(image, path), 1
+
+
+@case()
+def video_writer_mp4(size: tuple[int, int], _: int) -> tuple:
+    """VideoWriter encoding throughput with the default libx264 settings."""
+    directory = _temp_dir()
+    frames = [synthetic_frame(size, seed=idx) for idx in range(VIDEO_FRAMES)]
+
+    def run() -> None:
+        with VideoWriter(directory, "bench", streaming=True) as writer:
+            for frame in frames:
+                writer.add_frame(frame)
+
+    return run, VIDEO_FRAMES
+
+
+@case()
+def video_writer_mp4_realtime(size: tuple[int, int], _: int) -> tuple:
+    """VideoWriter encoding throughput with the "realtime" preset."""
+    directory = _temp_dir()
+    frames = [synthetic_frame(size, seed=idx) for idx in range(VIDEO_FRAMES)]
+
+    def run() -> None:
+        with VideoWriter(
+            directory, "bench", streaming=True, preset="realtime"
+        ) as writer:
+            for frame in frames:
+                writer.add_frame(frame)
+
+    return run, VIDEO_FRAMES
+
+
+@case()
+def video_writer_segmented(size: tuple[int, int], _: int) -> tuple:
+    """SegmentedVideoWriter with the "realtime" preset on four workers."""
+    directory = _temp_dir()
+    frames = [synthetic_frame(size, seed=idx) for idx in range(VIDEO_FRAMES)]
+
+    def run() -> None:
+        SegmentedVideoWriter(
+            directory,
+            "bench",
+            frame_sequence=frames,
+            preset="realtime",
+            threads=1,
+            segment_frames=VIDEO_FRAMES // 4,
+            gop_size=VIDEO_FRAMES // 4,
+        ).write()
+
+    return run, VIDEO_FRAMES
+
+
+@case()
+def video_writer_gif(size: tuple[int, int], _: int) -> tuple:
+    """VideoWriter GIF export with a shared palette and frame differencing."""
+    directory = _temp_dir()
+    frames = [synthetic_frame(size, seed=idx) for idx in range(VIDEO_FRAMES)]
+
+    def run() -> None:
+        with VideoWriter(
+            directory, "bench", output_extension="gif", streaming=True
+        ) as writer:
+            for frame in frames:
+                writer.add_frame(frame)
+
+    return run, VIDEO_FRAMES
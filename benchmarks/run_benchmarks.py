@@ -0,0 +1,219 @@
+"""Run the cogcvutil benchmark suite and store the results as JSON.
+
+Usage:
+    python -m benchmarks.run_benchmarks --output results.json
+    python -m benchmarks.run_benchmarks --cases filter_blur --resolutions 4k
+    python -m benchmarks.run_benchmarks --compare base.json results.json
+
+Each case and parameter combination runs in a fresh subprocess, so the
+reported peak RSS belongs to that case alone. Timings are the median of
+repeated calls after one warm-up call.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import platform
+import queue
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks.cases import BOX_COUNTS, CASES, RESOLUTIONS
+
+# Seconds between checks that a case subprocess is still alive
+POLL_SECONDS = 1.0
+
+
+def _peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _run_case(
+    name: str,
+    resolution: str,
+    num_boxes: int,
+    min_time: float,
+    results: multiprocessing.Queue,
+) -> None:
+    """Time one case in the current process and report through a queue."""
+    func, _ = CASES[name]
+    run, frames_per_call = func(RESOLUTIONS[resolution], num_boxes)
+    rss_before = _peak_rss_mb()
+    run()  # warm up
+    timings = []
+    start = time.perf_counter()
+    while not timings or time.perf_counter() - start < min_time:
+        tic = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - tic)
+    median = statistics.median(timings)
+    results.put(
+        {
+            "case": name,
+            "resolution": resolution,
+            "num_boxes": num_boxes,
+            "calls": len(timings),
+            "median_seconds": median,
+            "frames_per_second": frames_per_call / median,
+            "peak_rss_mb": _peak_rss_mb(),
+            "case_rss_mb": _peak_rss_mb() - rss_before,
+        }
+    )
+
+
+def _git_commit() -> str | None:
+    """Return the current git commit, if available."""
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "HEAD"],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def run_suite(
+    cases: list[str], resolutions: list[str], min_time: float
+) -> dict:
+    """Run the selected cases and return the results document."""
+    import cv2  # noqa: PLC0415
+    import numpy as np  # noqa: PLC0415
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for name in cases:
+        _, uses_boxes = CASES[name]
+        for resolution in resolutions:
+            for num_boxes in BOX_COUNTS if uses_boxes else (0,):
+                result = _run_isolated(
+                    context, name, resolution, num_boxes, min_time
+                )
+                results.append(result)
+                sys.stdout.write(_format_row(result) + "\n")
+                sys.stdout.flush()
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__,
+            "min_time": min_time,
+        },
+        "results": results,
+    }
+
+
+def _run_isolated(
+    context: multiprocessing.context.BaseContext,
+    name: str,
+    resolution: str,
+    num_boxes: int,
+    min_time: float,
+) -> dict:
+    """Run one case in a subprocess, recording a failure if it dies."""
+    results = context.Queue()
+    process = context.Process(
+        target=_run_case,
+        args=(name, resolution, num_boxes, min_time, results),
+    )
+    process.start()
+    result = None
+    while result is None:
+        # A process that exited has flushed its result, if any, so one
+        # more get after it died is enough to receive it
+        alive = process.is_alive()
+        try:
+            result = results.get(timeout=POLL_SECONDS)
+        except queue.Empty:
+            if not alive:
+                break
+    process.join()
+    if result is None or process.exitcode != 0:
+        result = {
+            "case": name,
+            "resolution": resolution,
+            "num_boxes": num_boxes,
+            "error": f"exited with code {process.exitcode}",
+        }
+    return result
+
+
+def _format_row(result: dict, baseline: dict | None = None) -> str:
+    """Format one result as a table row."""
+    label = f"{result['case']}[{result['resolution']}"
+    if result["num_boxes"]:
+        label += f", {result['num_boxes']} boxes"
+    if "error" in result:
+        return f"{label + ']':<48} failed: {result['error']}"
+    row = (
+        f"{label + ']':<48} {result['frames_per_second']:>10.1f} fps"
+        f" {result['peak_rss_mb']:>9.1f} MiB"
+    )
+    if baseline and "error" not in baseline:
+        ratio = result["frames_per_second"] / baseline["frames_per_second"]
+        row += f" {ratio:>7.2f}x"
+    return row
+
+
+def compare(baseline_path: str, current_path: str) -> None:
+    """Print the speed ratio of two result files, current over baseline."""
+    with open(baseline_path) as file:  # noqa: PTH123
+        baseline = json.load(file)
+    with open(current_path) as file:  # noqa: PTH123
+        current = json.load(file)
+
+    def key(result: dict) -> tuple:
+        return (result["case"], result["resolution"], result["num_boxes"])
+
+    baseline_results = {key(result): result for result in baseline["results"]}
+    for result in current["results"]:
+        reference = baseline_results.get(key(result))
+        sys.stdout.write(_format_row(result, reference) + "\n")
+
+
+def main() -> None:
+    """Parse the command line and run or compare benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES))
+    parser.add_argument("--resolutions", nargs="+", choices=list(RESOLUTIONS))
+    parser.add_argument("--min-time", type=float, default=1.0)
+    parser.add_argument("--output", help="Path of the JSON results file.")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASELINE", "CURRENT"),
+        help="Compare two result files instead of running benchmarks.",
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    document = run_suite(
+        args.cases or list(CASES),
+        args.resolutions or list(RESOLUTIONS),
+        args.min_time,
+    )
+    if args.output:
+        with open(args.output, "w") as file:  # noqa: PTH123
+            json.dump(document, file, indent=2)
+    if any("error" in result for result in document["results"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,38 @@
-"""Package containing Swarm Computer Vision."""
+"""Package containing Swarm Computer Vision.
 
-from cogcvutil.image.common.utility.io_util import read_image, save_image
+The public API is loaded lazily (PEP 562), so `import cogcvutil` does not
+import OpenCV, NumPy or PIL until an attribute that needs them is used.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from cogcvutil.image.common.utility.io_util import read_image, save_image
+
+# Public attribute -> module defining it
+_LAZY_ATTRIBUTES = {
+    "read_image": "cogcvutil.image.common.utility.io_util",
+    "save_image": "cogcvutil.image.common.utility.io_util",
+}
 
 __all__ = ["read_image", "save_image"]
 __version__ = "0.0.1"
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import a public attribute on first access and cache it."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the public attributes, including those not loaded yet."""
+    return sorted({*globals(), *__all__})
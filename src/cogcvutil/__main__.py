@@ -0,0 +1,7 @@
+"""Run the `cogcvutil` command with `python -m cogcvutil`."""
+
+import sys
+
+from cogcvutil.cli import main
+
+sys.exit(main())
@@ -0,0 +1,487 @@
+"""Command line interface for sharded batch processing.
+
+`cogcvutil JOB.json` filters, annotates and writes every frame of the
+inputs listed in a job spec::
+
+    {
+        "inputs": ["frames/", "clip.mp4"],
+        "boxes": "boxes.json",
+        "filter": {"type": "blur", "blur_radius": 31},
+        "bbox": {"thickness": 2, "color": "#FF0000"},
+        "overlay": {"lines": ["{input} frame {frame}"], "position": "upper_left"},
+        "output": {"dir": "out/", "format": "mp4", "frame_rate": 20, "preset": "realtime"}
+    }
+
+Inputs are image directories (read in natural numeric order) or video
+files. Only "inputs" and "output.dir" are required; relative paths are
+resolved against the spec's directory. Boxes are read from JSON,
+`{"<input stem>": {"<frame index>": [[x1, y1, x2, y2], ...]}}`, or from
+CSV with the columns `input,frame,x1,y1,x2,y2`. Boxes are blacked out,
+blurred or pixelated by "filter" (any `ImageFilter` filter type; prefer
+"pyramid_blur", "box_blur" or "mosaic" for radii above ~31) and outlined
+by "bbox". Overlay lines may use the `{input}` and `{frame}` placeholders,
+and an optional "style" dict is passed to `TextAnnotator`. Heavy modules
+are imported by the workers, so the command starts quickly.
+
+Every input is split into work units of `--chunk-frames` frames. The
+units of a job are numbered in a fixed order and `--shard i/N` runs every
+N-th of them starting at i, so N machines sharing the output directory
+split one job. Units run on a process pool. A finished unit leaves a
+marker in `<output dir>/.checkpoints`, and restarts skip those units.
+
+Image outputs ("png", "jpg") are written to `<output dir>/<input stem>/`
+with one file per frame. For "mp4" every unit is encoded as a segment,
+and once all segments of an input exist they are joined without
+re-encoding into `<output dir>/<input stem>.mp4`; when the job is split
+across machines, the shard that finishes an input last joins it, or a
+final unsharded run does.
+"""  # noqa: E501
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+from cogcvutil.common.converter.color import hex_to_bgr
+
+IMAGE_FORMATS = ("png", "jpg")
+VIDEO_FORMATS = ("mp4",)
+DEFAULT_CHUNK_FRAMES = 120
+CHECKPOINT_DIR = ".checkpoints"
+SEGMENT_DIR = ".segments"
+
+
+class WorkUnit(NamedTuple):
+    """A range of frames of one input, processed by a single worker."""
+
+    input: str
+    name: str
+    start: int
+    stop: int | None
+
+    @property
+    def key(self) -> str:
+        """Return the unit's checkpoint file name."""
+        return (
+            f"{self.start:08d}-{self.stop if self.stop is not None else 'end'}"
+        )
+
+
+def load_job(path: str | Path) -> dict:
+    """Read and validate a job spec, resolving paths against its directory.
+
+    Args:
+        path (str | Path): Path of the JSON job spec.
+
+    Returns:
+        dict: The job spec with absolute paths and defaults filled in.
+    """
+    path = Path(path)
+    job = json.loads(path.read_text())
+    base = path.resolve().parent
+    if not job.get("inputs") or "dir" not in job.get("output", {}):
+        msg = "A job spec needs 'inputs' and 'output.dir'."
+        raise ValueError(msg)
+    output = {"format": "png", **job["output"]}
+    if output["format"] not in IMAGE_FORMATS + VIDEO_FORMATS:
+        msg = (
+            f"Unsupported output format {output['format']!r}. Choose one "
+            f"of {', '.join(IMAGE_FORMATS + VIDEO_FORMATS)}."
+        )
+        raise ValueError(msg)
+    output["dir"] = str(base / output["dir"])
+    job = {**job, "output": output}
+    job["inputs"] = [str(base / source) for source in job["inputs"]]
+    names = [Path(source).stem for source in job["inputs"]]
+    if len(set(names)) != len(names):
+        msg = "Input names (file or directory stems) must be unique."
+        raise ValueError(msg)
+    # The filter module loads OpenCV, so it is only imported for a job
+    from cogcvutil.image.filter.image_filter import FILTER_TYPES  # noqa: PLC0415
+
+    if job.get("filter", {}).get("type", "black") not in FILTER_TYPES:
+        msg = (
+            f"Unsupported filter type. Choose one of {', '.join(FILTER_TYPES)}."
+        )
+        raise ValueError(msg)
+    job["boxes"] = load_boxes(base / job["boxes"]) if job.get("boxes") else {}
+    return job
+
+
+def load_boxes(path: str | Path) -> dict[str, dict[int, list[list[int]]]]:
+    """Read per-frame boxes from a JSON or CSV file.
+
+    Args:
+        path (str | Path): A .json or .csv boxes file, see the module docs.
+
+    Returns:
+        dict: Boxes by input stem and frame index.
+    """
+    path = Path(path)
+    boxes: dict[str, dict[int, list[list[int]]]] = {}
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="") as file:
+            for row in csv.DictReader(file):
+                boxes.setdefault(row["input"], {}).setdefault(
+                    int(row["frame"]), []
+                ).append(
+                    [int(float(row[key])) for key in ("x1", "y1", "x2", "y2")]
+                )
+        return boxes
+    for name, frames in json.loads(path.read_text()).items():
+        boxes[name] = {int(index): bboxes for index, bboxes in frames.items()}
+    return boxes
+
+
+def count_frames(source: str | Path) -> int:
+    """Return the number of frames of an image directory or video."""
+    # The readers load OpenCV, so they are imported when first needed
+    if Path(source).is_dir():
+        from cogcvutil.image.common.utility.io_util import (  # noqa: PLC0415
+            list_images_sorted,
+        )
+
+        return len(list_images_sorted(source))
+    from cogcvutil.video.reader.video_to_images import (  # noqa: PLC0415
+        VideoReader,
+    )
+
+    return VideoReader(source).num_frames
+
+
+def plan_units(
+    job: dict, chunk_frames: int = DEFAULT_CHUNK_FRAMES
+) -> list[WorkUnit]:
+    """Split every input of a job into work units, in a fixed order.
+
+    The last unit of an input reads to the end, so a frame count that is
+    off by a few frames (as some video containers report) loses nothing.
+    A tail shorter than half a chunk is merged into the previous unit, as
+    an encoder segment of a frame or two does not join cleanly.
+
+    Args:
+        job (dict): The job spec, see `load_job`.
+        chunk_frames (int): Number of frames per unit.
+
+    Returns:
+        list[WorkUnit]: The units of all inputs.
+    """
+    if chunk_frames < 1:
+        msg = "chunk_frames must be positive."
+        raise ValueError(msg)
+    units = []
+    for source in job["inputs"]:
+        num_frames = count_frames(source)
+        starts = list(range(0, max(num_frames, 1), chunk_frames))
+        if len(starts) > 1 and num_frames - starts[-1] < chunk_frames // 2:
+            starts.pop()
+        stops = [*starts[1:], None]
+        name = Path(source).stem
+        units += [
+            WorkUnit(source, name, start, stop)
+            for start, stop in zip(starts, stops)
+        ]
+    return units
+
+
+def parse_shard(shard: str) -> tuple[int, int]:
+    """Parse a "i/N" shard spec into (i, N) with 0 <= i < N."""
+    try:
+        index, count = (int(part) for part in shard.split("/"))
+    except ValueError:
+        index, count = -1, 0
+    if not 0 <= index < count:
+        msg = f"Invalid shard {shard!r}, expected 'i/N' with 0 <= i < N."
+        raise ValueError(msg)
+    return index, count
+
+
+def run_job(
+    job: dict,
+    shard: tuple[int, int] = (0, 1),
+    num_workers: int | None = None,
+    chunk_frames: int = DEFAULT_CHUNK_FRAMES,
+) -> dict:
+    """Process this shard's units of a job and join finished videos.
+
+    Args:
+        job (dict): The job spec, see `load_job`.
+        shard (tuple[int, int]): The (i, N) shard to run. Defaults to the whole job.
+        num_workers (int | None): Size of the process pool, 1 runs units inline. Defaults to the CPU count.
+        chunk_frames (int): Number of frames per unit.
+
+    Returns:
+        dict: The run report: frames, seconds, frames_per_second and unit counts.
+    """  # noqa: E501
+    start_time = time.perf_counter()
+    units = plan_units(job, chunk_frames)
+    checkpoint_dir = Path(job["output"]["dir"]) / CHECKPOINT_DIR
+    index, count = shard
+    todo, skipped = [], 0
+    for unit in units[index::count]:
+        if (checkpoint_dir / unit.name / f"{unit.key}.json").exists():
+            skipped += 1
+        else:
+            todo.append(unit)
+
+    num_workers = num_workers or os.cpu_count() or 1
+    num_frames = 0
+    if num_workers <= 1:
+        for unit in todo:
+            num_frames += process_unit(unit, job)
+    elif todo:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            futures = [
+                executor.submit(process_unit, unit, job) for unit in todo
+            ]
+            for future in as_completed(futures):
+                num_frames += future.result()
+
+    if job["output"]["format"] in VIDEO_FORMATS:
+        _join_segments(job, units)
+    seconds = time.perf_counter() - start_time
+    return {
+        "shard": f"{index}/{count}",
+        "frames": num_frames,
+        "seconds": seconds,
+        "frames_per_second": num_frames / seconds if seconds else 0.0,
+        "units": len(todo) + skipped,
+        "units_processed": len(todo),
+        "units_skipped": skipped,
+    }
+
+
+def process_unit(unit: WorkUnit, job: dict) -> int:
+    """Filter, annotate and write the frames of one unit (pool task).
+
+    Args:
+        unit (WorkUnit): The unit to process.
+        job (dict): The job spec, see `load_job`.
+
+    Returns:
+        int: The number of frames processed.
+    """
+    # Imported by the worker, so the command itself starts quickly
+    from cogcvutil.image.common.utility.io_util import save_image  # noqa: PLC0415
+    from cogcvutil.video.writer.images_to_video import (  # noqa: PLC0415
+        VideoWriter,
+    )
+
+    output = job["output"]
+    output_dir = Path(output["dir"])
+    boxes = job["boxes"].get(unit.name, {})
+    process = _frame_processor(job)
+
+    num_frames = 0
+    with _open_reader(unit) as reader:
+        frames = (
+            process(frame, boxes.get(index, []), unit.name, index)
+            for index, frame in enumerate(reader, start=unit.start)
+        )
+        if output["format"] in IMAGE_FORMATS:
+            frame_dir = output_dir / unit.name
+            frame_dir.mkdir(parents=True, exist_ok=True)
+            for index, frame in enumerate(frames, start=unit.start):
+                save_image(frame, frame_dir / f"{index:06d}.{output['format']}")
+                num_frames += 1
+        else:
+            segment_dir = output_dir / SEGMENT_DIR / unit.name
+            segment_dir.mkdir(parents=True, exist_ok=True)
+            frame_rate = output.get("frame_rate") or getattr(reader, "fps", 0)
+            with VideoWriter(
+                segment_dir,
+                f"{unit.key}.mp4",
+                frame_rate=frame_rate or 20,
+                streaming=True,
+                preset=output.get("preset"),
+                threads=output.get("threads"),
+            ) as writer:
+                for frame in frames:
+                    writer.add_frame(frame)
+                    num_frames += 1
+
+    checkpoint = output_dir / CHECKPOINT_DIR / unit.name / f"{unit.key}.json"
+    checkpoint.parent.mkdir(parents=True, exist_ok=True)
+    checkpoint.write_text(json.dumps({"frames": num_frames}))
+    return num_frames
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the `cogcvutil` command."""
+    parser = argparse.ArgumentParser(
+        prog="cogcvutil",
+        description="Filter, annotate and encode frames as a batch job.",
+    )
+    parser.add_argument("job", help="Path of the JSON job spec.")
+    parser.add_argument(
+        "--shard", default="0/1", help="Run shard i of N, as 'i/N'."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Number of worker processes."
+    )
+    parser.add_argument(
+        "--chunk-frames",
+        type=int,
+        default=DEFAULT_CHUNK_FRAMES,
+        help="Frames per work unit; keep it fixed across shards and restarts.",
+    )
+    parser.add_argument("--report", help="Write the run report as JSON here.")
+    args = parser.parse_args(argv)
+
+    try:
+        report = run_job(
+            load_job(args.job),
+            parse_shard(args.shard),
+            args.workers,
+            args.chunk_frames,
+        )
+    except (OSError, ValueError) as error:
+        parser.exit(2, f"cogcvutil: error: {error}\n")
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2))
+    sys.stdout.write(
+        f"shard {report['shard']}: {report['frames']} frames in "
+        f"{report['seconds']:.2f} s ({report['frames_per_second']:.1f} "
+        f"frames/s), {report['units_processed']} units processed, "
+        f"{report['units_skipped']} skipped\n"
+    )
+    return 0
+
+
+def _open_reader(unit: WorkUnit) -> Any:  # noqa: ANN401
+    """Open a frame source over the unit's range of its input."""
+    # Imported by the worker, so the command itself starts quickly
+    if Path(unit.input).is_dir():
+        from cogcvutil.video.reader.image_directory import (  # noqa: PLC0415
+            ImageDirectoryReader,
+        )
+
+        return ImageDirectoryReader(
+            unit.input,
+            start_frame=unit.start,
+            end_frame=unit.stop,
+            num_workers=1,
+        )
+    from cogcvutil.video.reader.video_to_images import (  # noqa: PLC0415
+        VideoReader,
+    )
+
+    return VideoReader(unit.input, start_frame=unit.start, end_frame=unit.stop)
+
+
+def _frame_processor(job: dict) -> Callable:
+    """Build the per-frame filter and annotation function of a job."""
+    # Imported by the worker, so the command itself starts quickly
+    from cogcvutil.image.annotator.bounding_box import (  # noqa: PLC0415
+        visualize_bbox,
+    )
+    from cogcvutil.image.annotator.text_annotator import (  # noqa: PLC0415
+        TextAnnotator,
+    )
+    from cogcvutil.image.filter.image_filter import ImageFilter  # noqa: PLC0415
+
+    filter_spec = job.get("filter")
+    bbox_spec = job.get("bbox", {})
+    overlay = job.get("overlay")
+    image_filter = ImageFilter()
+    annotator = TextAnnotator(**overlay.get("style", {})) if overlay else None
+    # Frames are RGB and the box drawing takes BGR hex colors
+    border_color = "#{:02X}{:02X}{:02X}".format(
+        *hex_to_bgr(bbox_spec.get("color", "#FF0000"))
+    )
+    border_thickness = bbox_spec.get("thickness", 0)
+
+    def process(frame, bboxes, name, index):  # noqa: ANN001, ANN202
+        if bboxes and filter_spec:
+            frame = image_filter.apply_filter_to_bbox(
+                frame,
+                bboxes,
+                filter_type=filter_spec.get("type", "black"),
+                blur_radius=filter_spec.get("blur_radius", 31),
+                bbox_border_thickness=border_thickness,
+                bbox_border_color=border_color,
+                inplace=True,
+            )
+        elif bboxes and border_thickness > 0:
+            frame = visualize_bbox(
+                frame, bboxes, border_thickness, border_color
+            )
+        if annotator is not None:
+            lines = [
+                line.format(input=name, frame=index)
+                for line in overlay["lines"]
+            ]
+            frame = annotator.insert_annotation(
+                frame,
+                lines,
+                overlay.get("position", "upper_left"),
+                input_color_order="rgb",
+                output_color_order="rgb",
+            )
+        return frame
+
+    return process
+
+
+def _join_segments(job: dict, units: list[WorkUnit]) -> None:
+    """Join the segments of every input whose units are all finished.
+
+    Every shard runs this step, so a shard first claims an input with an
+    exclusive marker file; inputs claimed by another shard are skipped.
+    The video is joined into a temporary file and renamed into place, so
+    `<name>.mp4` only ever exists complete, and the segments are deleted
+    last. A marker left by a killed shard must be deleted by hand.
+    """
+    # The segmented writer loads OpenCV, so it is only imported to join
+    from cogcvutil.video.writer.segmented import concat_segments  # noqa: PLC0415
+
+    output_dir = Path(job["output"]["dir"])
+    by_name: dict[str, list[WorkUnit]] = {}
+    for unit in units:
+        by_name.setdefault(unit.name, []).append(unit)
+    for name, input_units in by_name.items():
+        output_path = output_dir / f"{name}.mp4"
+        segment_dir = output_dir / SEGMENT_DIR / name
+        segments = [segment_dir / f"{unit.key}.mp4" for unit in input_units]
+        done = all(
+            (output_dir / CHECKPOINT_DIR / name / f"{unit.key}.json").exists()
+            for unit in input_units
+        )
+        if output_path.exists() or not done:
+            continue
+        marker = output_dir / SEGMENT_DIR / f"{name}.joining"
+        try:
+            os.close(os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            logging.info(
+                "Skipping %s, another shard is joining it (or delete %s)",
+                output_path,
+                marker,
+            )
+            continue
+        try:
+            # Another shard may have finished between the check and the claim
+            if output_path.exists():
+                continue
+            if len(segments) == 1:
+                segments[0].replace(output_path)
+            else:
+                partial_path = output_dir / f".{name}.joining.mp4"
+                try:
+                    concat_segments(segments, partial_path)
+                    partial_path.replace(output_path)
+                finally:
+                    partial_path.unlink(missing_ok=True)
+            shutil.rmtree(segment_dir, ignore_errors=True)
+        finally:
+            marker.unlink(missing_ok=True)
+        logging.debug("Joined %d segments into %s", len(segments), output_path)
@@ -2,43 +2,193 @@
 
 from __future__ import annotations
 
+import functools
 from typing import TYPE_CHECKING
 
-import cv2
-
 if TYPE_CHECKING:
     import numpy as np
 
+COLOR_SPACES = ("rgb", "bgr", "rgba", "bgra", "gray", "yuv")
+NAMED_COLORS = {
+    "black": "#000000",
+    "white": "#FFFFFF",
+    "red": "#FF0000",
+    "lime": "#00FF00",
+    "green": "#008000",
+    "blue": "#0000FF",
+    "yellow": "#FFFF00",
+    "cyan": "#00FFFF",
+    "magenta": "#FF00FF",
+    "gray": "#808080",
+    "grey": "#808080",
+    "silver": "#C0C0C0",
+    "maroon": "#800000",
+    "olive": "#808000",
+    "navy": "#000080",
+    "purple": "#800080",
+    "teal": "#008080",
+    "orange": "#FFA500",
+}
+
 
+@functools.lru_cache(maxsize=1024)
 def hex_to_bgr(hex_color: str) -> tuple:
     """Convert a hex color to BGR (Blue, Green, Red).
 
+    Results are memoized, so repeated calls with the same color skip the
+    parsing. Named colors from `NAMED_COLORS` are accepted as well.
+
     Args:
-        hex_color (str): The color in hex format.
+        hex_color (str): The color in hex format, or a color name.
 
     Returns:
         tuple: The color in BGR format.
     """
-    hex_color = hex_color.lstrip("#")
+    hex_color = NAMED_COLORS.get(hex_color.lower(), hex_color).lstrip("#")
     lv = len(hex_color)
     return tuple(
         int(hex_color[i : i + lv // 3], 16) for i in range(0, lv, lv // 3)
     )[::-1]
 
 
-def bgr_to_rgb(image: np.ndarray) -> np.ndarray:
-    """Convert an image from BGR to RGB format.
+def hex_to_rgb(hex_color: str) -> tuple:
+    """Convert a hex color (or color name) to RGB (Red, Green, Blue).
 
     Args:
-        image (np.ndarray): The image in BGR format.
+        hex_color (str): The color in hex format, or a color name.
 
     Returns:
-        np.ndarray: The image in RGB format.
+        tuple: The color in RGB format.
     """
-    # Check if the image is in BGR format
-    num_channel = 3
-    if len(image.shape) == num_channel and image.shape[2] == num_channel:
-        # Assuming it's BGR if it's a 3-channel image
-        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    # Return the image as is if it's not BGR
+    return hex_to_bgr(hex_color)[::-1]
+
+
+def convert_color(
+    image: np.ndarray, src: str, dst: str, out: np.ndarray | None = None
+) -> np.ndarray:
+    """Convert an image or a stack of images between color spaces.
+
+    Color spaces are the names in `COLOR_SPACES`; "yuv" is packed
+    3-channel YUV as in OpenCV. A stack, (N, H, W, C) or (N, H, W) for
+    gray, is converted with a single OpenCV call on a (N * H, W, C) view.
+    Passing `out=image` converts in place when the channel count does not
+    change.
+
+    Args:
+        image (np.ndarray): The image or stack of images.
+        src (str): The color space of `image`.
+        dst (str): The color space to convert to.
+        out (np.ndarray | None): Contiguous array to write the result into. Defaults to None (allocate).
+
+    Returns:
+        np.ndarray: The converted image or stack, `out` if given.
+    """  # noqa: E501
+    # Deferred, so importing the color helpers does not load NumPy
+    import numpy as np  # noqa: PLC0415
+
+    for color_space in (src, dst):
+        if color_space not in COLOR_SPACES:
+            msg = (
+                f"Unsupported color space {color_space!r}. "
+                f"Choose one of {', '.join(COLOR_SPACES)}."
+            )
+            raise ValueError(msg)
+    if src == dst:
+        if out is None:
+            return image
+        np.copyto(out, image)
+        return out
+
+    code = _conversion_codes().get((src, dst))
+    if code is None:
+        # OpenCV has no direct code, e.g. for rgba -> yuv
+        return convert_color(convert_color(image, src, "rgb"), "rgb", dst, out)
+    return _cvt_color(image, code, src == "gray", dst == "gray", out)
+
+
+@functools.lru_cache(maxsize=1)
+def _conversion_codes() -> dict[tuple[str, str], int]:
+    """Return the OpenCV conversion code of each (src, dst) pair it has."""
+    # Deferred, so importing the color helpers does not load OpenCV
+    import cv2  # noqa: PLC0415
+
+    return {
+        (src, dst): getattr(cv2, f"COLOR_{src.upper()}2{dst.upper()}")
+        for src in COLOR_SPACES
+        for dst in COLOR_SPACES
+        if hasattr(cv2, f"COLOR_{src.upper()}2{dst.upper()}")
+    }
+
+
+def _cvt_color(
+    image: np.ndarray,
+    code: int,
+    src_gray: bool,
+    dst_gray: bool,
+    out: np.ndarray | None,
+) -> np.ndarray:
+    """Run `cv2.cvtColor` on an image, or on a stack folded into one."""
+    import cv2  # noqa: PLC0415
+    import numpy as np  # noqa: PLC0415
+
+    if image.ndim == (2 if src_gray else 3):
+        return cv2.cvtColor(image, code, dst=out)
+    # Fold the stack into one tall image
+    image = np.ascontiguousarray(image)
+    tall = image.reshape(-1, *image.shape[2:])
+    if out is not None:
+        cv2.cvtColor(tall, code, dst=out.reshape(-1, *out.shape[2:]))
+        return out
+    converted = cv2.cvtColor(tall, code)
+    if dst_gray:
+        return converted.reshape(image.shape[:3])
+    return converted.reshape(*image.shape[:3], -1)
+
+
+def rgb_to_bgr(image: np.ndarray, mode: str = "copy") -> np.ndarray:
+    """Swap the red and blue channels of an image or a stack of images.
+
+    3- and 4-channel images are swapped, anything else (e.g. gray images)
+    is returned as is.
+
+    Args:
+        image (np.ndarray): The image(s) in RGB(A) or BGR(A) format.
+        mode (str): "copy" returns a new array, "inplace" swaps the channels
+            in `image`'s memory and "view" returns a reversed-stride view
+            without copying (3 channels only, the view is not contiguous).
+
+    Returns:
+        np.ndarray: The image(s) with the red and blue channels swapped.
+    """
+    num_channels = image.shape[-1] if image.ndim >= 3 else 0  # noqa: PLR2004
+    if num_channels not in {3, 4}:
+        return image
+    if mode == "view":
+        if num_channels != 3:  # noqa: PLR2004
+            msg = "Only 3-channel images can be swapped as a view."
+            raise ValueError(msg)
+        return image[..., ::-1]
+    if mode not in {"copy", "inplace"}:
+        msg = "Unsupported mode. Choose 'copy', 'inplace' or 'view'."
+        raise ValueError(msg)
+    src, dst = ("rgb", "bgr") if num_channels == 3 else ("rgba", "bgra")  # noqa: PLR2004
+    if mode == "copy":
+        return convert_color(image, src, dst)
+    if image.flags.c_contiguous:
+        return convert_color(image, src, dst, out=image)
+    # A non-contiguous image cannot be an OpenCV destination
+    image[..., [0, 2]] = image[..., [2, 0]]
     return image
+
+
+def bgr_to_rgb(image: np.ndarray, mode: str = "copy") -> np.ndarray:
+    """Convert an image or a stack of images from BGR to RGB format.
+
+    Args:
+        image (np.ndarray): The image(s) in BGR(A) format.
+        mode (str): "copy", "inplace" or "view", see `rgb_to_bgr`.
+
+    Returns:
+        np.ndarray: The image(s) in RGB(A) format.
+    """
+    return rgb_to_bgr(image, mode)
@@ -0,0 +1,227 @@
+"""Profiling Hooks Module.
+
+Public hot-path functions are wrapped with `instrument`. While no
+`Profile` is active and no hook is registered, a wrapped call costs one
+global flag check. Otherwise every call is timed and the bytes and pixels
+of the image it processed are counted, then passed to the active profiles
+and hooks::
+
+    with profile() as report:
+        run_job()
+    print(report.to_json())
+
+Times are inclusive, so a stage that calls another instrumented stage
+(e.g. `ImageFilter.apply_filter_to_bbox` drawing boxes with
+`visualize_bbox`) also contains that stage's time.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, TypeVar
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+F = TypeVar("F", bound=Callable)
+
+
+class CallRecord(NamedTuple):
+    """Measurement of one instrumented call."""
+
+    stage: str
+    seconds: float
+    bytes: int
+    pixels: int
+
+
+class Profile:
+    """Thread-safe per-stage aggregate of `CallRecord`s."""
+
+    def __init__(self) -> None:
+        """Initialize Profile."""
+        self._stages: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, call: CallRecord) -> None:
+        """Add one call to its stage's counters."""
+        with self._lock:
+            stats = self._stages.get(call.stage)
+            if stats is None:
+                stats = self._stages[call.stage] = {
+                    "calls": 0,
+                    "seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "bytes": 0,
+                    "pixels": 0,
+                }
+            stats["calls"] += 1
+            stats["seconds"] += call.seconds
+            stats["max_seconds"] = max(stats["max_seconds"], call.seconds)
+            stats["bytes"] += call.bytes
+            stats["pixels"] += call.pixels
+
+    def to_dict(self) -> dict[str, dict]:
+        """Return the per-stage counters, slowest stage first.
+
+        Every stage has the number of `calls`, the total and maximum
+        `seconds`, the `bytes` and `pixels` processed, and the derived
+        `mean_seconds` and `pixels_per_second`.
+        """
+        with self._lock:
+            stages = {
+                stage: dict(stats) for stage, stats in self._stages.items()
+            }
+        for stats in stages.values():
+            stats["mean_seconds"] = stats["seconds"] / stats["calls"]
+            stats["pixels_per_second"] = (
+                stats["pixels"] / stats["seconds"] if stats["seconds"] else 0.0
+            )
+        return dict(
+            sorted(stages.items(), key=lambda item: -item[1]["seconds"])
+        )
+
+    def to_json(self, path: str | Path | None = None) -> str:
+        """Return the counters as JSON, also writing them to `path` if given."""
+        text = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            Path(path).write_text(text)
+        return text
+
+    def reset(self) -> None:
+        """Drop all counters."""
+        with self._lock:
+            self._stages.clear()
+
+
+_profiles: list[Profile] = []
+_hooks: list[Callable[[CallRecord], None]] = []
+_registry_lock = threading.Lock()
+# Checked on every instrumented call, True while a profile or hook exists
+_enabled = False
+
+
+def _update_enabled() -> None:
+    global _enabled  # noqa: PLW0603
+    _enabled = bool(_profiles or _hooks)
+
+
+def add_hook(callback: Callable[[CallRecord], None]) -> None:
+    """Call `callback` with a `CallRecord` after every instrumented call.
+
+    The callback runs on the thread that made the call, so it should be
+    quick and thread-safe.
+
+    Args:
+        callback (Callable[[CallRecord], None]): The hook.
+    """
+    with _registry_lock:
+        _hooks.append(callback)
+        _update_enabled()
+
+
+def remove_hook(callback: Callable[[CallRecord], None]) -> None:
+    """Unregister a hook added with `add_hook`."""
+    with _registry_lock:
+        _hooks.remove(callback)
+        _update_enabled()
+
+
+@contextmanager
+def profile() -> Iterator[Profile]:
+    """Collect a per-stage breakdown of the instrumented calls in the block.
+
+    Calls from every thread are counted, including worker pools started
+    by the library. Profiles can be nested; each sees all calls made
+    while it is active.
+
+    Yields:
+        Profile: The profile, readable during and after the block.
+    """
+    report = Profile()
+    with _registry_lock:
+        _profiles.append(report)
+        _update_enabled()
+    try:
+        yield report
+    finally:
+        with _registry_lock:
+            _profiles.remove(report)
+            _update_enabled()
+
+
+def emit(
+    stage: str,
+    seconds: float,
+    data: Any | None = None,  # noqa: ANN401
+) -> None:
+    """Report a measurement made outside of `instrument`.
+
+    Args:
+        stage (str): Name of the stage.
+        seconds (float): Duration of the call.
+        data (Any | None): The array processed, counted like an instrumented call's. Default is None.
+    """  # noqa: E501
+    if not _enabled:
+        return
+    num_bytes, num_pixels = _measure(data)
+    call = CallRecord(stage, seconds, num_bytes, num_pixels)
+    for report in tuple(_profiles):
+        report.record(call)
+    for hook in tuple(_hooks):
+        hook(call)
+
+
+def instrument(stage: str | None = None) -> Callable[[F], F]:
+    """Decorate a function to time it and count the data it processes.
+
+    Bytes and pixels are those of the first NumPy array argument, or of
+    the returned array when no argument is one (e.g. for decoders).
+    Pixels are counted channels-last, as H * W per image.
+
+    Args:
+        stage (str | None): Name of the stage. Defaults to the function's qualified name.
+    """  # noqa: E501
+
+    def decorator(func: F) -> F:
+        name = stage or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):  # noqa: ANN002, ANN003, ANN202
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            result = None
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                data = next(
+                    (
+                        arg
+                        for arg in (*args, *kwargs.values())
+                        if isinstance(arg, np.ndarray)
+                    ),
+                    result,
+                )
+                emit(name, time.perf_counter() - start, data)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _measure(data: Any) -> tuple[int, int]:  # noqa: ANN401
+    """Return the bytes and channels-last pixel count of an array."""
+    if not isinstance(data, np.ndarray):
+        return 0, 0
+    if data.ndim >= 3:  # noqa: PLR2004
+        return data.nbytes, data.size // data.shape[-1]
+    return data.nbytes, data.size
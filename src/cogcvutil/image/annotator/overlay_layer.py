@@ -0,0 +1,295 @@
+"""Precomposited Text Overlay Layer."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+import cv2
+import numpy as np
+
+from cogcvutil.common.utility.profiling import instrument
+from cogcvutil.image.annotator.text_annotator import TextAnnotator
+from cogcvutil.image.annotator.text_cache import LabelSpriteCache
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+POSITIONS = ("upper_left", "upper_right", "lower_left", "lower_right")
+# Horizontal distance of the text from the frame edge, as in TextAnnotator
+MARGIN = 10
+
+
+class OverlayBlock(NamedTuple):
+    """Consecutive lines of text composed once, ready to blend onto frames.
+
+    Attributes:
+        alpha (np.ndarray): Coverage of the lines in [0, 255], (H, W) uint8.
+        inverse (np.ndarray): 255 - alpha, repeated per channel, (H, W, 3) uint8.
+        premultiplied (dict[str, np.ndarray]): The font color scaled by alpha / 255, (H, W, 3) uint8, by color order.
+        offset (tuple[int, int]): Top-left corner of the block relative to its anchor, the text margin and the top of its first line.
+        advance (int): Vertical space taken by the lines, including spacing.
+    """  # noqa: E501
+
+    alpha: np.ndarray
+    inverse: np.ndarray
+    premultiplied: dict[str, np.ndarray]
+    offset: tuple[int, int]
+    advance: int
+
+
+class OverlayLayer:
+    """Text block rasterized once and alpha-blended onto every frame.
+
+    The lines are laid out like `TextAnnotator.insert_annotation` at the
+    same `position` and anti-aliased the same way, but each line is
+    rasterized only once, and the static lines are merged into a single
+    block. `composite` then blends that block, plus one per dynamic line,
+    into the frame with one `cv2.multiply` and one `cv2.add` on
+    precomputed uint8 masks, so the per-frame cost is proportional to the
+    text area instead of measuring and rasterizing glyphs for every line.
+    The two rounding steps may leave anti-aliased edge pixels one level
+    away from `insert_annotation`.
+
+    Static lines are given once; dynamic lines (e.g. a timestamp) are
+    passed to each `composite` call and follow the static lines. A
+    dynamic line is drawn with `cv2.putText` on the first frame it
+    appears in and composed into a block once it repeats, so a frame
+    counter costs the same as with `insert_annotation` while a label that
+    changes now and then is rasterized once per change.
+    """
+
+    def __init__(
+        self,
+        static_lines: Sequence[str] = (),
+        position: str = "upper_left",
+        annotator: TextAnnotator | None = None,
+    ) -> None:
+        """Initialize the overlay layer.
+
+        Args:
+            static_lines (Sequence[str]): Lines shown on every frame. Default is no lines.
+            position (str): Corner of the text block, as in `insert_annotation`. Default is "upper_left".
+            annotator (TextAnnotator | None): Font, scale, color and spacing of the text. Default is a default TextAnnotator.
+        """  # noqa: E501
+        if position not in POSITIONS:
+            msg = f"Unsupported position. Choose one of {', '.join(POSITIONS)}."
+            raise ValueError(msg)
+        self.position = position
+        self.annotator = annotator or TextAnnotator()
+        self.sprite_cache = LabelSpriteCache(
+            metrics_cache=self.annotator.metrics_cache
+        )
+        self._static_block = self._compose(list(static_lines))
+        self.static_lines = list(static_lines)
+        self._dynamic_blocks: dict[str, OverlayBlock] = {}
+        self._last_dynamic_lines: set[str] = set()
+        self._direct_renders = 0
+
+    @property
+    def renders(self) -> int:
+        """Number of lines rasterized so far, into blocks or onto frames."""
+        return self.sprite_cache.misses + self._direct_renders
+
+    def set_static_lines(self, static_lines: Sequence[str]) -> None:
+        """Replace the static lines; known lines are not rasterized again."""
+        if list(static_lines) != self.static_lines:
+            self._static_block = self._compose(list(static_lines))
+            self.static_lines = list(static_lines)
+
+    @instrument("OverlayLayer.composite")
+    def composite(
+        self,
+        image: np.ndarray,
+        dynamic_lines: Sequence[str] = (),
+        color_order: str = "bgr",
+    ) -> np.ndarray:
+        """Blend the overlay onto `image` in place.
+
+        Args:
+            image (np.ndarray): Frame of shape (H, W, 3) or (H, W, 4), uint8.
+            dynamic_lines (Sequence[str]): Lines for this frame only, shown after the static lines. Default is none.
+            color_order (str): Channel order of `image`, "bgr" or "rgb". Default is "bgr".
+
+        Returns:
+            np.ndarray: `image`, with the overlay blended in.
+        """  # noqa: E501
+        if color_order not in {"bgr", "rgb"}:
+            msg = "Unsupported color order. Choose 'bgr' or 'rgb'."
+            raise ValueError(msg)
+        # A line seen for the first time is drawn directly, composing it
+        # only pays off once it repeats. putText would clear the alpha
+        # channel of BGRA frames, so those are always blended.
+        can_draw = image.shape[2] == 3  # noqa: PLR2004
+        blocks = {}
+        for line in dynamic_lines:
+            block = self._dynamic_blocks.get(line)
+            if block is None and (
+                line in self._last_dynamic_lines or not can_draw
+            ):
+                block = self._compose([line])
+            blocks[line] = block
+        # Keep the blocks of the current dynamic lines only
+        self._dynamic_blocks = {
+            line: block for line, block in blocks.items() if block is not None
+        }
+        self._last_dynamic_lines = set(dynamic_lines)
+
+        spacing = self.annotator.line_spacing
+        sizes = {
+            line: self._text_size(line)
+            for line, block in blocks.items()
+            if block is None
+        }
+        total_advance = self._static_block.advance + sum(
+            sizes[line][1] + spacing
+            if blocks[line] is None
+            else blocks[line].advance
+            for line in dynamic_lines
+        )
+        y = (
+            0
+            if self.position.startswith("upper")
+            else image.shape[0] - total_advance
+        )
+        x = (
+            MARGIN
+            if self.position.endswith("left")
+            else image.shape[1] - MARGIN
+        )
+        for line, block in [
+            ("", self._static_block),
+            *((line, blocks[line]) for line in dynamic_lines),
+        ]:
+            if block is not None:
+                _blend(
+                    image,
+                    block,
+                    (x + block.offset[0], y + block.offset[1]),
+                    color_order,
+                )
+                y += block.advance
+                continue
+            width, height = sizes[line]
+            y += height + spacing
+            self._draw_text(
+                image,
+                line,
+                (x - width if self.position.endswith("right") else x, y),
+                color_order,
+            )
+        return image
+
+    def _text_size(self, text: str) -> tuple[int, int]:
+        """Return the (width, height) of a line, as in `insert_annotation`."""
+        annotator = self.annotator
+        return annotator.metrics_cache.get_text_size(
+            text, annotator.font, annotator.font_scale, annotator.font_thickness
+        )[0]
+
+    def _draw_text(
+        self,
+        image: np.ndarray,
+        text: str,
+        origin: tuple[int, int],
+        color_order: str,
+    ) -> None:
+        """Rasterize a line straight onto the frame with `cv2.putText`."""
+        annotator = self.annotator
+        color = annotator.font_color
+        cv2.putText(
+            image,
+            text,
+            origin,
+            annotator.font,
+            annotator.font_scale,
+            color if color_order == "bgr" else color[::-1],
+            annotator.font_thickness,
+            cv2.LINE_AA,
+        )
+        self._direct_renders += 1
+
+    def _compose(self, lines: list[str]) -> OverlayBlock:
+        """Merge the masks of consecutive lines into one block."""
+        annotator = self.annotator
+        right = self.position.endswith("right")
+        placed = []
+        advance = 0
+        for line in lines:
+            sprite = self.sprite_cache.get(
+                line,
+                annotator.font,
+                annotator.font_scale,
+                annotator.font_thickness,
+                cv2.LINE_AA,
+            )
+            width, height = self._text_size(line)
+            advance += height + annotator.line_spacing
+            # Text origin relative to the anchor, as in insert_annotation
+            origin_x = -width if right else 0
+            placed.append(
+                (
+                    sprite.alpha,
+                    origin_x - sprite.offset[0],
+                    advance - sprite.offset[1],
+                )
+            )
+
+        if not placed:
+            empty = np.zeros((0, 0), dtype=np.uint8)
+            return OverlayBlock(empty, empty, {}, (0, 0), 0)
+        x0 = min(left for _, left, _ in placed)
+        y0 = min(top for _, _, top in placed)
+        x1 = max(left + alpha.shape[1] for alpha, left, _ in placed)
+        y1 = max(top + alpha.shape[0] for alpha, _, top in placed)
+        coverage = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        for alpha, left, top in placed:
+            region = coverage[
+                top - y0 : top - y0 + alpha.shape[0],
+                left - x0 : left - x0 + alpha.shape[1],
+            ]
+            np.maximum(region, alpha, out=region)
+
+        # Crop to the ink, the blend cost is proportional to the block area
+        rows = np.flatnonzero(coverage.any(axis=1))
+        cols = np.flatnonzero(coverage.any(axis=0))
+        if rows.size:
+            coverage = coverage[rows[0] : rows[-1] + 1, cols[0] : cols[-1] + 1]
+            x0 += int(cols[0])
+            y0 += int(rows[0])
+        weight = coverage[..., None] * np.float32(1.0 / 255.0)
+        color = np.asarray(annotator.font_color[:3], dtype=np.float32)
+        premultiplied = {
+            "bgr": np.rint(weight * color).astype(np.uint8),
+            "rgb": np.rint(weight * color[::-1]).astype(np.uint8),
+        }
+        inverse = cv2.merge([255 - coverage] * 3)
+        return OverlayBlock(coverage, inverse, premultiplied, (x0, y0), advance)
+
+
+def _blend(
+    image: np.ndarray,
+    block: OverlayBlock,
+    top_left: tuple[int, int],
+    color_order: str,
+) -> None:
+    """Alpha-blend a block into `image` at `top_left`, clipped to the frame."""
+    block_h, block_w = block.alpha.shape
+    x0, y0 = top_left
+    ix1, iy1 = max(x0, 0), max(y0, 0)
+    ix2 = min(x0 + block_w, image.shape[1])
+    iy2 = min(y0 + block_h, image.shape[0])
+    if ix1 >= ix2 or iy1 >= iy2:
+        return
+    crop = (slice(iy1 - y0, iy2 - y0), slice(ix1 - x0, ix2 - x0))
+    has_alpha = image.shape[2] != 3  # noqa: PLR2004
+    # OpenCV cannot view a channel slice, blend a copy of the color
+    roi = (
+        np.ascontiguousarray(image[iy1:iy2, ix1:ix2, :3])
+        if has_alpha
+        else image[iy1:iy2, ix1:ix2]
+    )
+    # Scale the frame by the uncovered fraction, then add the text color
+    cv2.multiply(roi, block.inverse[crop], dst=roi, scale=1.0 / 255.0)
+    cv2.add(roi, block.premultiplied[color_order][crop], dst=roi)
+    if has_alpha:
+        image[iy1:iy2, ix1:ix2, :3] = roi
@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
-
 import cv2
+import numpy as np
 
-if TYPE_CHECKING:
-    import numpy as np
-
-from cogcvutil import save_image
+from cogcvutil.common.converter.color import bgr_to_rgb, convert_color
+from cogcvutil.common.utility.profiling import instrument
+from cogcvutil.image.annotator.text_cache import (
+    LabelSpriteCache,
+    TextMetricsCache,
+    default_metrics_cache,
+)
+from cogcvutil.image.common.utility.io_util import save_image
 
 """Text Annotator."""
 
@@ -23,6 +26,8 @@ class TextAnnotator:
         font_scale: float = 1.0,
         font_color: tuple = (57, 255, 20),
         line_spacing: int = 10,
+        metrics_cache: TextMetricsCache | None = None,
+        sprite_cache: LabelSpriteCache | None = None,
     ) -> None:
         """Initialize the image annotator.
 
@@ -32,8 +37,10 @@ class TextAnnotator:
             font_scale (float): Scale of the font size. Default is 3.0.
             font_color (tuple): Font color in BGR format. Default is neon green.
             line_spacing (int): Spacing between lines of text. Default is 10.
+            metrics_cache (TextMetricsCache): Cache of text sizes. Default is the shared module cache.
+            sprite_cache (LabelSpriteCache): If set, blend cached label bitmaps instead of calling putText. Default is None.
 
-        """
+        """  # noqa: E501
         self.font = font
         self.font_scale = font_scale
         self.font_color = font_color
@@ -41,31 +48,58 @@ class TextAnnotator:
             2, int(font_scale)
         )  # Adjust thickness based on font scale
         self.line_spacing = line_spacing
+        self.metrics_cache = metrics_cache or default_metrics_cache
+        self.sprite_cache = sprite_cache
 
-    def insert_annotation(
+    @instrument()
+    def insert_annotation(  # noqa: PLR0913
         self,
         image: np.ndarray,
         text_annotations: list[str],
         position: str = "upper_left",
         save_path: str | None = None,
         auto_indexing: bool = False,
+        *,
+        input_color_order: str = "bgr",
+        output_color_order: str = "rgb",
+        out: np.ndarray | None = None,
     ) -> np.ndarray:
         """Insert text_annotations to the current frame at the pre-specified position.
 
+        Without `out` the text is drawn on `image` in place. When the input
+        and output color orders match, that same array is returned and no
+        conversion happens; otherwise a converted copy is returned. With
+        `out`, the image is copied (or converted) into `out` once and the
+        text is drawn there, leaving `image` untouched. Passing
+        `out=image` with matching color orders allocates nothing.
+
         Args:
             image (np.ndarray): Image to annotate.
             text_annotations (list[str]): List of text annotations to insert.
             position (str): Position to insert the annotations. Default is "upper_left".
             save_path (str): Path to save the annotated image. Default is None.
             auto_indexing (bool): Automatically index the file name. Default is False.
-        """
+            input_color_order (str): Channel order of `image`, "bgr" or "rgb". Default is "bgr".
+            output_color_order (str): Channel order of the returned image, "bgr" or "rgb". Default is "rgb".
+            out (np.ndarray): Buffer of the same shape as `image` to write the result into. Default is None.
+        """  # noqa: E501
+        canvas, canvas_order = self._prepare_canvas(
+            image, input_color_order, output_color_order, out
+        )
+        font_color = (
+            self.font_color if canvas_order == "bgr" else self.font_color[::-1]
+        )
+
         # Calculate the bounding box for the annotations
+        text_sizes = [
+            self.metrics_cache.get_text_size(
+                annotation, self.font, self.font_scale, self.font_thickness
+            )[0]
+            for annotation in text_annotations
+        ]
         text_height_total = 0
         max_text_width = 0
-        for annotation in text_annotations:
-            (text_width, text_height), _ = cv2.getTextSize(
-                annotation, self.font, self.font_scale, self.font_thickness
-            )
+        for text_width, text_height in text_sizes:
             text_height_total += text_height + self.line_spacing
             max_text_width = max(max_text_width, text_width)
 
@@ -73,34 +107,60 @@ class TextAnnotator:
         if position.startswith("upper"):
             y = 0
         else:
-            y = image.shape[0] - text_height_total
+            y = canvas.shape[0] - text_height_total
 
-        for annotation in text_annotations:
+        draw_text = self.sprite_cache.draw if self.sprite_cache else cv2.putText
+        for annotation, (text_width, text_height) in zip(
+            text_annotations, text_sizes
+        ):
             # Recalculate x position for right alignments
-            (text_width, text_height), _ = cv2.getTextSize(
-                annotation, self.font, self.font_scale, self.font_thickness
-            )
             if position.endswith("left"):
                 x = 10
             else:
-                x = image.shape[1] - text_width - 10
+                x = canvas.shape[1] - text_width - 10
 
             y += (
                 text_height + self.line_spacing
             )  # Update y position for each annotation
 
             # Adding the text to image
-            cv2.putText(
-                image,
+            draw_text(
+                canvas,
                 annotation,
                 (x, y),
                 self.font,
                 self.font_scale,
-                self.font_color,
+                font_color,
                 self.font_thickness,
                 cv2.LINE_AA,
             )
-        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        if canvas_order != output_color_order:
+            canvas = bgr_to_rgb(canvas)
         if save_path:
-            save_image(image=image, path=save_path, auto_indexing=auto_indexing)
-        return image
+            save_image(
+                image=canvas,
+                path=save_path,
+                auto_indexing=auto_indexing,
+                color_order=output_color_order,
+            )
+        return canvas
+
+    @staticmethod
+    def _prepare_canvas(
+        image: np.ndarray,
+        input_color_order: str,
+        output_color_order: str,
+        out: np.ndarray | None,
+    ) -> tuple[np.ndarray, str]:
+        """Return the array to draw on and its color order."""
+        for color_order in (input_color_order, output_color_order):
+            if color_order not in {"bgr", "rgb"}:
+                msg = "Unsupported color order. Choose 'bgr' or 'rgb'."
+                raise ValueError(msg)
+        if out is None:
+            return image, input_color_order
+        if input_color_order != output_color_order:
+            convert_color(image, "bgr", "rgb", out=out)
+        elif out is not image:
+            np.copyto(out, image)
+        return out, output_color_order
@@ -0,0 +1,227 @@
+"""Text Metrics and Label Sprite Cache."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+import cv2
+import numpy as np
+
+
+class _LRUCache:
+    """Thread-safe bounded LRU mapping with hit/miss counters."""
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries kept in the cache.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: tuple) -> Any:  # noqa: ANN401
+        """Return the cached value for `key` or None on a miss."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _store(self, key: tuple, value: Any) -> None:  # noqa: ANN401
+        """Insert `value` and evict the least recently used entries."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Return the hit/miss counters and the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class TextMetricsCache(_LRUCache):
+    """Bounded LRU cache of `cv2.getTextSize` results."""
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        """Initialize the text metrics cache.
+
+        Args:
+            maxsize (int): Maximum number of cached strings. Default is 4096.
+        """
+        super().__init__(maxsize)
+
+    def get_text_size(
+        self, text: str, font: int, font_scale: float, thickness: int
+    ) -> tuple[tuple[int, int], int]:
+        """Return ((width, height), baseline) of `text`, as cv2.getTextSize."""
+        key = (text, font, font_scale, thickness)
+        size = self._lookup(key)
+        if size is None:
+            size = cv2.getTextSize(text, font, font_scale, thickness)
+            self._store(key, size)
+        return size
+
+
+class LabelSprite(NamedTuple):
+    """Prerendered text mask.
+
+    Attributes:
+        alpha (np.ndarray): Coverage mask of shape (H, W) in [0, 255].
+        offset (tuple[int, int]): Position of the text origin in the mask.
+        binary (bool): Whether the mask only holds 0 and 255.
+    """
+
+    alpha: np.ndarray
+    offset: tuple[int, int]
+    binary: bool
+
+
+class LabelSpriteCache(_LRUCache):
+    """Bounded LRU cache of prerendered label masks.
+
+    Drawing a cached label alpha-blends its mask into the image instead of
+    rasterizing the glyphs again with `cv2.putText`. Without anti-aliasing
+    the result is identical to `cv2.putText`.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 512,
+        metrics_cache: TextMetricsCache | None = None,
+    ) -> None:
+        """Initialize the label sprite cache.
+
+        Args:
+            maxsize (int): Maximum number of cached labels. Default is 512.
+            metrics_cache (TextMetricsCache | None): Cache used to measure
+                labels. Default is the shared module cache.
+        """
+        super().__init__(maxsize)
+        self.metrics_cache = metrics_cache or default_metrics_cache
+
+    def get(
+        self,
+        text: str,
+        font: int,
+        font_scale: float,
+        thickness: int,
+        line_type: int = cv2.LINE_8,
+    ) -> LabelSprite:
+        """Return the sprite of `text`, rendering it on a miss."""
+        key = (text, font, font_scale, thickness, line_type)
+        sprite = self._lookup(key)
+        if sprite is None:
+            sprite = self._render(text, font, font_scale, thickness, line_type)
+            self._store(key, sprite)
+        return sprite
+
+    def _render(
+        self,
+        text: str,
+        font: int,
+        font_scale: float,
+        thickness: int,
+        line_type: int,
+    ) -> LabelSprite:
+        """Rasterize `text` into a coverage mask."""
+        (width, height), baseline = self.metrics_cache.get_text_size(
+            text, font, font_scale, thickness
+        )
+        pad = thickness + 2
+        alpha = np.zeros(
+            (height + baseline + 2 * pad, width + 2 * pad), dtype=np.uint8
+        )
+        offset = (pad, pad + height)
+        cv2.putText(
+            alpha, text, offset, font, font_scale, 255, thickness, line_type
+        )
+        binary = not np.any((alpha > 0) & (alpha < 255))  # noqa: PLR2004
+        alpha.setflags(write=False)
+        return LabelSprite(alpha, offset, binary)
+
+    # Positional like cv2.putText, so callers can use either one
+    def draw(  # noqa: PLR0913, PLR0917
+        self,
+        image: np.ndarray,
+        text: str,
+        org: tuple[int, int],
+        font: int,
+        font_scale: float,
+        color: tuple,
+        thickness: int = 1,
+        line_type: int = cv2.LINE_8,
+    ) -> np.ndarray:
+        """Draw `text` on `image` in place, like `cv2.putText`.
+
+        Args:
+            image (np.ndarray): Image to draw on, (H, W, C) or (H, W).
+            text (str): Text to draw.
+            org (tuple[int, int]): Bottom-left corner of the text.
+            font (int): OpenCV font face.
+            font_scale (float): Scale of the font size.
+            color (tuple): Text color in the channel order of `image`.
+            thickness (int): Thickness of the strokes.
+            line_type (int): OpenCV line type.
+
+        Returns:
+            np.ndarray: The image with the text drawn.
+        """
+        sprite = self.get(text, font, font_scale, thickness, line_type)
+        x0 = int(org[0]) - sprite.offset[0]
+        y0 = int(org[1]) - sprite.offset[1]
+        sprite_h, sprite_w = sprite.alpha.shape
+        ix1, iy1 = max(x0, 0), max(y0, 0)
+        ix2 = min(x0 + sprite_w, image.shape[1])
+        iy2 = min(y0 + sprite_h, image.shape[0])
+        if ix1 >= ix2 or iy1 >= iy2:
+            return image
+
+        alpha = sprite.alpha[iy1 - y0 : iy2 - y0, ix1 - x0 : ix2 - x0]
+        roi = image[iy1:iy2, ix1:ix2]
+        color = np.asarray(color, dtype=np.float32)
+        if roi.ndim == 2:  # noqa: PLR2004
+            color = color[0]
+        else:
+            color = color[: roi.shape[2]]
+            alpha = alpha[..., None]
+        if sprite.binary:
+            np.copyto(roi, color.astype(roi.dtype), where=alpha > 0)
+        else:
+            weight = alpha.astype(np.float32) * (1.0 / 255.0)
+            roi[...] = roi + (color - roi) * weight + 0.5
+        return image
+
+
+default_metrics_cache = TextMetricsCache()
+
+
+def get_text_size(
+    text: str, font: int, font_scale: float, thickness: int
+) -> tuple[tuple[int, int], int]:
+    """Return `cv2.getTextSize` of `text` through the shared metrics cache."""
+    return default_metrics_cache.get_text_size(
+        text, font, font_scale, thickness
+    )
@@ -0,0 +1,171 @@
+"""Asynchronous Image Saving Module."""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import re
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from PIL import Image
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    import numpy as np
+    from typing_extensions import Self
+
+_STOP = object()
+
+
+class AsyncImageSaver:
+    """Save images on background threads.
+
+    `save` hands the image to a bounded queue and returns immediately;
+    worker threads run the PIL encode and the disk write. When the queue
+    is full `save` blocks, which keeps memory bounded if the disk cannot
+    keep up. Errors raised by a worker are re-raised on the caller's
+    thread by the next `save`, `flush` or `close`.
+
+    Auto-indexed names are assigned on the caller's thread from an
+    in-memory counter that is seeded by a single directory scan, so
+    choosing a name is O(1) instead of probing the filesystem. Files
+    created by other processes after the scan are not seen.
+    """
+
+    def __init__(
+        self,
+        num_workers: int = 2,
+        max_queue_size: int = 32,
+        copy: bool = True,
+    ) -> None:
+        """Initialize the saver and start the worker threads.
+
+        Args:
+            num_workers (int): Number of worker threads. Default is 2.
+            max_queue_size (int): Maximum number of images waiting to be
+                written before `save` blocks. Default is 32.
+            copy (bool): Copy images before queueing them, so callers can
+                reuse their buffers right away. Default is True.
+        """
+        self.copy = copy
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._errors: list[BaseException] = []
+        self._lock = threading.Lock()
+        self._indices: dict[tuple[Path, str, str], tuple[set[int], int]] = {}
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._work, daemon=True)
+            for _ in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def save(
+        self, image: np.ndarray, path: str | Path, auto_indexing: bool = False
+    ) -> Path:
+        """Queue an image to be saved.
+
+        Args:
+            image (np.ndarray): The image to save, in RGB format.
+            path (str | Path): The path to save the image.
+            auto_indexing (bool): Whether to save to the first free
+                `{stem}_{index}{suffix}` name, as `save_image` does.
+
+        Returns:
+            Path: The path the image will be written to.
+        """
+        if self._closed:
+            msg = "Cannot save images with a closed AsyncImageSaver."
+            raise RuntimeError(msg)
+        self._raise_pending_error()
+        path = Path(path)
+        if auto_indexing:
+            path = self._next_indexed_path(path)
+        if self.copy:
+            image = image.copy()
+        self._queue.put((image, path))
+        return path
+
+    def flush(self) -> None:
+        """Block until every queued image has been written."""
+        self._queue.join()
+        self._raise_pending_error()
+
+    def close(self) -> None:
+        """Flush the queue and stop the worker threads."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._workers:
+            self._queue.put(_STOP)
+        for worker in self._workers:
+            worker.join()
+        self._raise_pending_error()
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context and return the saver."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the saver when leaving the runtime context."""
+        self.close()
+
+    def _work(self) -> None:
+        """Write queued images until the stop marker is received."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                image, path = item
+                Image.fromarray(image).save(str(path))
+                logging.debug("Image saved to %s", str(path))
+            except Exception as error:  # noqa: BLE001
+                with self._lock:
+                    self._errors.append(error)
+            finally:
+                self._queue.task_done()
+
+    def _raise_pending_error(self) -> None:
+        """Re-raise the first error reported by a worker."""
+        with self._lock:
+            if not self._errors:
+                return
+            error = self._errors[0]
+            self._errors.clear()
+        raise error
+
+    def _next_indexed_path(self, path: Path) -> Path:
+        """Return the first free `{stem}_{index}{suffix}` path."""
+        key = (path.parent, path.stem, path.suffix)
+        with self._lock:
+            if key not in self._indices:
+                self._indices[key] = (_scan_indices(*key), 0)
+            taken, index = self._indices[key]
+            while index in taken:
+                index += 1
+            taken.add(index)
+            self._indices[key] = (taken, index + 1)
+        return path.parent / f"{path.stem}_{index}{path.suffix}"
+
+
+def _scan_indices(directory: Path, stem: str, suffix: str) -> set[int]:
+    """Return the indices of existing `{stem}_{index}{suffix}` files."""
+    pattern = re.compile(rf"{re.escape(stem)}_(\d+){re.escape(suffix)}")
+    if not directory.is_dir():
+        return set()
+    with os.scandir(directory) as entries:
+        return {
+            int(match.group(1))
+            for entry in entries
+            if (match := pattern.fullmatch(entry.name))
+        }
@@ -0,0 +1,100 @@
+"""Bounding Box Utility Module."""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def as_bbox_array(bboxes: np.ndarray | list[list]) -> np.ndarray:
+    """Convert bounding boxes to an integer array of shape (N, 4).
+
+    Coordinates are truncated to integers and each box is normalized so
+    that x1 <= x2 and y1 <= y2.
+
+    Args:
+        bboxes (np.ndarray | list[list]): The bounding boxes in format
+            [[x1, y1, x2, y2], ...].
+
+    Returns:
+        np.ndarray: The bounding boxes as an (N, 4) int64 array.
+    """
+    boxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+    boxes = boxes.astype(np.int64)
+    return np.concatenate(
+        [
+            np.minimum(boxes[:, :2], boxes[:, 2:]),
+            np.maximum(boxes[:, :2], boxes[:, 2:]),
+        ],
+        axis=1,
+    )
+
+
+def bbox_to_slices(
+    bboxes: np.ndarray | list[list], image_shape: tuple[int, ...]
+) -> np.ndarray:
+    """Convert inclusive bounding boxes to clipped half-open pixel ranges.
+
+    A box [x1, y1, x2, y2] covers the pixels x1..x2 and y1..y2 inclusive,
+    matching a filled `cv2.rectangle`. The result holds [x1, y1, x2, y2)
+    ranges clipped to the image, with empty boxes removed.
+
+    Args:
+        bboxes (np.ndarray | list[list]): The bounding boxes.
+        image_shape (tuple[int, ...]): The shape of the image (H, W, ...).
+
+    Returns:
+        np.ndarray: An (M, 4) int64 array of half-open ranges, M <= N.
+    """
+    height, width = image_shape[:2]
+    boxes = as_bbox_array(bboxes)
+    boxes[:, 2:] += 1
+    np.clip(boxes[:, 0::2], 0, width, out=boxes[:, 0::2])
+    np.clip(boxes[:, 1::2], 0, height, out=boxes[:, 1::2])
+    keep = (boxes[:, 2] > boxes[:, 0]) & (boxes[:, 3] > boxes[:, 1])
+    return boxes[keep]
+
+
+def merge_overlapping_bboxes(
+    bboxes: np.ndarray, margin: int = 0
+) -> list[np.ndarray]:
+    """Group boxes whose margin-expanded extents overlap.
+
+    Boxes are grouped by connected components of the overlap graph, so
+    chains of overlapping boxes end up in the same group.
+
+    Args:
+        bboxes (np.ndarray): An (N, 4) array of half-open [x1, y1, x2, y2)
+            ranges, as returned by `bbox_to_slices`.
+        margin (int): Distance each box is expanded by before testing for
+            overlap.
+
+    Returns:
+        list[np.ndarray]: The indices of the boxes in each group.
+    """
+    num_boxes = len(bboxes)
+    if num_boxes == 0:
+        return []
+    lo = bboxes[:, :2] - margin
+    hi = bboxes[:, 2:] + margin
+    overlap = np.all(
+        (lo[:, None, :] < hi[None, :, :]) & (lo[None, :, :] < hi[:, None, :]),
+        axis=2,
+    )
+
+    labels = np.full(num_boxes, -1, dtype=np.int64)
+    groups = []
+    for seed in range(num_boxes):
+        if labels[seed] >= 0:
+            continue
+        labels[seed] = len(groups)
+        frontier = np.array([seed])
+        members = [frontier]
+        while frontier.size:
+            neighbors = np.flatnonzero(
+                overlap[frontier].any(axis=0) & (labels < 0)
+            )
+            labels[neighbors] = labels[seed]
+            members.append(neighbors)
+            frontier = neighbors
+        groups.append(np.sort(np.concatenate(members)))
+    return groups
@@ -0,0 +1,399 @@
+"""Shared-Memory Frame Ring Module."""
+
+from __future__ import annotations
+
+import contextlib
+import itertools
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+# Rings attached by this process, by shared memory name
+_attached: dict[str, SharedFrameRing] = {}
+# Blocks that could not be closed because views of them were still alive
+_unclosed: list[shared_memory.SharedMemory] = []
+_tracker_lock = threading.Lock()
+
+
+class SharedFrameRing:
+    """Fixed-shape uint8 frame slots in one shared memory block.
+
+    Frames are handed between processes by slot index instead of being
+    pickled: the owner writes a frame into a free slot, passes the index
+    (and the ring, which pickles by name) to a worker, and both sides work
+    on NumPy views of the same memory.
+
+    Slots are reference counted in the owning process. `acquire` takes a
+    free slot with a count of one, blocking while every slot is in use,
+    which bounds the frames in flight; `retain` adds a reference for each
+    additional consumer and `release` drops one, freeing the slot at
+    zero. Processes that attach to the ring (by unpickling it) only read
+    and write slots.
+
+    Views of a slot are only valid while the slot is held. The owner
+    unlinks the shared memory on `close`.
+    """
+
+    def __init__(
+        self, frame_shape: tuple[int, int, int], num_slots: int
+    ) -> None:
+        """Create a ring of empty slots.
+
+        Args:
+            frame_shape (tuple[int, int, int]): The (H, W, C) shape of every frame.
+            num_slots (int): Number of frame slots.
+        """  # noqa: E501
+        frame_shape = tuple(int(dim) for dim in frame_shape)
+        if len(frame_shape) != 3 or min(frame_shape) < 1 or num_slots < 1:  # noqa: PLR2004
+            msg = (
+                "frame_shape must be a positive (H, W, C) tuple and "
+                "num_slots positive."
+            )
+            raise ValueError(msg)
+        size = num_slots * int(np.prod(frame_shape))
+        self._setup(
+            shared_memory.SharedMemory(create=True, size=size),
+            frame_shape,
+            num_slots,
+            owner=True,
+        )
+
+    @classmethod
+    def attach(
+        cls,
+        name: str,
+        frame_shape: tuple[int, int, int],
+        num_slots: int,
+    ) -> Self:
+        """Attach to a ring created by another process.
+
+        Attached rings are cached per process, so repeated calls (e.g.
+        one per task) map the shared memory once. Attaching also closes
+        the cached rings whose owner has closed them since.
+
+        Args:
+            name (str): The shared memory name, `ring.name` of the owner.
+            frame_shape (tuple[int, int, int]): The (H, W, C) shape of every frame.
+            num_slots (int): Number of frame slots.
+
+        Returns:
+            SharedFrameRing: A ring that reads and writes the owner's slots.
+        """  # noqa: E501
+        ring = _attached.get(name)
+        if ring is None or ring.closed:
+            release_stale_rings()
+            ring = cls._from_memory(
+                _open_untracked(name), frame_shape, num_slots, owner=False
+            )
+            _attached[name] = ring
+        return ring
+
+    @classmethod
+    def _from_memory(
+        cls,
+        shm: shared_memory.SharedMemory,
+        frame_shape: tuple[int, int, int],
+        num_slots: int,
+        owner: bool,
+    ) -> Self:
+        """Build a ring on an already opened shared memory block."""
+        ring = cls.__new__(cls)
+        cls._setup(ring, shm, tuple(frame_shape), num_slots, owner)
+        return ring
+
+    def _setup(
+        self,
+        shm: shared_memory.SharedMemory,
+        frame_shape: tuple[int, int, int],
+        num_slots: int,
+        owner: bool,
+    ) -> None:
+        self._shm = shm
+        self.name = shm.name
+        self.frame_shape = frame_shape
+        self.num_slots = num_slots
+        self.owner = owner
+        self.frames = np.ndarray(
+            (num_slots, *frame_shape), dtype=np.uint8, buffer=shm.buf
+        )
+        self._refcounts = [0] * num_slots
+        self._free = deque(range(num_slots))
+        self._condition = threading.Condition()
+
+    @property
+    def closed(self) -> bool:
+        """Whether `close` was called."""
+        return self._shm is None
+
+    def acquire(self, timeout: float | None = None) -> int:
+        """Take a free slot with a reference count of one.
+
+        Args:
+            timeout (float | None): Seconds to wait for a free slot. Defaults to None (wait forever).
+
+        Returns:
+            int: The slot index.
+        """  # noqa: E501
+        self._check_owner()
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._free, timeout):
+                msg = "No frame slot was released in time."
+                raise TimeoutError(msg)
+            slot = self._free.popleft()
+            self._refcounts[slot] = 1
+            return slot
+
+    def put(self, frame: np.ndarray, timeout: float | None = None) -> int:
+        """Copy a frame into a newly acquired slot and return its index."""
+        if frame.shape != self.frame_shape:
+            msg = (
+                f"Expected frames of shape {self.frame_shape}, got "
+                f"{frame.shape}."
+            )
+            raise ValueError(msg)
+        slot = self.acquire(timeout)
+        self.frames[slot] = frame
+        return slot
+
+    def retain(self, slot: int) -> None:
+        """Add a reference to a held slot."""
+        self._check_owner()
+        with self._condition:
+            if not self._refcounts[slot]:
+                msg = f"Slot {slot} is not held."
+                raise ValueError(msg)
+            self._refcounts[slot] += 1
+
+    def release(self, slot: int) -> None:
+        """Drop a reference to a slot, freeing it at zero."""
+        self._check_owner()
+        with self._condition:
+            if not self._refcounts[slot]:
+                msg = f"Slot {slot} is not held."
+                raise ValueError(msg)
+            self._refcounts[slot] -= 1
+            if not self._refcounts[slot]:
+                self._free.append(slot)
+                self._condition.notify()
+
+    def refcount(self, slot: int) -> int:
+        """Return the number of references to a slot."""
+        with self._condition:
+            return self._refcounts[slot]
+
+    def close(self) -> None:
+        """Unmap the slots, and unlink the shared memory if owned.
+
+        Calling `close` more than once is a no-op.
+        """
+        if self._shm is None:
+            return
+        shm, self._shm = self._shm, None
+        self.frames = None
+        if self.owner:
+            shm.unlink()
+        try:
+            shm.close()
+        except BufferError:
+            # Views of the slots are still alive, keep the mapping until exit
+            _unclosed.append(shm)
+
+    def __getitem__(self, slot: int) -> np.ndarray:
+        """Return a writable (H, W, C) view of a slot."""
+        return self.frames[slot]
+
+    def __len__(self) -> int:
+        """Return the number of slots."""
+        return self.num_slots
+
+    def __reduce__(self) -> tuple:
+        """Pickle by name, so other processes attach to the same memory."""
+        return (
+            _attach_ring,
+            (self.name, self.frame_shape, self.num_slots),
+        )
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context and return the ring."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the ring when leaving the runtime context."""
+        self.close()
+
+    def _check_owner(self) -> None:
+        if not self.owner:
+            msg = "Only the process that created the ring manages its slots."
+            raise RuntimeError(msg)
+
+
+def map_shared(
+    func: Callable[..., np.ndarray | None],
+    frames: Iterable[np.ndarray],
+    *frame_args: Iterable,
+    num_workers: int = 4,
+    num_slots: int | None = None,
+    copy: bool = True,
+    executor: Executor | None = None,
+    **kwargs: object,
+) -> Iterator[np.ndarray]:
+    """Apply `func` to frames on a process pool without pickling them.
+
+    Each frame is copied into a `SharedFrameRing` slot and the worker
+    calls `func(view, *args, **kwargs)` on a view of that slot, where
+    `args` holds the frame's item of each of `frame_args` (e.g. its
+    boxes). Functions that draw in place, like `visualize_bbox` or
+    `ImageFilter.apply_filter_to_bbox` with `inplace=True`, touch the
+    frame only in shared memory; a returned array of the same shape that
+    is not the view is copied back into the slot. Only the slot index and
+    the per-frame arguments cross the process boundary.
+
+    Results are yielded in order. At most `num_slots` frames are in
+    flight, so a slow consumer stalls the producer instead of growing
+    memory.
+
+    Args:
+        func (Callable): A picklable function taking the frame first, e.g. `ImageFilter().apply_filter_to_bbox`.
+        frames (Iterable[np.ndarray]): uint8 frames of one shape.
+        *frame_args (Iterable): Per-frame positional arguments, zipped with `frames`.
+        num_workers (int, optional): Size of the process pool. Defaults to 4.
+        num_slots (int | None, optional): Number of ring slots. Defaults to twice the number of workers plus one.
+        copy (bool, optional): Yield copies. With False, yield views of the slots that are only valid until the next frame is requested. Defaults to True.
+        executor (Executor | None, optional): A process pool to run on instead of a new one. At the end, `num_workers` tasks release the ring in the workers that run them. Defaults to None.
+        **kwargs: Keyword arguments passed to `func` for every frame.
+
+    Yields:
+        np.ndarray: The processed frames.
+    """  # noqa: E501
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None:
+        return
+    num_slots = num_slots or 2 * num_workers + 1
+    ring = SharedFrameRing(first.shape, max(num_slots, 2))
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=num_workers)
+    pending: deque = deque()
+    try:
+        for frame, *args in zip(itertools.chain([first], frames), *frame_args):
+            if len(pending) >= ring.num_slots - 1:
+                yield from _yield_oldest(ring, pending, copy)
+            slot = ring.put(frame)
+            pending.append(
+                (
+                    slot,
+                    executor.submit(
+                        _process_slot, ring, slot, func, args, kwargs
+                    ),
+                )
+            )
+        while pending:
+            yield from _yield_oldest(ring, pending, copy)
+    finally:
+        for _, future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+        ring.close()
+        if not own_executor:
+            # Let the pool's workers unmap the ring now that it is unlinked
+            with contextlib.suppress(RuntimeError):
+                for future in [
+                    executor.submit(release_stale_rings)
+                    for _ in range(num_workers)
+                ]:
+                    future.result()
+
+
+def _yield_oldest(
+    ring: SharedFrameRing, pending: deque, copy: bool
+) -> Iterator[np.ndarray]:
+    """Wait for the oldest frame, yield it and free its slot."""
+    slot, future = pending[0]
+    future.result()
+    pending.popleft()
+    try:
+        yield ring[slot].copy() if copy else ring[slot]
+    finally:
+        ring.release(slot)
+
+
+def _open_untracked(name: str) -> shared_memory.SharedMemory:
+    """Open a shared memory block without registering it for cleanup.
+
+    The resource tracker of a process that merely attaches would unlink
+    the block when that process exits, while the owner still uses it.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    with _tracker_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *_: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def release_stale_rings() -> int:
+    """Close the attached rings whose owner has unlinked their memory.
+
+    The owner's `unlink` only frees the memory once every process that
+    attached has closed its mapping. `attach` calls this before mapping a
+    new ring, so a worker of a long-lived pool keeps at most one finished
+    ring mapped, and `map_shared` also runs it as tasks on the pool of an
+    `executor` it was given.
+
+    Returns:
+        int: Number of rings closed.
+    """
+    stale = []
+    for name, ring in list(_attached.items()):
+        try:
+            _open_untracked(name).close()
+        except FileNotFoundError:
+            stale.append(name)
+            ring.close()
+            del _attached[name]
+        else:
+            if ring.closed:
+                del _attached[name]
+    return len(stale)
+
+
+def _attach_ring(
+    name: str, frame_shape: tuple[int, int, int], num_slots: int
+) -> SharedFrameRing:
+    """Unpickle a ring by attaching to its shared memory."""
+    return SharedFrameRing.attach(name, frame_shape, num_slots)
+
+
+def _process_slot(
+    ring: SharedFrameRing,
+    slot: int,
+    func: Callable[..., np.ndarray | None],
+    args: list,
+    kwargs: dict,
+) -> None:
+    """Run `func` on a slot's view and store its result (pool task)."""
+    view = ring[slot]
+    result = func(view, *args, **kwargs)
+    if isinstance(result, np.ndarray) and not np.shares_memory(result, view):
+        view[...] = result
@@ -0,0 +1,368 @@
+"""Memory-Mapped Frame Store Module."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import operator
+import os
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from cogcvutil.image.common.utility.io_util import (
+    iter_images,
+    list_images_sorted,
+)
+from cogcvutil.video.reader.video_to_images import VideoReader
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from types import TracebackType
+    from typing import BinaryIO
+
+    from typing_extensions import Self
+
+FRAME_STORE_MAGIC = b"CGCVFRMS"
+FRAME_STORE_VERSION = 1
+# magic, version, height, width, channels, number of frames, index offset
+_HEADER = struct.Struct("<8sIIIIQQ")
+_HEADER_SIZE = 64
+# Minimum room, in frames, left for new frames when the index is moved
+_INDEX_RESERVE_FRAMES = 16
+
+
+class FrameStore:
+    """Fixed-shape uint8 frames in a single memory-mapped file.
+
+    The file holds a 64 byte header, the frames back to back as one
+    (N, H, W, C) uint8 block, and a JSON index with the source of each
+    frame. Frames are read through a read-only `np.memmap`, so `store[i]`
+    and `store[i:j]` are views with no decode and no copy, and processes
+    that open the same file share its pages through the OS page cache.
+    Stores pickle by path, so they can be passed to process pools.
+
+    A store has a single writer. Appending writes the new frames after
+    the last one and a new index where it does not overlap the current
+    one, and rewrites the header last, so a failed or interrupted append
+    leaves a valid store. Existing frames never move. Other readers see
+    appended frames after `refresh`.
+    """
+
+    def __init__(self, path: str | Path, writable: bool = False) -> None:
+        """Open an existing frame store.
+
+        Args:
+            path (str | Path): Path to the frame store file.
+            writable (bool, optional): Allow `append`. Defaults to False.
+        """
+        self.path = Path(path)
+        if not self.path.is_file():
+            msg = "The frame store was not found at the specified path."
+            raise FileNotFoundError(msg)
+        self.writable = writable
+        self.refresh()
+
+    @classmethod
+    def create(
+        cls,
+        path: str | Path,
+        frame_shape: tuple[int, int, int],
+        overwrite: bool = False,
+    ) -> Self:
+        """Create an empty, writable frame store.
+
+        Args:
+            path (str | Path): Path of the new frame store file.
+            frame_shape (tuple[int, int, int]): The (H, W, C) shape of every frame.
+            overwrite (bool, optional): Replace an existing file. Defaults to False.
+
+        Returns:
+            FrameStore: The new store, opened for appending.
+        """  # noqa: E501
+        path = Path(path)
+        if path.exists() and not overwrite:
+            msg = f"The frame store {path} already exists."
+            raise FileExistsError(msg)
+        frame_shape = tuple(int(dim) for dim in frame_shape)
+        if len(frame_shape) != 3 or min(frame_shape) < 1:  # noqa: PLR2004
+            msg = "frame_shape must be a positive (H, W, C) tuple."
+            raise ValueError(msg)
+        with path.open("wb") as file:
+            file.write(_pack_header(frame_shape, 0, _HEADER_SIZE))
+            file.write(b"[]")
+        return cls(path, writable=True)
+
+    @classmethod
+    def from_images(
+        cls,
+        path: str | Path,
+        directory: str | Path,
+        num_workers: int = 4,
+        overwrite: bool = False,
+    ) -> Self:
+        """Build a frame store from a directory of images.
+
+        Images are read in natural numeric order, like `read_images_sorted`,
+        and stored as RGB. Each frame's source is its file name.
+
+        Args:
+            path (str | Path): Path of the new frame store file.
+            directory (str | Path): The directory containing the images.
+            num_workers (int, optional): Number of decode workers. Defaults to 4.
+            overwrite (bool, optional): Replace an existing file. Defaults to False.
+
+        Returns:
+            FrameStore: The new store, opened for appending.
+        """  # noqa: E501
+        paths = list_images_sorted(directory)
+        if not paths:
+            msg = "No images were found in the directory."
+            raise ValueError(msg)
+        images = iter_images(paths, num_workers)
+        first = next(images)
+        store = cls.create(path, first.shape, overwrite)
+        store.append(
+            itertools.chain([first], images), [path.name for path in paths]
+        )
+        return store
+
+    @classmethod
+    def from_video(
+        cls,
+        path: str | Path,
+        video_path: str | Path,
+        overwrite: bool = False,
+        **reader_kwargs: object,
+    ) -> Self:
+        """Build a frame store from the RGB frames of a video.
+
+        Each frame's source is "<video name>:<frame index>".
+
+        Args:
+            path (str | Path): Path of the new frame store file.
+            video_path (str | Path): Path to the video file.
+            overwrite (bool, optional): Replace an existing file. Defaults to False.
+            **reader_kwargs: Passed to `VideoReader`, e.g. a frame range or stride.
+
+        Returns:
+            FrameStore: The new store, opened for appending.
+        """  # noqa: E501
+        with VideoReader(video_path, **reader_kwargs) as reader:
+            frame_indices = itertools.count(reader.position, reader.stride)
+            frames = iter(reader)
+            first = next(frames, None)
+            if first is None:
+                msg = "The video has no frames in the requested range."
+                raise ValueError(msg)
+            store = cls.create(path, first.shape, overwrite)
+            store.append(
+                itertools.chain([first], frames),
+                (f"{reader.path.name}:{idx}" for idx in frame_indices),
+            )
+        return store
+
+    def refresh(self) -> None:
+        """Re-read the header and index and remap the frames."""
+        with self.path.open("rb") as file:
+            header = file.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                msg = f"{self.path} is not a frame store."
+                raise ValueError(msg)
+            magic, version, *frame_shape, num_frames, index_offset = (
+                _HEADER.unpack(header)
+            )
+            if magic != FRAME_STORE_MAGIC:
+                msg = f"{self.path} is not a frame store."
+                raise ValueError(msg)
+            if version != FRAME_STORE_VERSION:
+                msg = f"Unsupported frame store version {version}."
+                raise ValueError(msg)
+            file.seek(index_offset)
+            # Bytes after the index are left over from an earlier append
+            sources, _ = json.JSONDecoder().raw_decode(file.read().decode())
+            self.sources: list[str | None] = sources
+
+        self.frame_shape = tuple(frame_shape)
+        self._index_offset = index_offset
+        shape = (num_frames, *self.frame_shape)
+        if num_frames:
+            self._frames = np.memmap(
+                self.path, np.uint8, "r", _HEADER_SIZE, shape
+            ).view(np.ndarray)
+        else:
+            # mmap cannot map zero bytes
+            self._frames = np.empty(shape, dtype=np.uint8)
+            self._frames.setflags(write=False)
+
+    def append(
+        self,
+        frames: np.ndarray | Iterable[np.ndarray],
+        sources: Iterable[str] | None = None,
+    ) -> int:
+        """Append frames to the end of the store.
+
+        Frames are written one at a time, so any iterable (e.g. a frame
+        source) can be stored without holding it in memory. If writing
+        fails part way, the frames written so far are kept.
+
+        The header only ever points at a complete index. When the next
+        frame would overwrite the current index, the index is first
+        copied past the room expected for the new frames and the header
+        moved to the copy. Once the frames are written, the new index is
+        written where it overlaps neither, and the header is rewritten
+        last to commit the append.
+
+        Args:
+            frames (np.ndarray | Iterable[np.ndarray]): A single frame, an (N, H, W, C) stack or an iterable of frames.
+            sources (Iterable[str] | None, optional): The source of each frame, stored in the index. Defaults to None.
+
+        Returns:
+            int: The number of frames appended.
+        """  # noqa: E501
+        if not self.writable:
+            msg = "The frame store was opened read-only."
+            raise PermissionError(msg)
+        if isinstance(frames, np.ndarray) and frames.shape == self.frame_shape:
+            frames = frames[None]
+        sources = iter(sources) if sources is not None else None
+        new_sources = []
+        frame_size = int(np.prod(self.frame_shape))
+        expected = operator.length_hint(frames)
+        num_frames = len(self.sources)
+        with self.path.open("r+b") as file:
+            position = _HEADER_SIZE + num_frames * frame_size
+            index_offset = self._index_offset
+            index_end = file.seek(0, os.SEEK_END)
+            try:
+                for frame in frames:
+                    if frame.shape != self.frame_shape or (
+                        frame.dtype != np.uint8
+                    ):
+                        msg = (
+                            f"Expected uint8 frames of shape "
+                            f"{self.frame_shape}, got {frame.dtype} frame "
+                            f"of shape {frame.shape}."
+                        )
+                        raise ValueError(msg)
+                    if position + frame_size > index_offset:
+                        reserve = max(
+                            expected - len(new_sources),
+                            len(new_sources),
+                            _INDEX_RESERVE_FRAMES,
+                        )
+                        index_offset = max(
+                            position + reserve * frame_size, index_end
+                        )
+                        index_end = _commit_index(
+                            file,
+                            index_offset,
+                            json.dumps(self.sources).encode(),
+                            self.frame_shape,
+                            num_frames,
+                        )
+                    file.seek(position)
+                    file.write(np.ascontiguousarray(frame).data)
+                    position += frame_size
+                    new_sources.append(next(sources, None) if sources else None)
+            finally:
+                self.sources.extend(new_sources)
+                index = json.dumps(self.sources).encode()
+                # Right after the frames if it fits before the current index
+                offset = (
+                    position
+                    if position + len(index) <= index_offset
+                    else index_end
+                )
+                file.truncate(
+                    _commit_index(
+                        file,
+                        offset,
+                        index,
+                        self.frame_shape,
+                        len(self.sources),
+                    )
+                )
+                self.refresh()
+        return len(new_sources)
+
+    def close(self) -> None:
+        """Release this store's mapping of the file.
+
+        Views returned earlier keep the file mapped until they are freed.
+        """
+        self._frames = np.empty((0, *self.frame_shape), dtype=np.uint8)
+
+    def __len__(self) -> int:
+        """Return the number of frames."""
+        return len(self._frames)
+
+    def __getitem__(self, key: int | slice | np.ndarray) -> np.ndarray:
+        """Return a read-only frame or (N, H, W, C) stack.
+
+        Integers and slices return views of the file; index arrays copy.
+        """
+        return self._frames[key]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        """Yield read-only views of the frames in order."""
+        return iter(self._frames)
+
+    def __reduce__(self) -> tuple:
+        """Pickle by path; unpickled stores are reopened read-only."""
+        return type(self), (self.path,)
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context and return the store."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the store when leaving the runtime context."""
+        self.close()
+
+
+def _commit_index(
+    file: BinaryIO,
+    offset: int,
+    index: bytes,
+    frame_shape: tuple[int, ...],
+    num_frames: int,
+) -> int:
+    """Write `index` at `offset`, then point the header at it.
+
+    Everything written before, frames included, reaches the disk before
+    the header does.
+
+    Returns:
+        int: The end offset of the index.
+    """
+    file.seek(offset)
+    file.write(index)
+    file.flush()
+    os.fsync(file.fileno())
+    file.seek(0)
+    file.write(_pack_header(frame_shape, num_frames, offset))
+    file.flush()
+    os.fsync(file.fileno())
+    return offset + len(index)
+
+
+def _pack_header(
+    frame_shape: tuple[int, ...], num_frames: int, index_offset: int
+) -> bytes:
+    """Pack the file header, padded to the start of the frame block."""
+    header = _HEADER.pack(
+        FRAME_STORE_MAGIC,
+        FRAME_STORE_VERSION,
+        *frame_shape,
+        num_frames,
+        index_offset,
+    )
+    return header.ljust(_HEADER_SIZE, b"\0")
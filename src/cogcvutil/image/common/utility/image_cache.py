@@ -0,0 +1,162 @@
+"""Decoded Image Cache Module."""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from cogcvutil.image.common.utility.io_util import read_image
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class ImageCache:
+    """Thread-safe LRU cache of decoded images with a byte budget.
+
+    `read_image` behaves like `cogcvutil.read_image` but keeps decoded
+    images in memory, keyed by path, modification time, file size, format
+    and decode options, so a file that changes on disk is decoded again.
+    When the cached images exceed `max_bytes`, the least recently used
+    are evicted.
+
+    NumPy images are returned as read-only views, so callers cannot
+    corrupt the cached array; `np.array(image)` gives a writable copy.
+    PIL images and torch tensors are mutable, so they are returned as
+    copies, which still skips the decode.
+
+    Concurrent misses for the same key decode the image once; the other
+    callers wait for that decode and count as hits.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024**2) -> None:
+        """Initialize ImageCache.
+
+        Args:
+            max_bytes (int): Memory budget for decoded images in bytes. Default is 512 MiB.
+        """  # noqa: E501
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._pending: dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    def read_image(
+        self,
+        path: str | Path,
+        format_type: str = "numpy",
+        backend: str = "auto",
+        target_size: tuple[int, int] | None = None,
+    ) -> np.ndarray | Any:  # noqa: ANN401
+        """Read an image through the cache, see `cogcvutil.read_image`.
+
+        Args:
+            path (str | Path): The path to the image file.
+            format_type (str): The format to return the image in, 'numpy', 'torch' or 'PIL'.
+            backend (str): The decoder, 'auto', 'PIL', 'cv2' or 'imageio'.
+            target_size (tuple[int, int] | None): If set, the (width, height) to resize the image to.
+
+        Returns:
+            np.ndarray | Any: The image, read-only for 'numpy'.
+        """  # noqa: E501
+        try:
+            stat = os.stat(path)  # noqa: PTH116
+        except FileNotFoundError:
+            msg = "The image file was not found at the specified path."
+            raise FileNotFoundError(msg)  # noqa: B904
+        key = (
+            os.fspath(path),
+            stat.st_mtime_ns,
+            stat.st_size,
+            format_type,
+            backend,
+            None if target_size is None else tuple(target_size),
+        )
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _protect(self._entries[key][0])
+            pending = self._pending.get(key)
+            if pending is None:
+                self.misses += 1
+                self._pending[key] = future = Future()
+            else:
+                self.hits += 1
+        if pending is not None:
+            return _protect(pending.result())
+
+        try:
+            image = read_image(path, format_type, backend, target_size)
+        except BaseException as error:
+            with self._lock:
+                del self._pending[key]
+            future.set_exception(error)
+            raise
+        if isinstance(image, np.ndarray):
+            image.setflags(write=False)
+        self._store(key, image)
+        future.set_result(image)
+        return _protect(image)
+
+    def _store(self, key: tuple, image: Any) -> None:  # noqa: ANN401
+        """Insert a decoded `image` and evict the least recently used."""
+        nbytes = _nbytes(image)
+        with self._lock:
+            del self._pending[key]
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (image, nbytes)
+            self.current_bytes += nbytes
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        """Return the hit/miss/eviction counters and the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+def _protect(image: Any) -> Any:  # noqa: ANN401
+    """Return a view or copy of a cached image that callers may keep."""
+    if isinstance(image, np.ndarray):
+        return image.view()
+    if hasattr(image, "clone"):  # torch.Tensor
+        return image.clone()
+    return image.copy()
+
+
+def _nbytes(image: Any) -> int:  # noqa: ANN401
+    """Return the decoded size of a NumPy, torch or PIL image."""
+    if isinstance(image, np.ndarray):
+        return image.nbytes
+    if hasattr(image, "element_size"):  # torch.Tensor
+        return image.element_size() * image.nelement()
+    return image.width * image.height * len(image.getbands())
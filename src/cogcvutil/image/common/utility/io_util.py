@@ -2,15 +2,34 @@
 
 from __future__ import annotations
 
+import io
 import logging
 import os
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import cv2
 import numpy as np
 from PIL import Image
 
+from cogcvutil.common.converter.color import bgr_to_rgb
+from cogcvutil.common.utility.profiling import instrument
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+JPEG_EXTENSIONS = (".jpg", ".jpeg")
+# Reduced decode scales, largest first
+_CV2_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
 
 def numeric_sort_key(s: str) -> list:
     """Natural sort key function for sorting filenames.
@@ -28,78 +47,310 @@ def numeric_sort_key(s: str) -> list:
     ]
 
 
+@instrument()
 def read_image(
-    path: str, format_type: np.ndarray = "numpy"
+    path: str,
+    format_type: np.ndarray = "numpy",
+    backend: str = "auto",
+    target_size: tuple[int, int] | None = None,
 ) -> np.ndarray | Image.Image | any:
     """Reads an image and returns it in the specified format.
 
     Args:
         path (str): The path to the image file.
         format_type (str): The format to return the image in.
+        backend (str): The decoder, 'auto', 'PIL', 'cv2' or 'imageio'.
+            'auto' decodes PNG and JPEG files with OpenCV, which avoids
+            PIL's extra conversion copy, and everything else (and 'PIL'
+            output) with PIL.
+        target_size (tuple[int, int] | None): If set, the (width, height)
+            to resize the image to. JPEG files are decoded at the smallest
+            1/2, 1/4 or 1/8 scale that still covers the target size, so
+            small previews of large frames skip most of the decode.
 
     Supported formats: 'numpy', 'torch', 'PIL'.
-
+    Use `ImageCache.read_image` to keep decoded images in memory.
 
     Return:
-        if numpy of torch, shape of image is (H, W, C)
+        if numpy, shape of image is (H, W, C)
+        if torch, a contiguous uint8 tensor of shape (C, H, W)
 
     Raises FileNotFoundError if the image can't be found,
-           ValueError for unsupported formats.
+           ValueError for unsupported formats or backends.
     """
+    if format_type not in {"numpy", "torch", "PIL"}:
+        msg = (
+            "Unsupported format type. Choose 'numpy', 'torch', 'PIL', or 'cv'."
+        )
+        raise ValueError(msg)
+    if backend == "auto":
+        use_cv2 = format_type != "PIL" and _has_extension(
+            path, IMAGE_EXTENSIONS
+        )
+        backend = "cv2" if use_cv2 else "PIL"
+
     try:
-        # Load the image with PIL
-        img = Image.open(path).convert("RGB")
+        if backend == "PIL":
+            img = _decode_pil(path, target_size)
+            if format_type == "PIL":
+                return img
+            img_array = np.asarray(img)
+        elif backend == "cv2":
+            img_array = _decode_cv2(path, target_size)
+        elif backend == "imageio":
+            img_array = _decode_imageio(path, target_size)
+        else:
+            msg = (
+                "Unsupported backend. Choose 'auto', 'PIL', 'cv2' or 'imageio'."
+            )
+            raise ValueError(msg)
     except FileNotFoundError:
         msg = "The image file was not found at the specified path."
         raise FileNotFoundError(msg)  # noqa: B904
 
-    img_array = np.asarray(img)
-
     if format_type == "numpy":
         return img_array
 
     elif format_type == "torch":  # noqa: RET505
-        import torch
+        # torch is optional and slow to import, so load it only when asked
+        import torch  # noqa: PLC0415
 
-        # Convert HWC to CHW format and ensure it is a float tensor normalized between 0 and 1
-        return torch.from_numpy(img_array)
-    elif format_type == "PIL":
-        return img
-    else:
-        msg = (
-            "Unsupported format type. Choose 'numpy', 'torch', 'PIL', or 'cv'."
+        # Convert HWC to a contiguous CHW tensor with a single copy
+        return torch.from_numpy(
+            np.ascontiguousarray(img_array.transpose(2, 0, 1))
         )
+    return Image.fromarray(img_array)
+
+
+def _has_extension(path: str | Path, extensions: tuple[str, ...]) -> bool:
+    """Return whether `path` ends with one of `extensions`, ignoring case."""
+    return os.fspath(path).lower().endswith(extensions)
+
+
+def _decode_pil(
+    path: str | Path, target_size: tuple[int, int] | None
+) -> Image.Image:
+    """Decode an RGB image with PIL, using JPEG draft mode if resizing."""
+    img = Image.open(path)
+    if target_size is not None:
+        # Only JPEG supports draft mode, other formats ignore it
+        img.draft("RGB", tuple(target_size))
+    img = img.convert("RGB")
+    if target_size is not None and img.size != tuple(target_size):
+        img = img.resize(tuple(target_size), Image.Resampling.BOX)
+    return img
+
+
+def _decode_cv2(
+    path: str | Path, target_size: tuple[int, int] | None
+) -> np.ndarray:
+    """Decode an RGB image with OpenCV, using reduced JPEG decoding."""
+    buffer = np.fromfile(path, dtype=np.uint8)
+    flags = cv2.IMREAD_COLOR
+    if target_size is not None and _has_extension(path, JPEG_EXTENSIONS):
+        with Image.open(io.BytesIO(buffer)) as header:  # parses the header
+            width, height = header.size
+        for factor, reduced_flag in _CV2_REDUCED_FLAGS:
+            if (
+                -(-width // factor) >= target_size[0]
+                and -(-height // factor) >= target_size[1]
+            ):
+                flags = reduced_flag
+                break
+    # Match PIL, which does not apply the EXIF orientation
+    image = cv2.imdecode(buffer, flags | cv2.IMREAD_IGNORE_ORIENTATION)
+    if image is None:
+        msg = "The image file could not be decoded."
         raise ValueError(msg)
+    # Convert from BGR to RGB without allocating a second frame
+    return _resize(bgr_to_rgb(image, mode="inplace"), target_size)
+
+
+def _decode_imageio(
+    path: str | Path, target_size: tuple[int, int] | None
+) -> np.ndarray:
+    """Decode an RGB image with imageio."""
+    # imageio is slow to import, so load it only for this backend
+    import imageio.v3 as iio  # noqa: PLC0415
+
+    image = iio.imread(path)
+    if image.ndim == 2:  # noqa: PLR2004
+        image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+    elif image.shape[2] == 4:  # noqa: PLR2004
+        image = np.ascontiguousarray(image[..., :3])
+    return _resize(image, target_size)
+
+
+def _resize(
+    image: np.ndarray, target_size: tuple[int, int] | None
+) -> np.ndarray:
+    """Resize `image` to the (width, height) `target_size` if it differs."""
+    if target_size is None or image.shape[1::-1] == tuple(target_size):
+        return image
+    return cv2.resize(image, tuple(target_size), interpolation=cv2.INTER_AREA)
+
+
+def list_images_sorted(directory: str | Path) -> list[Path]:
+    """List image files in a directory in natural numeric order.
 
+    Only lists files with the extensions .png, .jpg, and .jpeg.
 
-def read_images_sorted(directory: str) -> list[np.ndarray]:
+    Args:
+        directory (str | Path): The directory path containing the images.
+
+    Returns:
+        list[Path]: The sorted image paths.
+    """
+    files = Path(directory).iterdir()
+    # Sort files using the numeric_sort_key function
+    sorted_files = sorted(files, key=lambda path: numeric_sort_key(path.name))
+    return [
+        file
+        for file in sorted_files
+        if file.name.endswith(IMAGE_EXTENSIONS)  # Extend or modify as needed
+    ]
+
+
+@instrument("iter_images.decode")
+def _read_color(path: str | Path, color_order: str = "rgb") -> np.ndarray:
+    """Decode an image file with OpenCV in the requested channel order."""
+    image = cv2.imread(str(path))
+    if color_order == "bgr":
+        return image
+    # Convert from BGR to RGB without allocating a second frame
+    return bgr_to_rgb(image, mode="inplace")
+
+
+def iter_images(
+    paths: Iterable[str | Path],
+    num_workers: int = 4,
+    use_processes: bool = False,
+    prefetch: int | None = None,
+    color_order: str = "rgb",
+) -> Iterator[np.ndarray]:
+    """Lazily read images from a sequence of paths, preserving order.
+
+    Images are decoded on a thread (or process) pool while the caller
+    consumes earlier ones. At most `prefetch` decodes are in flight, so
+    memory is bounded by the read-ahead window rather than the number of
+    paths.
+
+    Args:
+        paths (Iterable[str | Path]): The image paths to read.
+        num_workers (int): Number of decode workers. With 1 (or fewer)
+            images are decoded inline on the calling thread.
+        use_processes (bool): Decode on a process pool instead of a thread
+            pool. OpenCV releases the GIL while decoding, so threads are
+            usually sufficient.
+        prefetch (int | None): Maximum number of images decoded ahead of
+            the consumer. Defaults to twice the number of workers.
+        color_order (str): Channel order of the images, "rgb" or "bgr".
+            "bgr" is OpenCV's native order and skips the channel swap.
+
+    Yields:
+        np.ndarray: Images in `color_order`.
+    """
+    if color_order not in {"rgb", "bgr"}:
+        msg = "Unsupported color order. Choose 'bgr' or 'rgb'."
+        raise ValueError(msg)
+    if num_workers <= 1:
+        for path in paths:
+            yield _read_color(path, color_order)
+        return
+
+    window = max(prefetch or 2 * num_workers, 1)
+    executor_class = (
+        ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    )
+    with executor_class(max_workers=num_workers) as executor:
+        pending = deque()
+        try:
+            for path in paths:
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(_read_color, path, color_order))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def iter_images_sorted(
+    directory: str | Path,
+    num_workers: int = 4,
+    use_processes: bool = False,
+    prefetch: int | None = None,
+    batch_size: int | None = None,
+    color_order: str = "rgb",
+) -> Iterator[np.ndarray]:
+    """Lazily read images in natural numeric order.
+
+    Only reads files with the extensions .png, .jpg, and .jpeg. Decoding
+    runs ahead of the consumer on a worker pool, see `iter_images`.
+
+    Args:
+        directory (str | Path): The directory path containing the images.
+        num_workers (int): Number of decode workers.
+        use_processes (bool): Decode on a process pool instead of a thread
+            pool.
+        prefetch (int | None): Maximum number of images decoded ahead of
+            the consumer. Defaults to twice the number of workers.
+        batch_size (int | None): If set, yield stacked arrays of shape
+            (N, H, W, C) with up to `batch_size` images instead of single
+            images. All images in a batch must have the same shape.
+        color_order (str): Channel order of the images, "rgb" or "bgr".
+
+    Yields:
+        np.ndarray: Images (or batches of images) in `color_order`.
+    """
+    images = iter_images(
+        list_images_sorted(directory),
+        num_workers,
+        use_processes,
+        prefetch,
+        color_order,
+    )
+    if not batch_size:
+        yield from images
+        return
+
+    batch = []
+    for image in images:
+        batch.append(image)
+        if len(batch) == batch_size:
+            yield np.stack(batch)
+            batch = []
+    if batch:
+        yield np.stack(batch)
+
+
+def read_images_sorted(
+    directory: str, color_order: str = "rgb"
+) -> list[np.ndarray]:
     """Reads images and sort them in natural numeric order.
 
     Only reads files with the extensions .png, .jpg, and .jpeg.
+    Use `iter_images_sorted` to decode lazily and in parallel.
 
     Args:
         directory (str): The directory path containing the images.
+        color_order (str): Channel order of the images, "rgb" or "bgr".
 
     Returns:
-        List[np.ndarray]: A list of images as numpy arrays in RGB format.
+        List[np.ndarray]: A list of images as numpy arrays in `color_order`.
     """
-    files = os.listdir(directory)
-    # Sort files using the numeric_sort_key function
-    sorted_files = sorted(files, key=numeric_sort_key)
-    images = []
-    for file in sorted_files:
-        if file.endswith(
-            (".png", ".jpg", ".jpeg")
-        ):  # Extend or modify as needed
-            path = Path(directory) / file
-            image = cv2.imread(str(path))
-            # Convert from BGR to RGB
-            images.append(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
-    return images
+    return list(
+        iter_images_sorted(directory, num_workers=1, color_order=color_order)
+    )
 
 
+@instrument()
 def save_image(
-    image: np.ndarray, path: str | Path, auto_indexing: bool = False
+    image: np.ndarray,
+    path: str | Path,
+    auto_indexing: bool = False,
+    color_order: str = "rgb",
 ) -> None:
     """Save an image to the specified path.
 
@@ -108,6 +359,8 @@ def save_image(
         image (np.ndarray): The image to save.
         auto_indexing (bool): Whether to automatically
             index the filename if it already exists.
+        color_order (str): Channel order of `image`, "rgb" or "bgr". BGR
+            images are saved through a channel-reversed view, not a copy.
     """
     # Convert the input path to a Path object
     if isinstance(path, str):
@@ -137,6 +390,10 @@ def save_image(
 
     # Here you would have your actual image saving logic, e.g., using PIL or another library
     # For demonstration, I'll just show a message
+    if color_order == "bgr":
+        image = bgr_to_rgb(
+            image, mode="view" if image.shape[2:] == (3,) else "copy"
+        )
     image = Image.fromarray(image)
 
     # Save the image
@@ -0,0 +1,148 @@
+"""Frame Normalization Utility Module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from cogcvutil.common.converter.color import convert_color
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+# Frames converted together when normalizing an (N, H, W, C) stack
+BATCH_SIZE = 16
+# Scales of float frames: "unit" is [0, 1], "byte" is [0, 255]
+VALUE_RANGES = ("auto", "unit", "byte")
+
+
+def normalize_frame(
+    frame: np.ndarray, color_order: str = "rgb", value_range: str = "auto"
+) -> np.ndarray:
+    """Convert a frame to the C-contiguous (H, W, 3) uint8 RGB an encoder takes.
+
+    Contiguous uint8 RGB frames are returned as is, without a copy. Float
+    frames are scaled by 255 when `value_range` is "unit" and rounded
+    when it is "byte"; "auto" picks "unit" if no finite value exceeds 1,
+    see `resolve_value_range`. Floats and integers are then clipped to
+    [0, 255], with NaN mapped to 0, and uint16 frames keep their 8 most
+    significant bits. Gray (H, W) or (H, W, 1) frames are expanded to RGB
+    and the alpha channel of 4-channel frames is dropped.
+
+    Args:
+        frame (np.ndarray): The frame.
+        color_order (str): Channel order of color frames, "rgb" or "bgr".
+        value_range (str): Scale of float frames, "auto", "unit" or "byte".
+
+    Returns:
+        np.ndarray: The frame as contiguous (H, W, 3) uint8 RGB.
+    """
+    frame = np.asarray(frame)
+    if (
+        frame.dtype == np.uint8
+        and frame.shape[2:] == (3,)
+        and color_order == "rgb"
+        and frame.flags.c_contiguous
+    ):
+        return frame
+    return _normalize_batch(frame[None], color_order, value_range)[0]
+
+
+def normalize_frames(
+    frames: np.ndarray | Iterable[np.ndarray],
+    color_order: str = "rgb",
+    value_range: str = "auto",
+) -> Iterator[np.ndarray]:
+    """Lazily normalize a sequence of frames, see `normalize_frame`.
+
+    An array is taken as a stack of frames, (N, H, W, C) or (N, H, W) for
+    gray frames, and converted `BATCH_SIZE` frames at a time with
+    vectorized NumPy operations; a contiguous uint8 RGB stack is yielded
+    as views without any copy. Other iterables are normalized one frame
+    at a time. With "auto", the scale of float frames is decided once,
+    from the whole array or from the first float frame, so every frame
+    of a clip is scaled the same way.
+
+    Args:
+        frames (np.ndarray | Iterable[np.ndarray]): The frames.
+        color_order (str): Channel order of color frames, "rgb" or "bgr".
+        value_range (str): Scale of float frames, "auto", "unit" or "byte".
+
+    Yields:
+        np.ndarray: Contiguous (H, W, 3) uint8 RGB frames.
+    """
+    if not isinstance(frames, np.ndarray):
+        for frame in frames:
+            frame = np.asarray(frame)  # noqa: PLW2901
+            value_range = resolve_value_range(frame, value_range)
+            yield normalize_frame(frame, color_order, value_range)
+        return
+    value_range = resolve_value_range(frames, value_range)
+    for start in range(0, len(frames), BATCH_SIZE):
+        yield from _normalize_batch(
+            frames[start : start + BATCH_SIZE], color_order, value_range
+        )
+
+
+def resolve_value_range(frames: np.ndarray, value_range: str) -> str:
+    """Decide the scale of float frames once, for "auto".
+
+    Args:
+        frames (np.ndarray): A frame or a stack of frames.
+        value_range (str): "auto", "unit" or "byte".
+
+    Returns:
+        str: "unit" if `frames` are floats and no finite value exceeds 1,
+            "byte" for other floats, and `value_range` unchanged when it
+            is not "auto" or `frames` are not floats.
+    """
+    if value_range not in VALUE_RANGES:
+        msg = f"value_range must be one of {', '.join(VALUE_RANGES)}."
+        raise ValueError(msg)
+    if value_range != "auto" or not np.issubdtype(frames.dtype, np.floating):
+        return value_range
+    peak = np.max(frames, where=np.isfinite(frames), initial=0)
+    return "unit" if peak <= 1 else "byte"
+
+
+def _normalize_batch(
+    frames: np.ndarray, color_order: str, value_range: str
+) -> np.ndarray:
+    """Normalize an (N, H, W[, C]) stack, copying only when needed."""
+    if color_order not in {"rgb", "bgr"}:
+        msg = "color_order must be 'rgb' or 'bgr'."
+        raise ValueError(msg)
+    if frames.ndim == 3:  # noqa: PLR2004
+        frames = frames[..., None]
+    if frames.ndim != 4 or frames.shape[-1] not in {1, 3, 4}:  # noqa: PLR2004
+        msg = (
+            "Frames must be (H, W), (H, W, 1), (H, W, 3) or (H, W, 4), "
+            f"got shape {frames.shape[1:]}."
+        )
+        raise ValueError(msg)
+
+    frames = _to_uint8(frames, resolve_value_range(frames, value_range))
+    num_channels = frames.shape[-1]
+    if num_channels == 1:
+        return np.repeat(frames, 3, axis=-1)
+    if (color_order, num_channels) == ("rgb", 3):
+        return np.ascontiguousarray(frames)
+    src = color_order if num_channels == 3 else f"{color_order}a"  # noqa: PLR2004
+    return convert_color(frames, src, "rgb")
+
+
+def _to_uint8(frames: np.ndarray, value_range: str) -> np.ndarray:
+    """Scale or clip an (N, H, W, C) stack to uint8 in one pass."""
+    if frames.dtype == np.uint8:
+        return frames
+    if frames.dtype == np.bool_:
+        return frames.view(np.uint8) * np.uint8(255)
+    if frames.dtype == np.uint16:
+        return (frames >> 8).astype(np.uint8)
+    if np.issubdtype(frames.dtype, np.floating):
+        scale = frames.dtype.type(255 if value_range == "unit" else 1)
+        frames = frames * scale + frames.dtype.type(0.5)
+        # Infinities are clipped below, NaN would cast to an arbitrary value
+        np.nan_to_num(frames, copy=False, nan=0.0)
+    return np.clip(frames, 0, 255).astype(np.uint8)
@@ -0,0 +1,299 @@
+"""Multi-stage threaded frame pipeline."""
+
+from __future__ import annotations
+
+import heapq
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    import numpy as np
+
+    from cogcvutil.video.writer._base import BaseVideoWriter
+
+_END = object()
+
+
+class _AbortedError(Exception):
+    """Raised inside a stage when another stage has failed."""
+
+
+class StageStats:
+    """Throughput and queue statistics of one pipeline stage."""
+
+    def __init__(self, name: str, num_workers: int) -> None:
+        """Initialize empty statistics for a stage."""
+        self.name = name
+        self.num_workers = num_workers
+        self.frames = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+        self._active_workers = num_workers
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, queue_depth: int) -> None:
+        """Record one processed frame."""
+        with self._lock:
+            self.frames += 1
+            self.busy_seconds += seconds
+            self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+            self._depth_total += queue_depth
+            self._depth_samples += 1
+
+    def worker_done(self) -> bool:
+        """Mark one worker as finished and return whether it was the last."""
+        with self._lock:
+            self._active_workers -= 1
+            return self._active_workers == 0
+
+    def to_dict(self) -> dict:
+        """Return the statistics as a dictionary."""
+        busy = self.busy_seconds / max(self.num_workers, 1)
+        return {
+            "name": self.name,
+            "num_workers": self.num_workers,
+            "frames": self.frames,
+            "busy_seconds": self.busy_seconds,
+            "frames_per_second": self.frames / busy if busy else 0.0,
+            "max_queue_depth": self.max_queue_depth,
+            "mean_queue_depth": (
+                self._depth_total / self._depth_samples
+                if self._depth_samples
+                else 0.0
+            ),
+        }
+
+
+class FramePipeline:
+    """Run read, per-frame transforms and encode as overlapping stages.
+
+    Each stage runs on its own thread(s) and hands frames to the next
+    stage through a bounded queue, so decoding, processing and encoding
+    overlap. Transform stages may use several workers; OpenCV and NumPy
+    release the GIL for most of the per-frame work. Frames reach the sink
+    in source order, and the number of frames in flight is bounded, so
+    memory stays constant however long the input is.
+
+    Example:
+        >>> pipeline = FramePipeline(
+        ...     VideoReader("in.mp4"),
+        ...     [redact, overlay],
+        ...     VideoWriter("out", "clip", streaming=True),
+        ...     num_workers=[4, 2],
+        ... )
+        >>> stats = pipeline.run()
+    """
+
+    def __init__(
+        self,
+        source: Iterable[np.ndarray],
+        transforms: Sequence[Callable[[np.ndarray], np.ndarray]],
+        sink: BaseVideoWriter | Callable[[np.ndarray], None],
+        num_workers: int | Sequence[int] = 1,
+        queue_size: int = 8,
+        close_sink: bool = True,
+    ) -> None:
+        """Initialize the pipeline.
+
+        Args:
+            source (Iterable[np.ndarray]): Frames to process, e.g. a frame source.
+            transforms (Sequence[Callable]): Per-frame functions applied in order.
+            sink (BaseVideoWriter | Callable): Video writer (frames go to `add_frame`) or a callable receiving each frame.
+            num_workers (int | Sequence[int]): Worker threads per transform stage, either one value for all or one per transform. Defaults to 1.
+            queue_size (int): Capacity of each queue between stages. Defaults to 8.
+            close_sink (bool): Close the video writer once all frames are written. Defaults to True.
+        """  # noqa: E501
+        if isinstance(num_workers, int):
+            num_workers = [num_workers] * len(transforms)
+        if len(num_workers) != len(transforms):
+            msg = "Expected one worker count per transform."
+            raise ValueError(msg)
+        self.source = source
+        self.transforms = list(transforms)
+        self.sink = sink
+        self.num_workers = list(num_workers)
+        self.queue_size = queue_size
+        self.close_sink = close_sink
+        self.stats: dict = {}
+        self._abort = threading.Event()
+        self._errors: list[BaseException] = []
+
+    def run(self) -> dict:
+        """Process every frame of the source and return the statistics.
+
+        Returns:
+            dict: Wall time, overall frames per second and per-stage stats.
+        """
+        self._abort.clear()
+        self._errors = []
+        queues = [
+            queue.Queue(maxsize=self.queue_size)
+            for _ in range(len(self.transforms) + 1)
+        ]
+        in_flight = threading.Semaphore(self.queue_size * len(queues))
+        stage_stats = [StageStats("read", 1)]
+        threads = [
+            threading.Thread(
+                target=self._guard,
+                args=(self._read, queues[0], in_flight, stage_stats[0]),
+                daemon=True,
+            )
+        ]
+        for idx, (transform, workers) in enumerate(
+            zip(self.transforms, self.num_workers)
+        ):
+            stats = StageStats(
+                getattr(transform, "__name__", f"stage_{idx}"), workers
+            )
+            stage_stats.append(stats)
+            threads.extend(
+                threading.Thread(
+                    target=self._guard,
+                    args=(
+                        self._transform,
+                        transform,
+                        queues[idx],
+                        queues[idx + 1],
+                        stats,
+                    ),
+                    daemon=True,
+                )
+                for _ in range(workers)
+            )
+        stage_stats.append(StageStats("write", 1))
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            self._write(queues[-1], in_flight, stage_stats[-1])
+        except _AbortedError:
+            pass
+        except BaseException:
+            self._abort.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+        wall_seconds = time.perf_counter() - start
+        if self._errors:
+            raise self._errors[0]
+
+        frames = stage_stats[-1].frames
+        self.stats = {
+            "frames": frames,
+            "wall_seconds": wall_seconds,
+            "frames_per_second": frames / wall_seconds if wall_seconds else 0.0,
+            "stages": [stats.to_dict() for stats in stage_stats],
+        }
+        return self.stats
+
+    def _guard(self, target: Callable, *args: object) -> None:
+        """Run a stage and abort the pipeline if it fails."""
+        try:
+            target(*args)
+        except _AbortedError:
+            pass
+        except Exception as error:  # noqa: BLE001
+            self._errors.append(error)
+            self._abort.set()
+
+    def _put(self, out_queue: queue.Queue, item: object) -> None:
+        """Put an item, giving up if the pipeline is aborted."""
+        while True:
+            if self._abort.is_set():
+                raise _AbortedError
+            try:
+                out_queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return
+
+    def _get(self, in_queue: queue.Queue) -> object:
+        """Get an item, giving up if the pipeline is aborted."""
+        while True:
+            if self._abort.is_set():
+                raise _AbortedError
+            try:
+                return in_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+    def _acquire(self, semaphore: threading.Semaphore) -> None:
+        """Acquire a semaphore, giving up if the pipeline is aborted."""
+        while not semaphore.acquire(timeout=0.1):
+            if self._abort.is_set():
+                raise _AbortedError
+
+    def _read(
+        self,
+        out_queue: queue.Queue,
+        in_flight: threading.Semaphore,
+        stats: StageStats,
+    ) -> None:
+        """Pull frames from the source and number them."""
+        frames = iter(self.source)
+        index = 0
+        while True:
+            self._acquire(in_flight)
+            tic = time.perf_counter()
+            frame = next(frames, _END)
+            if frame is _END:
+                self._put(out_queue, _END)
+                return
+            stats.record(time.perf_counter() - tic, out_queue.qsize())
+            self._put(out_queue, (index, frame))
+            index += 1
+
+    def _transform(
+        self,
+        transform: Callable[[np.ndarray], np.ndarray],
+        in_queue: queue.Queue,
+        out_queue: queue.Queue,
+        stats: StageStats,
+    ) -> None:
+        """Apply a transform to frames until the input is exhausted."""
+        while True:
+            item = self._get(in_queue)
+            if item is _END:
+                # Wake sibling workers, the last one forwards the marker
+                self._put(in_queue, _END)
+                if stats.worker_done():
+                    self._put(out_queue, _END)
+                return
+            index, frame = item
+            tic = time.perf_counter()
+            frame = transform(frame)
+            stats.record(time.perf_counter() - tic, in_queue.qsize())
+            self._put(out_queue, (index, frame))
+
+    def _write(
+        self,
+        in_queue: queue.Queue,
+        in_flight: threading.Semaphore,
+        stats: StageStats,
+    ) -> None:
+        """Reorder frames and hand them to the sink."""
+        add_frame = getattr(self.sink, "add_frame", self.sink)
+        pending: list = []
+        next_index = 0
+        while True:
+            item = self._get(in_queue)
+            if item is _END:
+                break
+            heapq.heappush(pending, item)
+            while pending and pending[0][0] == next_index:
+                _, frame = heapq.heappop(pending)
+                tic = time.perf_counter()
+                add_frame(frame)
+                stats.record(time.perf_counter() - tic, in_queue.qsize())
+                in_flight.release()
+                next_index += 1
+        if self.close_sink and hasattr(self.sink, "close"):
+            self.sink.close()
@@ -0,0 +1 @@
+"""Package containing video reader."""
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import abc
+import math
+import queue
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from types import TracebackType
+
+    import numpy as np
+    from typing_extensions import Self
+
+_END = object()
+
+
+class BaseFrameSource(abc.ABC):
+    """Base frame source class.
+
+    A frame source yields RGB frames in order. Iteration starts at the
+    current position (see `seek`), stops before `end_frame` and steps by
+    `stride`. With `prefetch > 0` frames are decoded ahead on a
+    background thread, up to `prefetch` frames ahead of the consumer.
+    """
+
+    fps: float | None
+
+    def __init__(
+        self,
+        start_frame: int = 0,
+        end_frame: int | None = None,
+        stride: int = 1,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        prefetch: int = 0,
+    ) -> None:
+        """Initialize the frame range shared by every frame source.
+
+        Args:
+            start_frame (int, optional): Index of the first frame. Defaults to 0.
+            end_frame (int | None, optional): Index one past the last frame. Defaults to None (end of source).
+            stride (int, optional): Yield every `stride`-th frame. Defaults to 1.
+            start_time (float | None, optional): Start time in seconds, overrides `start_frame`. Defaults to None.
+            end_time (float | None, optional): End time in seconds, overrides `end_frame`. Defaults to None.
+            prefetch (int, optional): Number of frames decoded ahead on a background thread. Defaults to 0 (no thread).
+        """  # noqa: E501
+        if stride < 1:
+            msg = "stride must be a positive integer."
+            raise ValueError(msg)
+        if start_time is not None:
+            start_frame = self._time_to_frame(start_time)
+        if end_time is not None:
+            end_frame = self._time_to_frame(end_time)
+        self.position = start_frame
+        self.end_frame = end_frame
+        self.stride = stride
+        self.prefetch = prefetch
+
+    @abc.abstractmethod
+    def _iter_frames(
+        self, start: int, stop: int | None, stride: int
+    ) -> Iterator[np.ndarray]:
+        """Decode frames start, start + stride, ... before stop."""
+        ...
+
+    def close(self) -> None:  # noqa: B027
+        """Release any resources held by the source."""
+
+    def seek(self, frame_index: int) -> None:
+        """Set the index of the next frame to read."""
+        self.position = frame_index
+
+    def seek_time(self, seconds: float) -> None:
+        """Set the position of the next frame to read, in seconds."""
+        self.seek(self._time_to_frame(seconds))
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        """Yield frames from the current position."""
+        frames = self._iter_frames(self.position, self.end_frame, self.stride)
+        if self.prefetch > 0:
+            frames = _prefetch(frames, self.prefetch)
+        for frame in frames:
+            self.position += self.stride
+            yield frame
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context and return the source."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the source when leaving the runtime context."""
+        self.close()
+
+    def _time_to_frame(self, seconds: float) -> int:
+        """Convert a timestamp to a frame index using the frame rate."""
+        if not self.fps:
+            msg = "Time ranges require a known frame rate."
+            raise ValueError(msg)
+        return math.floor(seconds * self.fps + 1e-6)
+
+
+def _prefetch(frames: Iterator[np.ndarray], size: int) -> Iterator[np.ndarray]:
+    """Run `frames` on a background thread, up to `size` frames ahead."""
+    buffer: queue.Queue = queue.Queue(maxsize=size)
+    stop = threading.Event()
+
+    def _put(item: object) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def _produce() -> None:
+        try:
+            for frame in frames:
+                if not _put(frame):
+                    return
+            _put(_END)
+        except Exception as error:  # noqa: BLE001
+            _put(error)
+        finally:
+            frames.close()
+
+    producer = threading.Thread(target=_produce, daemon=True)
+    producer.start()
+    try:
+        while (item := buffer.get()) is not _END:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join()
@@ -0,0 +1,66 @@
+"""Module to read frames from a directory of images."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from cogcvutil.image.common.utility.io_util import (
+    iter_images,
+    list_images_sorted,
+)
+from cogcvutil.video.reader._base import BaseFrameSource
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    import numpy as np
+
+
+class ImageDirectoryReader(BaseFrameSource):
+    """Stream RGB frames from a directory of images.
+
+    Images are read in natural numeric order, like `read_images_sorted`,
+    and decoded lazily on a worker pool. Seeking and striding only select
+    file paths, so skipped images are never decoded.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        directory: str | Path,
+        fps: float | None = None,
+        *,
+        start_frame: int = 0,
+        end_frame: int | None = None,
+        stride: int = 1,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        num_workers: int = 4,
+    ) -> None:
+        """Initialize ImageDirectoryReader.
+
+        Args:
+            directory (str | Path): Directory containing the images.
+            fps (float | None, optional): Frame rate of the image sequence, required for time ranges. Defaults to None.
+            start_frame (int, optional): Index of the first frame. Defaults to 0.
+            end_frame (int | None, optional): Index one past the last frame. Defaults to None (last image).
+            stride (int, optional): Yield every `stride`-th frame. Defaults to 1.
+            start_time (float | None, optional): Start time in seconds, overrides `start_frame`. Defaults to None.
+            end_time (float | None, optional): End time in seconds, overrides `end_frame`. Defaults to None.
+            num_workers (int, optional): Number of decode workers. Defaults to 4.
+        """  # noqa: E501
+        self.fps = fps
+        self.paths = list_images_sorted(directory)
+        self.num_frames = len(self.paths)
+        self.num_workers = num_workers
+        super().__init__(start_frame, end_frame, stride, start_time, end_time)
+
+    def __len__(self) -> int:
+        """Return the number of frames the current range will yield."""
+        return len(self.paths[self.position : self.end_frame : self.stride])
+
+    def _iter_frames(
+        self, start: int, stop: int | None, stride: int
+    ) -> Iterator[np.ndarray]:
+        """Decode images start, start + stride, ... before stop."""
+        return iter_images(self.paths[start:stop:stride], self.num_workers)
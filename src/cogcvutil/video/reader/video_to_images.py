@@ -0,0 +1,140 @@
+"""Module to read frames from a video."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import cv2
+import numpy as np
+
+from cogcvutil.video.reader._base import BaseFrameSource
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class VideoReader(BaseFrameSource):
+    """Stream RGB frames from a video file.
+
+    Frames are decoded one at a time, so memory does not depend on the
+    length of the video. The "ffmpeg" backend pipes raw frames from the
+    imageio-ffmpeg binary and seeks with ffmpeg's input seeking; the
+    "cv2" backend uses `cv2.VideoCapture` and skips strided frames
+    without retrieving them.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        path: str | Path,
+        backend: str = "ffmpeg",
+        *,
+        start_frame: int = 0,
+        end_frame: int | None = None,
+        stride: int = 1,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        prefetch: int = 0,
+    ) -> None:
+        """Initialize VideoReader.
+
+        Args:
+            path (str | Path): Path to the video file.
+            backend (str, optional): Decoder backend, "ffmpeg" or "cv2". Defaults to "ffmpeg".
+            start_frame (int, optional): Index of the first frame. Defaults to 0.
+            end_frame (int | None, optional): Index one past the last frame. Defaults to None (end of video).
+            stride (int, optional): Yield every `stride`-th frame. Defaults to 1.
+            start_time (float | None, optional): Start time in seconds, overrides `start_frame`. Defaults to None.
+            end_time (float | None, optional): End time in seconds, overrides `end_frame`. Defaults to None.
+            prefetch (int, optional): Number of frames decoded ahead on a background thread. Defaults to 0 (no thread).
+        """  # noqa: E501
+        self.path = Path(path)
+        if not self.path.is_file():
+            msg = "The video file was not found at the specified path."
+            raise FileNotFoundError(msg)
+        if backend not in {"ffmpeg", "cv2"}:
+            msg = "Unsupported backend. Choose 'ffmpeg' or 'cv2'."
+            raise ValueError(msg)
+        self.backend = backend
+        self._probe()
+        super().__init__(
+            start_frame, end_frame, stride, start_time, end_time, prefetch
+        )
+
+    def __len__(self) -> int:
+        """Return the number of frames the current range will yield."""
+        stop = self.num_frames
+        if self.end_frame is not None:
+            stop = min(stop, self.end_frame)
+        return len(range(self.position, stop, self.stride))
+
+    def _probe(self) -> None:
+        """Read the frame rate, size and frame count of the video."""
+        capture = cv2.VideoCapture(str(self.path))
+        try:
+            self.fps = capture.get(cv2.CAP_PROP_FPS) or None
+            self.frame_size = (
+                int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            )
+            self.num_frames = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        finally:
+            capture.release()
+
+    def _iter_frames(
+        self, start: int, stop: int | None, stride: int
+    ) -> Iterator[np.ndarray]:
+        """Decode frames start, start + stride, ... before stop."""
+        if self.backend == "cv2":
+            return self._iter_cv2(start, stop, stride)
+        return self._iter_ffmpeg(start, stop, stride)
+
+    def _iter_ffmpeg(
+        self, start: int, stop: int | None, stride: int
+    ) -> Iterator[np.ndarray]:
+        """Decode frames through an ffmpeg subprocess."""
+        # Only the ffmpeg backend needs the bundled binary, so load it here
+        import imageio_ffmpeg  # noqa: PLC0415
+
+        input_params = []
+        if start > 0 and self.fps:
+            input_params = ["-ss", f"{start / self.fps:.6f}"]
+        reader = imageio_ffmpeg.read_frames(
+            str(self.path), input_params=input_params
+        )
+        try:
+            meta = next(reader)
+            width, height = meta["size"]
+            for offset, buffer in enumerate(reader):
+                index = start + offset
+                if stop is not None and index >= stop:
+                    break
+                if offset % stride == 0:
+                    yield np.frombuffer(bytearray(buffer), np.uint8).reshape(
+                        height, width, 3
+                    )
+        finally:
+            reader.close()
+
+    def _iter_cv2(
+        self, start: int, stop: int | None, stride: int
+    ) -> Iterator[np.ndarray]:
+        """Decode frames through `cv2.VideoCapture`."""
+        capture = cv2.VideoCapture(str(self.path))
+        try:
+            if start > 0:
+                capture.set(cv2.CAP_PROP_POS_FRAMES, start)
+            index = start
+            while stop is None or index < stop:
+                if (index - start) % stride:
+                    # Skip the frame without converting it
+                    if not capture.grab():
+                        break
+                else:
+                    ok, frame = capture.read()
+                    if not ok:
+                        break
+                    yield cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+                index += 1
+        finally:
+            capture.release()
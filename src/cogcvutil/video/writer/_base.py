@@ -1,6 +1,13 @@
 from __future__ import annotations
 
 import abc
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    import numpy as np
+    from typing_extensions import Self
 
 
 class BaseVideoWriter(abc.ABC):
@@ -8,7 +15,30 @@ class BaseVideoWriter(abc.ABC):
 
     frame_sequence: list
 
+    @abc.abstractmethod
+    def add_frame(self, frame: np.ndarray) -> None:
+        """Add a single frame to the video."""
+        ...
+
     @abc.abstractmethod
     def write(self) -> None:
         """Write frame image to video."""
         ...
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        """Finalize the video file and release the encoder."""
+        ...
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context and return the writer."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the writer when leaving the runtime context."""
+        self.close()
@@ -0,0 +1,268 @@
+"""Module to write animated GIFs with a shared palette."""
+
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+
+import numpy as np
+from PIL import GifImagePlugin, Image
+
+# Bits per channel of the color lookup table, 2**15 entries
+LUT_BITS = 5
+# Palette index reserved for pixels unchanged since the previous frame
+TRANSPARENT_INDEX = 255
+MAX_SAMPLE_PIXELS = 1 << 16
+
+
+class GifWriter:
+    """Stream frames to an animated GIF with a shared palette.
+
+    The palette is computed once, by median cut over a pixel subsample of
+    the first `sample_frames` frames, and written as the global color
+    table. With `palette_interval` a new palette is computed for every
+    group of that many frames and written as a local color table. Frames
+    are quantized with a lookup table indexed by 5-bit-per-channel color,
+    so mapping a frame to the palette is a single NumPy gather.
+
+    With `frame_diff`, pixels whose palette index did not change since the
+    previous frame are written as transparent, and each frame is cropped
+    to the region that changed, so mostly static clips encode quickly and
+    stay small.
+
+    Only the frames waiting for their palette are buffered; every other
+    frame is compressed and written as soon as it is added, so memory does
+    not grow with the length of the clip. The interface matches imageio's
+    writers (`append_data` and `close`).
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        fps: float = 20,
+        sample_frames: int = 16,
+        palette_interval: int | None = None,
+        frame_diff: bool = True,
+        loop: int | None = 0,
+    ) -> None:
+        """Initialize GifWriter.
+
+        Args:
+            path (str | Path): Path of the GIF file.
+            fps (float, optional): Frame rate, rounded to the GIF's 10 ms delay steps without drift. Defaults to 20.
+            sample_frames (int, optional): Number of leading frames the global palette is computed from. Defaults to 16.
+            palette_interval (int | None, optional): Compute a new palette for every group of this many frames. Defaults to None (one global palette).
+            frame_diff (bool, optional): Write only the pixels that changed since the previous frame. Defaults to True.
+            loop (int | None, optional): Number of times the animation repeats, 0 for forever, None to play once. Defaults to 0.
+        """  # noqa: E501
+        self.path = Path(path)
+        self.fps = fps
+        self.group_size = palette_interval or sample_frames
+        self.palette_interval = palette_interval
+        self.frame_diff = frame_diff
+        self.loop = loop
+        self.palette: np.ndarray | None = None
+        self._lut: np.ndarray | None = None
+        self._buffer: list[np.ndarray] = []
+        self._previous: np.ndarray | None = None
+        self._file = None
+        self._frame_size: tuple[int, int] | None = None
+        self._num_frames = 0
+        self._closed = False
+
+    def append_data(self, frame: np.ndarray) -> None:
+        """Add a gray, RGB or RGBA uint8 frame to the GIF."""
+        if self._closed:
+            msg = "Cannot add frames to a closed GifWriter."
+            raise RuntimeError(msg)
+        frame = np.asarray(frame)
+        if frame.ndim == 2:  # noqa: PLR2004
+            frame = frame[..., None]
+        if frame.ndim != 3 or frame.shape[2] not in {1, 3, 4}:  # noqa: PLR2004
+            msg = "Frames must be (H, W), (H, W, 1), (H, W, 3) or (H, W, 4)."
+            raise ValueError(msg)
+        if frame.shape[2] == 1:
+            frame = np.repeat(frame, 3, -1)
+        frame = frame[..., :3]
+        if self._frame_size is None:
+            self._frame_size = frame.shape[1::-1]
+        elif frame.shape[1::-1] != self._frame_size:
+            msg = "All GIF frames must have the same size."
+            raise ValueError(msg)
+
+        if self.palette is not None:
+            self._write_frame(frame)
+            return
+        self._buffer.append(frame)
+        if len(self._buffer) >= self.group_size:
+            self._flush_group()
+
+    def close(self) -> None:
+        """Write any buffered frames and finalize the GIF file.
+
+        Calling `close` more than once is a no-op.
+        """
+        if self._closed:
+            return
+        if self._buffer:
+            self._flush_group()
+        if self._file is not None:
+            self._file.write(b";")  # trailer
+            self._file.close()
+        self._closed = True
+
+    def _flush_group(self) -> None:
+        """Compute a palette from the buffered frames and write them."""
+        self.palette = median_cut_palette(
+            _sample_pixels(self._buffer), TRANSPARENT_INDEX
+        )
+        self._lut = palette_lut(self.palette[:TRANSPARENT_INDEX])
+        # Indices from different palettes cannot be compared
+        self._previous = None
+        local_palette = self._file is not None
+        if self._file is None:
+            self._write_header()
+        frames, self._buffer = self._buffer, []
+        for frame in frames:
+            self._write_frame(frame, local_palette)
+        if self.palette_interval:
+            self.palette = None
+
+    def _write_header(self) -> None:
+        """Write the GIF header with the global color table."""
+        self._file = self.path.open("wb")
+        width, height = self._frame_size
+        # Global color table of 256 entries with 8 bits per channel
+        self._file.write(
+            b"GIF89a"
+            + struct.pack("<HHBBB", width, height, 0xF7, 0, 0)
+            + self.palette.tobytes()
+        )
+        if self.loop is not None:
+            self._file.write(
+                b"!\xff\x0bNETSCAPE2.0\x03\x01"
+                + struct.pack("<H", self.loop)
+                + b"\x00"
+            )
+
+    def _write_frame(
+        self, frame: np.ndarray, local_palette: bool = False
+    ) -> None:
+        """Quantize a frame and write the pixels that changed."""
+        indices = quantize(frame, self._lut)
+        offset = (0, 0)
+        params = {"duration": self._next_duration(), "disposal": 1}
+        if local_palette:
+            params["include_color_table"] = True
+
+        patch = indices
+        if self.frame_diff and self._previous is not None:
+            changed = indices != self._previous
+            rows = np.flatnonzero(changed.any(axis=1))
+            cols = np.flatnonzero(changed.any(axis=0))
+            if rows.size:
+                y0, y1, x0, x1 = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+            else:
+                # Nothing changed, a transparent pixel holds the delay
+                y0, y1, x0, x1 = 0, 1, 0, 1
+            patch = np.where(
+                changed[y0:y1, x0:x1],
+                indices[y0:y1, x0:x1],
+                np.uint8(TRANSPARENT_INDEX),
+            )
+            offset = (int(x0), int(y0))
+            params["transparency"] = TRANSPARENT_INDEX
+        if self.frame_diff:
+            self._previous = indices
+
+        image = Image.fromarray(np.ascontiguousarray(patch))
+        image.putpalette(self.palette.tobytes())
+        for chunk in GifImagePlugin.getdata(image, offset, **params):
+            self._file.write(chunk)
+
+    def _next_duration(self) -> int:
+        """Return the next frame delay in ms, in whole 10 ms steps."""
+        start = round(self._num_frames * 100 / self.fps)
+        self._num_frames += 1
+        return (round(self._num_frames * 100 / self.fps) - start) * 10
+
+
+def median_cut_palette(pixels: np.ndarray, num_colors: int) -> np.ndarray:
+    """Compute a palette by median cut.
+
+    The box with the widest channel range is split at the median of that
+    channel until there are `num_colors` boxes or no box can be split.
+    Each color is the mean of its box.
+
+    Args:
+        pixels (np.ndarray): An (M, 3) uint8 array of colors.
+        num_colors (int): Maximum number of palette colors, at most 256.
+
+    Returns:
+        np.ndarray: A (256, 3) uint8 palette, zero-padded after the colors.
+    """
+    boxes = [pixels]
+    spans = [np.ptp(pixels, axis=0)]
+    while len(boxes) < num_colors:
+        widest = max(range(len(boxes)), key=lambda idx: spans[idx].max())
+        if spans[widest].max() == 0:
+            break
+        box = boxes.pop(widest)
+        channel = spans.pop(widest).argmax()
+        half = len(box) // 2
+        order = np.argpartition(box[:, channel], half)
+        for part in (box[order[:half]], box[order[half:]]):
+            boxes.append(part)
+            spans.append(np.ptp(part, axis=0))
+
+    palette = np.zeros((256, 3), dtype=np.uint8)
+    palette[: len(boxes)] = [box.mean(axis=0).round() for box in boxes]
+    return palette
+
+
+def palette_lut(palette: np.ndarray) -> np.ndarray:
+    """Map every 5-bit-per-channel color to its nearest palette index.
+
+    Args:
+        palette (np.ndarray): A (K, 3) uint8 palette, K <= 256.
+
+    Returns:
+        np.ndarray: A (2**15,) uint8 lookup table, see `quantize`.
+    """
+    step = 1 << (8 - LUT_BITS)
+    levels = np.arange(step // 2, 256, step, dtype=np.int32)
+    centers = np.stack(
+        np.meshgrid(levels, levels, levels, indexing="ij"), axis=-1
+    ).reshape(-1, 3)
+    colors = palette.astype(np.int32)
+    lut = np.empty(len(centers), dtype=np.uint8)
+    chunk = 4096
+    for start in range(0, len(centers), chunk):
+        diff = centers[start : start + chunk, None, :] - colors[None]
+        lut[start : start + chunk] = np.einsum(
+            "ijk,ijk->ij", diff, diff
+        ).argmin(axis=1)
+    return lut
+
+
+def quantize(frame: np.ndarray, lut: np.ndarray) -> np.ndarray:
+    """Map an (H, W, 3) uint8 frame to palette indices with `lut`."""
+    shift = 8 - LUT_BITS
+    channels = frame >> shift
+    codes = channels[..., 0].astype(np.uint16) << (2 * LUT_BITS)
+    codes |= channels[..., 1].astype(np.uint16) << LUT_BITS
+    codes |= channels[..., 2]
+    return lut[codes]
+
+
+def _sample_pixels(frames: list[np.ndarray]) -> np.ndarray:
+    """Return up to `MAX_SAMPLE_PIXELS` random pixels of `frames`."""
+    rng = np.random.default_rng(0)
+    per_frame = max(MAX_SAMPLE_PIXELS // len(frames), 1)
+    samples = []
+    for frame in frames:
+        pixels = frame.reshape(-1, 3)
+        if len(pixels) > per_frame:
+            pixels = pixels[rng.integers(0, len(pixels), per_frame)]
+        samples.append(pixels)
+    return np.concatenate(samples)
@@ -2,26 +2,117 @@
 
 from __future__ import annotations
 
+import itertools
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import imageio
 import numpy as np
 
-from cogcvutil.image.common.utility.io_util import read_images_sorted
+from cogcvutil.common.utility.profiling import instrument
+from cogcvutil.image.common.utility.io_util import iter_images_sorted
+from cogcvutil.video.common.frame_util import (
+    VALUE_RANGES,
+    normalize_frame,
+    normalize_frames,
+    resolve_value_range,
+)
+from cogcvutil.video.writer._base import BaseVideoWriter
+from cogcvutil.video.writer.gif_writer import GifWriter
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
 
-class VideoWriter:
-    """Video writer class."""
+# Named speed/quality tradeoffs for the x264/x265 software encoders
+ENCODER_PRESETS = {
+    "realtime": {"preset": "ultrafast", "crf": 28, "tune": "zerolatency"},
+    "balanced": {"preset": "veryfast", "crf": 23},
+    "archive": {"preset": "slow", "crf": 18},
+}
+PRESET_CODECS = ("libx264", "libx265")
 
-    def __init__(  # noqa: PLR0913
+
+def encoder_params(
+    preset: str | None = None,
+    codec: str = "libx264",
+    threads: int | None = None,
+) -> list[str]:
+    """Return the ffmpeg output parameters for a named encoder preset.
+
+    Args:
+        preset (str | None): One of `ENCODER_PRESETS`, or None for the encoder defaults.
+        codec (str): The ffmpeg video codec; presets need libx264 or libx265.
+        threads (int | None): Number of encoder threads, 0 lets ffmpeg decide. Defaults to None (not set).
+
+    Returns:
+        list[str]: The parameters, e.g. ["-preset", "ultrafast", "-crf", "28"].
+    """  # noqa: E501
+    params = []
+    if preset is not None:
+        if preset not in ENCODER_PRESETS:
+            msg = (
+                f"Unknown encoder preset {preset!r}. "
+                f"Choose one of {', '.join(ENCODER_PRESETS)}."
+            )
+            raise ValueError(msg)
+        if codec not in PRESET_CODECS:
+            msg = "Encoder presets require the libx264 or libx265 codec."
+            raise ValueError(msg)
+        for option, value in ENCODER_PRESETS[preset].items():
+            params += [f"-{option}", str(value)]
+    if threads is not None:
+        params += ["-threads", str(threads)]
+    return params
+
+
+class VideoWriter(BaseVideoWriter):
+    """Video writer class.
+
+    By default frames passed to `add_frame` are buffered in
+    `frame_sequence` and encoded when `write` is called. With
+    `streaming=True` every frame is handed to the encoder as soon as it
+    is added, so memory stays at one frame regardless of clip length.
+    Either way the writer can be used as a context manager, which calls
+    `close` on exit.
+
+    Images read from `read_image_from_dir` are decoded lazily while the
+    video is being encoded, so the directory is never held in memory.
+
+    Frames may be lists, generators or (N, H, W, C) arrays of any numeric
+    dtype and of gray, RGB(A) or BGR(A) layout; see `normalize_frames`.
+    Contiguous uint8 RGB frames reach the encoder without a copy. With
+    `value_range="auto"` the scale of float frames is decided by the
+    first float frame or array and kept for the rest of the video.
+
+    Frames whose size is not a multiple of `macro_block_size` are padded
+    by replicating their last row and column into a reused buffer, so
+    the encoder never rescales them. `preset` selects a named speed /
+    quality tradeoff from `ENCODER_PRESETS`.
+
+    GIFs are written by `GifWriter`, which quantizes frames to a shared
+    palette and streams them to disk instead of holding the whole clip.
+    """
+
+    # The original seven arguments stay positional for existing callers
+    def __init__(  # noqa: PLR0913, PLR0917
         self,
         save_dir: str,
         file_name: str,
         output_extension: str = "mp4",  # gif, mp4
         frame_rate: int = 20,
         read_image_from_dir: str | Path | None = None,
-        frame_sequence: np.ndarray | None = None,
+        frame_sequence: Iterable[np.ndarray] | None = None,
         codec: str = "libx264",  # Default codec for mp4
+        *,
+        streaming: bool = False,
+        gif_palette_interval: int | None = None,
+        gif_frame_diff: bool = True,
+        preset: str | None = None,
+        threads: int | None = None,
+        pixel_format: str = "yuv420p",
+        macro_block_size: int = 2,
+        ffmpeg_params: list[str] | None = None,
+        color_order: str = "rgb",
+        value_range: str = "auto",
     ) -> None:
         """Initialize VideoWriter.
 
@@ -31,45 +122,171 @@ class VideoWriter:
             output_extension (str, optional): Output video extension. Defaults to "mp4".
             frame_rate (int, optional): Frame rate of the video. Defaults to 20.
             read_image_from_dir (Optional[str | Path], optional): Directory to read images from. Defaults to None.
-            frame_sequence (Optional[np.ndarray], optional): Frame sequence to write to video. Defaults to None.
+            frame_sequence (Optional[Iterable[np.ndarray]], optional): Frames, a frame source or an (N, H, W, C) array to write to video. Defaults to None.
             codec (str, optional): Video codec for encoding. Defaults to 'libx264'.
-        """
+            streaming (bool, optional): Encode each frame as soon as it is added instead of buffering. Defaults to False.
+            gif_palette_interval (int | None, optional): For GIFs, compute a new palette every this many frames. Defaults to None (one global palette).
+            gif_frame_diff (bool, optional): For GIFs, write only the pixels that changed since the previous frame. Defaults to True.
+            preset (str | None, optional): Encoder preset, "realtime", "balanced" or "archive". Defaults to None (encoder defaults).
+            threads (int | None, optional): Number of encoder threads, 0 lets ffmpeg decide. Defaults to None (not set).
+            pixel_format (str, optional): Pixel format of the encoded video. Defaults to "yuv420p".
+            macro_block_size (int, optional): Pad frames to a multiple of this size. Defaults to 2, as required by yuv420p.
+            ffmpeg_params (list[str] | None, optional): Extra ffmpeg output parameters, e.g. ["-g", "60"]. Defaults to None.
+            color_order (str, optional): Channel order of color frames, "rgb" or "bgr". Defaults to "rgb".
+            value_range (str, optional): Scale of float frames, "unit" for [0, 1], "byte" for [0, 255] or "auto". Defaults to "auto".
+        """  # noqa: E501
         self.save_dir = Path(save_dir)
         self.save_dir.mkdir(parents=True, exist_ok=True)
         if not file_name.endswith((".mp4", ".gif")):
             file_name += f".{output_extension}"
         self.output_path = self.save_dir / file_name
         self.frame_rate = frame_rate
-        if frame_sequence:
-            self.frame_sequence = frame_sequence
+        self.streaming = streaming
+        self.color_order = color_order
+        if value_range not in VALUE_RANGES:
+            msg = f"value_range must be one of {', '.join(VALUE_RANGES)}."
+            raise ValueError(msg)
+        self.value_range = value_range
+        self.frame_source: Iterable[np.ndarray] | None = None
+        self.frame_sequence = []
+        if frame_sequence is not None:
+            self._set_frames(frame_sequence)
         elif read_image_from_dir:
-            self.frame_sequence = read_images_sorted(read_image_from_dir)
-        else:
-            self.frame_sequence = []
+            self.frame_source = iter_images_sorted(read_image_from_dir)
 
         self.codec = codec
+        self.macro_block_size = macro_block_size
+        self._pad_buffer: np.ndarray | None = None
+        self._closed = False
 
         # Adjusting writer initialization based on output format
-        if output_extension == "gif":
-            self.video_writer = imageio.get_writer(
-                str(self.output_path), fps=frame_rate
+        if self.output_path.suffix == ".gif":
+            self.video_writer = GifWriter(
+                self.output_path,
+                fps=frame_rate,
+                palette_interval=gif_palette_interval,
+                frame_diff=gif_frame_diff,
             )
         else:
+            # imageio is slow to import, only load it when encoding
+            import imageio  # noqa: PLC0415
+
+            params = encoder_params(preset, self.codec, threads)
+            params += ffmpeg_params or []
             self.video_writer = imageio.get_writer(
-                str(self.output_path), fps=frame_rate, codec=self.codec
+                str(self.output_path),
+                fps=frame_rate,
+                codec=self.codec,
+                pixelformat=pixel_format,
+                # Frames are padded by _preflight, never rescaled
+                macro_block_size=1,
+                ffmpeg_params=params,
+                # CRF from the preset replaces imageio's -qscale
+                **({"quality": None} if preset else {}),
             )
 
     def add_frame(self, frame: np.ndarray) -> None:
-        """Add frame to frame sequence."""
-        self.frame_sequence.append(frame)
+        """Add frame to the video.
 
-    def write(self, frame_sequence: np.ndarray | None = None) -> None:
+        In streaming mode the frame is encoded immediately, otherwise it
+        is appended to the frame sequence.
+        """
+        if self.streaming:
+            # Frames supplied at construction time go out first
+            for pending in self._pending_frames():
+                self._encode(pending)
+            self._encode(next(self._normalize([frame])))
+        else:
+            self.frame_sequence.append(frame)
+
+    def write(self, frame_sequence: Iterable[np.ndarray] | None = None) -> None:
         """Write frame image to video."""
         if frame_sequence is not None:
-            self.frame_sequence = frame_sequence
-        assert self.frame_sequence, "Frame sequence is empty."  # noqa: S101
+            self.frame_sequence = []
+            self._set_frames(frame_sequence)
+        if not self.streaming:
+            assert (  # noqa: S101
+                self.frame_source is not None or len(self.frame_sequence)
+            ), "Frame sequence is empty."
 
-        for frame in self.frame_sequence:
-            self.video_writer.append_data(frame.astype(np.uint8))
+        self.close()
 
+    @instrument("VideoWriter.close")
+    def close(self) -> None:
+        """Encode any buffered frames and finalize the video file.
+
+        Calling `close` more than once is a no-op.
+        """
+        if self._closed:
+            return
+        for frame in self._pending_frames():
+            self._encode(frame)
         self.video_writer.close()
+        self._closed = True
+
+    def _set_frames(self, frame_sequence: Iterable[np.ndarray]) -> None:
+        """Buffer a list of frames, or keep any other sequence as source."""
+        if isinstance(frame_sequence, list):
+            self.frame_sequence = frame_sequence
+            self.frame_source = None
+        else:
+            self.frame_source = frame_sequence
+
+    def _pending_frames(self) -> Iterator[np.ndarray]:
+        """Return the normalized lazy source chained with buffered frames."""
+        source, self.frame_source = self.frame_source, None
+        sequence, self.frame_sequence = self.frame_sequence, []
+        frames = self._normalize(sequence)
+        if source is None:
+            return frames
+        return itertools.chain(self._normalize(source), frames)
+
+    def _normalize(
+        self, frames: np.ndarray | Iterable[np.ndarray]
+    ) -> Iterator[np.ndarray]:
+        """Normalize frames, fixing the float scale on the first float."""
+        if isinstance(frames, np.ndarray):
+            self.value_range = resolve_value_range(frames, self.value_range)
+            yield from normalize_frames(
+                frames, self.color_order, self.value_range
+            )
+            return
+        for frame in frames:
+            frame = np.asarray(frame)  # noqa: PLW2901
+            self.value_range = resolve_value_range(frame, self.value_range)
+            yield normalize_frame(frame, self.color_order, self.value_range)
+
+    @instrument("VideoWriter.encode")
+    def _encode(self, frame: np.ndarray) -> None:
+        """Hand a single normalized frame to the encoder."""
+        if self._closed:
+            msg = "Cannot add frames to a closed VideoWriter."
+            raise RuntimeError(msg)
+        if not isinstance(self.video_writer, GifWriter):
+            frame = self._preflight(frame)
+        self.video_writer.append_data(frame)
+
+    def _preflight(self, frame: np.ndarray) -> np.ndarray:
+        """Pad a frame to a multiple of `macro_block_size` if needed.
+
+        The padded frame lives in a buffer that is reused for every frame,
+        with the last row and column replicated into the padding.
+        """
+        height, width = frame.shape[:2]
+        block = self.macro_block_size
+        padded_shape = (-(-height // block) * block, -(-width // block) * block)
+        if padded_shape == (height, width):
+            return frame
+        if (
+            self._pad_buffer is None
+            or self._pad_buffer.shape[:2] != padded_shape
+            or self._pad_buffer.shape[2:] != frame.shape[2:]
+        ):
+            self._pad_buffer = np.empty(
+                padded_shape + frame.shape[2:], dtype=np.uint8
+            )
+        buffer = self._pad_buffer
+        buffer[:height, :width] = frame
+        buffer[height:, :width] = buffer[height - 1 : height, :width]
+        buffer[:, width:] = buffer[:, width - 1 : width]
+        return buffer
@@ -0,0 +1,259 @@
+"""Module to encode videos in parallel segments."""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from cogcvutil.image.common.utility.io_util import iter_images_sorted
+from cogcvutil.video.common.frame_util import (
+    VALUE_RANGES,
+    resolve_value_range,
+)
+from cogcvutil.video.writer._base import BaseVideoWriter
+from cogcvutil.video.writer.images_to_video import VideoWriter
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class SegmentedVideoWriter(BaseVideoWriter):
+    """Video writer that encodes GOP-aligned segments in parallel.
+
+    Frames are grouped into segments of `segment_frames` frames, a
+    multiple of `gop_size`, and each segment is encoded by its own
+    `VideoWriter` on a process pool. Every segment starts on a keyframe,
+    so `close` joins them with ffmpeg's concat demuxer and stream copy,
+    without re-encoding, into a file of the same format as a single
+    `VideoWriter` would produce. The GOP size is pinned with `-g` in every
+    segment, so the keyframe layout matches a single-stream encode with
+    the same `-g`.
+
+    The last full segment is held back until more frames arrive, and a
+    shorter tail is appended to it. A tail of a frame or two would be
+    encoded without B-frames, and its different decode delay would leave
+    a timestamp gap at the join.
+
+    Float frames are scaled like in `VideoWriter`, but with "auto" the
+    scale is decided once, by the first float frame, and passed to every
+    segment, so segments of one clip are never scaled differently.
+
+    At most two segments per worker are in flight, so memory is bounded
+    by about `2 * (num_workers + 1) * segment_frames` frames. For the best
+    throughput give each worker few encoder `threads`, e.g. one.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        save_dir: str | Path,
+        file_name: str,
+        frame_rate: int = 20,
+        read_image_from_dir: str | Path | None = None,
+        frame_sequence: Iterable[np.ndarray] | None = None,
+        codec: str = "libx264",
+        *,
+        preset: str | None = None,
+        threads: int | None = None,
+        segment_frames: int = 240,
+        gop_size: int = 60,
+        num_workers: int = 4,
+        color_order: str = "rgb",
+        value_range: str = "auto",
+    ) -> None:
+        """Initialize SegmentedVideoWriter.
+
+        Args:
+            save_dir (str | Path): Directory to save video.
+            file_name (str): Name of the video file, saved as mp4.
+            frame_rate (int, optional): Frame rate of the video. Defaults to 20.
+            read_image_from_dir (str | Path | None, optional): Directory to read images from. Defaults to None.
+            frame_sequence (Iterable[np.ndarray] | None, optional): Frames or a frame source to write to video. Defaults to None.
+            codec (str, optional): Video codec for encoding. Defaults to 'libx264'.
+            preset (str | None, optional): Encoder preset, see `ENCODER_PRESETS`. Defaults to None.
+            threads (int | None, optional): Encoder threads per segment. Defaults to None (not set).
+            segment_frames (int, optional): Number of frames per segment, a multiple of `gop_size`. Defaults to 240.
+            gop_size (int, optional): Keyframe interval of the encoded video. Defaults to 60.
+            num_workers (int, optional): Number of segments encoded in parallel. Defaults to 4.
+            color_order (str, optional): Channel order of color frames, "rgb" or "bgr". Defaults to "rgb".
+            value_range (str, optional): Scale of float frames, "unit" for [0, 1], "byte" for [0, 255] or "auto". Defaults to "auto".
+        """  # noqa: E501
+        if segment_frames < 1 or gop_size < 1 or segment_frames % gop_size:
+            msg = "segment_frames must be a positive multiple of gop_size."
+            raise ValueError(msg)
+        if file_name.endswith(".gif"):
+            msg = "Segmented encoding does not support GIF output."
+            raise ValueError(msg)
+        if value_range not in VALUE_RANGES:
+            msg = f"value_range must be one of {', '.join(VALUE_RANGES)}."
+            raise ValueError(msg)
+        self.save_dir = Path(save_dir)
+        self.save_dir.mkdir(parents=True, exist_ok=True)
+        if not file_name.endswith(".mp4"):
+            file_name += ".mp4"
+        self.output_path = self.save_dir / file_name
+        self.frame_rate = frame_rate
+        self.segment_frames = segment_frames
+        self.num_workers = num_workers
+        self.writer_kwargs = {
+            "frame_rate": frame_rate,
+            "codec": codec,
+            "preset": preset,
+            "threads": threads,
+            "ffmpeg_params": ["-g", str(gop_size)],
+            "streaming": True,
+            "color_order": color_order,
+            "value_range": value_range,
+        }
+        self.frame_source = None
+        if read_image_from_dir:
+            self.frame_source = iter_images_sorted(read_image_from_dir)
+        elif frame_sequence is not None:
+            self.frame_source = iter(frame_sequence)
+        self.frame_sequence: list = []
+
+        self._segment_dir = tempfile.TemporaryDirectory(dir=self.save_dir)
+        self._executor: ProcessPoolExecutor | None = None
+        self._held: list[np.ndarray] | None = None
+        self._pending: deque[Future] = deque()
+        self._segments: list[Path] = []
+        self._closed = False
+
+    def add_frame(self, frame: np.ndarray) -> None:
+        """Add a frame; full segments are submitted for encoding."""
+        if self._closed:
+            msg = "Cannot add frames to a closed SegmentedVideoWriter."
+            raise RuntimeError(msg)
+        self._drain_source()
+        self._append(frame)
+
+    def write(self, frame_sequence: Iterable[np.ndarray] | None = None) -> None:
+        """Encode the frames (or `frame_sequence`) and finalize the video."""
+        if frame_sequence is not None:
+            self.frame_source = iter(frame_sequence)
+        self.close()
+
+    def close(self) -> None:
+        """Encode the remaining frames and concatenate the segments.
+
+        Calling `close` more than once is a no-op.
+        """
+        if self._closed:
+            return
+        try:
+            self._drain_source()
+            if self._held is not None:
+                self._submit(self._held + self.frame_sequence)
+            elif self.frame_sequence:
+                self._submit(self.frame_sequence)
+            self.frame_sequence = []
+            while self._pending:
+                self._pending.popleft().result()
+            if not self._segments:
+                msg = "Frame sequence is empty."
+                raise ValueError(msg)
+            concat_segments(self._segments, self.output_path)
+        finally:
+            self._closed = True
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+            self._segment_dir.cleanup()
+
+    def _drain_source(self) -> None:
+        """Move the frames of the construction-time source into segments."""
+        source, self.frame_source = self.frame_source, None
+        for frame in source or ():
+            self._append(frame)
+
+    def _append(self, frame: np.ndarray) -> None:
+        """Buffer a frame and submit the held segment once one is full."""
+        frame = np.asarray(frame)
+        self.writer_kwargs["value_range"] = resolve_value_range(
+            frame, self.writer_kwargs["value_range"]
+        )
+        self.frame_sequence.append(frame)
+        if len(self.frame_sequence) >= self.segment_frames:
+            if self._held is not None:
+                self._submit(self._held)
+            self._held, self.frame_sequence = self.frame_sequence, []
+
+    def _submit(self, frames: list[np.ndarray]) -> None:
+        """Encode `frames` as the next segment."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.num_workers)
+        while len(self._pending) >= 2 * self.num_workers:
+            self._pending.popleft().result()
+        segment_path = (
+            Path(self._segment_dir.name) / f"{len(self._segments):06d}.mp4"
+        )
+        self._pending.append(
+            self._executor.submit(
+                _encode_segment,
+                segment_path,
+                frames,
+                dict(self.writer_kwargs),
+            )
+        )
+        self._segments.append(segment_path)
+
+
+def concat_segments(segments: list[Path], output_path: str | Path) -> None:
+    """Join video segments without re-encoding, using ffmpeg's concat demuxer.
+
+    Args:
+        segments (list[Path]): The segment files in order, all encoded with the same settings.
+        output_path (str | Path): The path of the joined video.
+
+    Raises:
+        RuntimeError: If ffmpeg fails, with its error output.
+    """  # noqa: E501
+    # Only joining needs the bundled ffmpeg binary, so load it here
+    import imageio_ffmpeg  # noqa: PLC0415
+
+    output_path = Path(output_path)
+    if len(segments) == 1:
+        shutil.move(segments[0], output_path)
+        return
+    list_path = segments[0].with_name("segments.txt")
+    list_path.write_text(
+        "".join(
+            "file '{}'\n".format(str(path.resolve()).replace("'", "'\\''"))
+            for path in segments
+        )
+    )
+    command = [
+        imageio_ffmpeg.get_ffmpeg_exe(),
+        "-y",
+        "-loglevel",
+        "error",
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        str(list_path),
+        "-c",
+        "copy",
+        str(output_path),
+    ]
+    try:
+        subprocess.run(command, check=True, capture_output=True)  # noqa: S603
+    except subprocess.CalledProcessError as exc:
+        error = exc.stderr.decode(errors="replace").strip()
+        msg = f"ffmpeg failed to join the segments: {error}"
+        raise RuntimeError(msg) from exc
+
+
+def _encode_segment(
+    path: Path, frames: list[np.ndarray], writer_kwargs: dict
+) -> None:
+    """Encode one segment with its own VideoWriter (process pool task)."""
+    with VideoWriter(path.parent, path.name, **writer_kwargs) as writer:
+        for frame in frames:
+            writer.add_frame(frame)
@@ -0,0 +1 @@
+"""Package containing common tests."""
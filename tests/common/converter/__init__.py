@@ -0,0 +1 @@
+"""Package containing converter tests."""
@@ -0,0 +1,70 @@
+"""test script of color module."""
+
+from __future__ import annotations
+
+import cv2
+import numpy as np
+import pytest
+
+from cogcvutil.common.converter.color import (
+    bgr_to_rgb,
+    convert_color,
+    hex_to_bgr,
+    hex_to_rgb,
+    rgb_to_bgr,
+)
+
+
+def test_hex_and_named_colors() -> None:
+    """Hex strings and color names parse to the same channel tuples."""
+    assert hex_to_bgr("#FF8000") == (0, 128, 255)
+    assert hex_to_rgb("#FF8000") == (255, 128, 0)
+    assert hex_to_bgr("Orange") == hex_to_bgr("#FFA500")
+
+
+def test_convert_color_stack_matches_per_image() -> None:
+    """A stack is converted like each of its images."""
+    rng = np.random.default_rng(0)
+    stack = rng.integers(0, 256, (3, 5, 7, 3), dtype=np.uint8)
+
+    for dst, code in (
+        ("gray", cv2.COLOR_RGB2GRAY),
+        ("yuv", cv2.COLOR_RGB2YUV),
+        ("bgra", cv2.COLOR_RGB2BGRA),
+    ):
+        expected = np.stack([cv2.cvtColor(image, code) for image in stack])
+        np.testing.assert_array_equal(
+            convert_color(stack, "rgb", dst), expected
+        )
+    # No direct OpenCV code, converted through RGB
+    rgba = convert_color(stack, "rgb", "rgba")
+    np.testing.assert_array_equal(
+        convert_color(rgba, "rgba", "yuv"), convert_color(stack, "rgb", "yuv")
+    )
+    with pytest.raises(ValueError, match="Unsupported color space"):
+        convert_color(stack, "rgb", "hsv")
+
+
+def test_channel_swap_modes() -> None:
+    """Copy, in-place and view swaps agree; gray images pass through."""
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (5, 7, 3), dtype=np.uint8)
+    expected = image[..., ::-1].copy()
+
+    copied = bgr_to_rgb(image)
+    view = rgb_to_bgr(image, mode="view")
+    assert not np.shares_memory(copied, image)
+    assert np.shares_memory(view, image)
+    np.testing.assert_array_equal(copied, expected)
+    np.testing.assert_array_equal(view, expected)
+
+    inplace = image.copy()
+    assert bgr_to_rgb(inplace, mode="inplace") is inplace
+    np.testing.assert_array_equal(inplace, expected)
+    strided = np.repeat(image, 2, axis=1)[:, ::2]
+    np.testing.assert_array_equal(bgr_to_rgb(strided, mode="inplace"), expected)
+
+    gray = np.zeros((5, 7), dtype=np.uint8)
+    assert bgr_to_rgb(gray) is gray
+    with pytest.raises(ValueError, match="3-channel"):
+        bgr_to_rgb(np.zeros((5, 7, 4), dtype=np.uint8), mode="view")
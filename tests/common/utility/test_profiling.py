@@ -0,0 +1,60 @@
+"""test script of profiling module."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+from cogcvutil import read_image, save_image
+from cogcvutil.common.utility.profiling import (
+    CallRecord,
+    add_hook,
+    instrument,
+    profile,
+    remove_hook,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_profile_collects_per_stage_breakdown(tmp_path: Path) -> None:
+    """Instrumented calls are timed and their pixels and bytes counted."""
+    image = np.zeros((6, 8, 3), dtype=np.uint8)
+    with profile() as report:
+        for idx in range(2):
+            save_image(image, tmp_path / f"frame_{idx}.png")
+        read_image(tmp_path / "frame_0.png")
+
+    stages = report.to_dict()
+    assert stages["save_image"]["calls"] == 2
+    assert stages["save_image"]["pixels"] == 2 * 48
+    assert stages["save_image"]["bytes"] == 2 * image.nbytes
+    assert stages["read_image"]["pixels"] == 48
+    assert json.loads(report.to_json(tmp_path / "profile.json")) == stages
+    assert (tmp_path / "profile.json").exists()
+    # The profile stops counting once its block exits
+    save_image(image, tmp_path / "frame_2.png")
+    assert report.to_dict()["save_image"]["calls"] == 2
+
+
+def test_hooks_receive_call_records() -> None:
+    """Hooks see every call until removed, even calls that raise."""
+
+    @instrument("stage")
+    def fail(_image: np.ndarray) -> None:
+        msg = "stage failed"
+        raise ValueError(msg)
+
+    calls: list[CallRecord] = []
+    add_hook(calls.append)
+    with pytest.raises(ValueError, match="stage failed"):
+        fail(np.zeros((2, 2), dtype=np.uint8))
+    remove_hook(calls.append)
+    with pytest.raises(ValueError, match="stage failed"):
+        fail(np.zeros((2, 2), dtype=np.uint8))
+
+    assert [(call.stage, call.pixels) for call in calls] == [("stage", 4)]
@@ -0,0 +1,148 @@
+"""test script of bounding_box module."""
+
+from __future__ import annotations
+
+import cv2
+import numpy as np
+import pytest
+
+from cogcvutil.image.annotator.bounding_box import (
+    visualize_bbox,
+    visualize_bbox_batch,
+    visualize_bbox_with_annotations,
+)
+
+
+def _random_boxes(num_boxes: int, height: int, width: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    x1 = rng.integers(-40, width, num_boxes)
+    y1 = rng.integers(-40, height, num_boxes)
+    return np.stack(
+        [
+            x1,
+            y1,
+            x1 + rng.integers(1, 80, num_boxes),
+            y1 + rng.integers(1, 80, num_boxes),
+        ],
+        axis=1,
+    )
+
+
+@pytest.mark.parametrize("thickness", [1, 3])
+def test_visualize_bbox_matches_rectangle(thickness: int) -> None:
+    """Batched edges are identical to drawing each box with cv2."""
+    image = np.zeros((120, 160, 3), dtype=np.uint8)
+    bboxes = _random_boxes(200, 120, 160)
+
+    expected = image.copy()
+    for x1, y1, x2, y2 in bboxes.tolist():
+        cv2.rectangle(expected, (x1, y1), (x2, y2), (0, 0, 255), thickness)
+
+    result = visualize_bbox(image, bboxes, thickness)
+    assert np.array_equal(result, expected)
+
+
+@pytest.mark.parametrize("text_loc", ["up", "down"])
+def test_visualize_bbox_batch_matches_per_box(text_loc: str) -> None:
+    """Labels of non-overlapping boxes match the per-box annotator."""
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 255, (240, 640, 3), dtype=np.uint8)
+    bboxes = np.array(
+        [
+            [x, y, x + 100, y + 45]
+            for y in range(-20, 240, 90)
+            for x in range(-60, 640, 130)
+        ]
+    )
+    labels = ["cat", "dog", "person"]
+    label_indices = rng.integers(0, len(labels), len(bboxes))
+    confs = rng.random(len(bboxes))
+
+    expected = image.copy()
+    for bbox, label_idx, conf in zip(bboxes, label_indices, confs):
+        visualize_bbox_with_annotations(
+            expected,
+            [bbox],
+            [labels[label_idx]],
+            [conf],
+            2,
+            "#00FF00",
+            text_loc=text_loc,
+        )
+
+    result = visualize_bbox_batch(
+        image.copy(),
+        bboxes,
+        palette=["#00FF00"],
+        labels=labels,
+        label_indices=label_indices,
+        confs=confs,
+        bbox_border_thickness=2,
+        text_loc=text_loc,
+    )
+    assert np.array_equal(result, expected)
+
+
+def test_visualize_bbox_batch_palette() -> None:
+    """Each box is drawn in its palette color."""
+    image = np.zeros((40, 80, 3), dtype=np.uint8)
+    bboxes = [[5, 5, 30, 30], [45, 5, 70, 30]]
+
+    visualize_bbox_batch(
+        image, bboxes, palette=["#FF0000", "#0000FF"], color_indices=[0, 1]
+    )
+    assert image[5, 10].tolist() == [0, 0, 255]
+    assert image[5, 50].tolist() == [255, 0, 0]
+
+
+def test_visualize_bbox_batch_empty_frame() -> None:
+    """Frames without boxes are returned unchanged, labels or not."""
+    image = np.full((40, 80, 3), 7, dtype=np.uint8)
+
+    result = visualize_bbox_batch(
+        image,
+        np.zeros((0, 4)),
+        labels=["x"],
+        label_indices=np.zeros(0, dtype=np.int64),
+        confs=np.zeros(0),
+    )
+
+    assert result is image
+    assert (image == 7).all()
+
+
+def test_visualize_bbox_batch_formats_confs_like_per_box() -> None:
+    """Out-of-range and half-way confidences print the per-box text."""
+    image = np.zeros((200, 480, 3), dtype=np.uint8)
+    bboxes = np.array([[x, 60, x + 70, 90] for x in range(10, 480, 95)])
+    labels = ["cat", "dog"]
+    label_indices = np.array([1, 0, 1, 0, 1])
+    confs = np.array([1.5, 1.5, 0.125, 0.675, -0.2])
+
+    expected = image.copy()
+    for bbox, label_idx, conf in zip(bboxes, label_indices, confs):
+        visualize_bbox_with_annotations(
+            expected, [bbox], [labels[label_idx]], [conf]
+        )
+
+    result = visualize_bbox_batch(
+        image.copy(),
+        bboxes,
+        labels=labels,
+        label_indices=label_indices,
+        confs=confs,
+    )
+    assert np.array_equal(result, expected)
+
+
+def test_visualize_bbox_batch_fills_boxes() -> None:
+    """A negative thickness fills the boxes like visualize_bbox."""
+    image = np.zeros((120, 160, 3), dtype=np.uint8)
+    bboxes = _random_boxes(50, 120, 160)
+
+    expected = visualize_bbox(image.copy(), bboxes, -1)
+
+    result = visualize_bbox_batch(
+        image.copy(), bboxes, bbox_border_thickness=-1
+    )
+    assert np.array_equal(result, expected)
@@ -0,0 +1,72 @@
+"""test script of overlay_layer module."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from cogcvutil.image.annotator.overlay_layer import OverlayLayer
+from cogcvutil.image.annotator.text_annotator import TextAnnotator
+
+STATIC = ["camera 01", "job: redaction"]
+
+
+def _image() -> np.ndarray:
+    """Return a random BGR test image."""
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 255, (160, 320, 3), dtype=np.uint8)
+
+
+def _annotated(lines: list[str], position: str, color_order: str) -> np.ndarray:
+    """Return the image annotated by insert_annotation."""
+    return TextAnnotator().insert_annotation(
+        _image(),
+        lines,
+        position,
+        input_color_order=color_order,
+        output_color_order=color_order,
+    )
+
+
+@pytest.mark.parametrize(
+    "position", ["upper_left", "upper_right", "lower_left", "lower_right"]
+)
+@pytest.mark.parametrize("color_order", ["bgr", "rgb"])
+def test_composite_matches_insert_annotation(
+    position: str, color_order: str
+) -> None:
+    """Blended and directly drawn lines match insert_annotation."""
+    layer = OverlayLayer(STATIC, position)
+    expected = _annotated([*STATIC, "frame 000001"], position, color_order)
+
+    # The dynamic line is drawn directly first, then blended once repeated
+    for _ in range(2):
+        result = layer.composite(_image(), ["frame 000001"], color_order)
+        assert np.abs(result.astype(np.int16) - expected).max() <= 1
+
+
+def test_lines_are_rasterized_once() -> None:
+    """Only new lines are rasterized, the static block is reused."""
+    layer = OverlayLayer(STATIC)
+    assert layer.renders == len(STATIC)
+
+    for _ in range(3):
+        layer.composite(_image(), ["frame 000001"])
+    # Drawn directly once, then composed into a block
+    assert layer.renders == len(STATIC) + 2
+
+    layer.set_static_lines(STATIC)
+    layer.set_static_lines([*STATIC, "frame 000001"])
+    assert layer.renders == len(STATIC) + 2
+
+
+def test_composite_keeps_the_alpha_channel() -> None:
+    """BGRA frames are blended on their color channels only."""
+    image = np.dstack([_image(), np.full((160, 320), 7, dtype=np.uint8)])
+    expected = OverlayLayer(STATIC).composite(_image(), ["frame 000001"])
+
+    result = OverlayLayer(STATIC).composite(image, ["frame 000001"])
+
+    # BGRA frames blend new lines instead of drawing them directly
+    assert np.abs(result[..., :3].astype(np.int16) - expected).max() <= 1
+    assert (result[..., 3] == 7).all()
@@ -0,0 +1,55 @@
+"""test script of text_annotator module."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from cogcvutil.image.annotator.text_annotator import TextAnnotator
+
+TEXT = ["camera 01", "job: redaction"]
+
+
+def _image() -> np.ndarray:
+    """Return a random BGR test image."""
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 255, (120, 240, 3), dtype=np.uint8)
+
+
+def test_default_returns_rgb_copy() -> None:
+    """The default contract draws in place and returns an RGB frame."""
+    image = _image()
+
+    result = TextAnnotator().insert_annotation(image, TEXT)
+
+    assert result is not image
+    np.testing.assert_array_equal(result, image[..., ::-1])
+
+
+def test_matching_color_order_skips_conversion() -> None:
+    """Matching color orders return the annotated input itself."""
+    image = _image()
+    expected = TextAnnotator().insert_annotation(image.copy(), TEXT)
+
+    result = TextAnnotator().insert_annotation(
+        image, TEXT, input_color_order="bgr", output_color_order="bgr"
+    )
+
+    assert result is image
+    np.testing.assert_array_equal(result[..., ::-1], expected)
+
+
+def test_out_buffer_leaves_input_untouched() -> None:
+    """Writing into `out` converts once and keeps the input intact."""
+    image = _image()
+    original = image.copy()
+    expected = TextAnnotator().insert_annotation(image.copy(), TEXT)
+    out = np.empty_like(image)
+
+    result = TextAnnotator().insert_annotation(image, TEXT, out=out)
+    np.testing.assert_array_equal(image, original)
+    inplace = TextAnnotator().insert_annotation(image, TEXT, out=image)
+
+    assert result is out
+    assert inplace is image
+    np.testing.assert_array_equal(result, expected)
+    np.testing.assert_array_equal(inplace, expected)
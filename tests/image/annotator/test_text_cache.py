@@ -0,0 +1,44 @@
+"""test script of text_cache module."""
+
+from __future__ import annotations
+
+import cv2
+import numpy as np
+import pytest
+
+from cogcvutil.image.annotator.text_cache import (
+    LabelSpriteCache,
+    TextMetricsCache,
+)
+
+
+def test_metrics_cache_counts_hits_and_evicts() -> None:
+    """Repeated strings hit the cache and the size stays bounded."""
+    cache = TextMetricsCache(maxsize=2)
+    font = cv2.FONT_HERSHEY_SIMPLEX
+
+    first = cache.get_text_size("a", font, 1.0, 2)
+    assert cache.get_text_size("a", font, 1.0, 2) == first
+    cache.get_text_size("b", font, 1.0, 2)
+    cache.get_text_size("c", font, 1.0, 2)
+
+    assert first == cv2.getTextSize("a", font, 1.0, 2)
+    assert cache.stats() == {"hits": 1, "misses": 3, "size": 2, "maxsize": 2}
+
+
+@pytest.mark.parametrize("line_type", [cv2.LINE_8, cv2.LINE_AA])
+def test_sprite_draw_matches_put_text(line_type: int) -> None:
+    """Blending a cached label matches rasterizing it with putText."""
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 255, (120, 200, 3), dtype=np.uint8)
+    expected = image.copy()
+    args = ("label: 0.93", cv2.FONT_HERSHEY_SIMPLEX, 0.8, (20, 200, 40), 2)
+    for org in [(10, 60), (150, 10)]:
+        cv2.putText(expected, args[0], org, *args[1:], line_type)
+
+    cache = LabelSpriteCache()
+    for org in [(10, 60), (150, 10)]:
+        cache.draw(image, args[0], org, *args[1:], line_type)
+
+    np.testing.assert_allclose(image, expected, atol=1)
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1 @@
+"""Package containing image common tests."""
@@ -0,0 +1 @@
+"""Package containing image utility tests."""
@@ -0,0 +1,52 @@
+"""test script of async_saver module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+from cogcvutil.image.common.utility.async_saver import AsyncImageSaver
+from cogcvutil.image.common.utility.io_util import read_image, save_image
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _image(value: int) -> np.ndarray:
+    """Return a small constant RGB image."""
+    return np.full((6, 6, 3), value, dtype=np.uint8)
+
+
+def test_auto_indexing_matches_save_image(tmp_path: Path) -> None:
+    """Indexed names fill gaps the same way as save_image."""
+    save_image(_image(0), tmp_path / "frame_1.png")
+    save_image(_image(0), tmp_path / "frame_3.png")
+
+    with AsyncImageSaver(num_workers=2, max_queue_size=1) as saver:
+        paths = [
+            saver.save(
+                _image(value), tmp_path / "frame.png", auto_indexing=True
+            )
+            for value in range(4)
+        ]
+
+    assert [path.name for path in paths] == [
+        "frame_0.png",
+        "frame_2.png",
+        "frame_4.png",
+        "frame_5.png",
+    ]
+    for value, path in enumerate(paths):
+        assert read_image(path)[0, 0, 0] == value
+
+
+def test_worker_errors_are_raised_on_flush(tmp_path: Path) -> None:
+    """A failed write surfaces on the caller's thread."""
+    saver = AsyncImageSaver()
+    saver.save(_image(1), tmp_path / "missing" / "frame.png")
+
+    with pytest.raises(FileNotFoundError):
+        saver.flush()
+    saver.close()
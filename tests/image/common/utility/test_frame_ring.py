@@ -0,0 +1,121 @@
+"""test script of frame_ring module."""
+
+from __future__ import annotations
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from cogcvutil.image.annotator.bounding_box import visualize_bbox
+from cogcvutil.image.common.utility import frame_ring
+from cogcvutil.image.common.utility.frame_ring import (
+    SharedFrameRing,
+    map_shared,
+)
+from cogcvutil.image.filter.image_filter import ImageFilter
+
+
+def _frames(num_frames: int) -> np.ndarray:
+    """Return frames whose pixels encode their index."""
+    frames = np.full((num_frames, 24, 32, 3), 100, dtype=np.uint8)
+    frames[..., 0] = np.arange(num_frames)[:, None, None]
+    return frames
+
+
+def test_ring_refcounts_and_backpressure() -> None:
+    """Slots are freed at zero references and acquire waits for them."""
+    with SharedFrameRing((4, 6, 3), num_slots=2) as ring:
+        first = ring.put(np.ones((4, 6, 3), dtype=np.uint8))
+        second = ring.acquire()
+        ring.retain(first)
+        with pytest.raises(TimeoutError):
+            ring.acquire(timeout=0.01)
+
+        ring.release(first)
+        assert ring.refcount(first) == 1
+        ring.release(first)
+        assert ring.acquire(timeout=0.01) == first
+        assert second != first
+
+        # Unpickling attaches to the same memory
+        attached = pickle.loads(pickle.dumps(ring))  # noqa: S301
+        ring[second][:] = 7
+        assert attached[second].max() == 7
+        with pytest.raises(RuntimeError, match="created the ring"):
+            attached.release(second)
+
+
+@pytest.mark.parametrize("copy", [True, False])
+def test_map_shared_matches_inline_calls(copy: bool) -> None:
+    """Process-pool results equal in-process calls, in order."""
+    frames = _frames(9)
+    bboxes = [[[2, 2, 10 + idx, 12]] for idx in range(len(frames))]
+    image_filter = ImageFilter()
+
+    results = [
+        frame.copy()
+        for frame in map_shared(
+            image_filter.apply_filter_to_bbox,
+            frames,
+            bboxes,
+            num_workers=2,
+            num_slots=3,
+            copy=copy,
+            filter_type="blur",
+            blur_radius=5,
+        )
+    ]
+    drawn = list(
+        map_shared(
+            visualize_bbox,
+            frames,
+            bboxes,
+            num_workers=2,
+            bbox_border_color="blue",
+        )
+    )
+
+    for frame, boxes, result, outlined in zip(frames, bboxes, results, drawn):
+        expected = image_filter.apply_filter_to_bbox(
+            frame, boxes, filter_type="blur", blur_radius=5
+        )
+        np.testing.assert_array_equal(result, expected)
+        np.testing.assert_array_equal(
+            outlined, visualize_bbox(frame.copy(), boxes, 1, "blue")
+        )
+
+
+def _attached_rings() -> list[str]:
+    """Return the names of the rings attached by this process (pool task)."""
+    # Workers expose no other view of their cache
+    return list(frame_ring._attached)  # noqa: SLF001
+
+
+def test_reused_executor_releases_old_rings() -> None:
+    """Workers of a long-lived pool keep at most one finished ring."""
+    frames = _frames(6)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        for _ in range(3):
+            results = list(
+                map_shared(
+                    ImageFilter().apply_filter_to_bbox,
+                    frames,
+                    [[[0, 0, 8, 8]]] * len(frames),
+                    num_workers=2,
+                    executor=executor,
+                )
+            )
+            assert len(results) == len(frames)
+            attached = [
+                executor.submit(_attached_rings).result() for _ in range(8)
+            ]
+            assert all(len(names) <= 1 for names in attached)
+
+    with SharedFrameRing((4, 6, 3), num_slots=1) as ring:
+        attached = pickle.loads(pickle.dumps(ring))  # noqa: S301
+        # Attaching in the owner process returns a separate mapping
+        assert attached is not ring
+    assert frame_ring.release_stale_rings() == 1
+    assert attached.closed
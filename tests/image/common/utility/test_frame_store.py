@@ -0,0 +1,122 @@
+"""test script of frame_store module."""
+
+from __future__ import annotations
+
+import pickle
+from typing import TYPE_CHECKING
+
+import cv2
+import numpy as np
+import pytest
+
+from cogcvutil.image.common.utility.frame_store import FrameStore
+from cogcvutil.video.writer.images_to_video import VideoWriter
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+def _frames(num_frames: int, start: int = 0) -> np.ndarray:
+    """Return frames whose pixels encode their index."""
+    frames = np.zeros((num_frames, 6, 10, 3), dtype=np.uint8)
+    frames[..., 0] = np.arange(start, start + num_frames)[:, None, None]
+    frames[..., 2] = 200
+    return frames
+
+
+def test_frame_store_from_images(tmp_path: Path) -> None:
+    """Images round-trip as RGB views in natural numeric order."""
+    image_dir = tmp_path / "images"
+    image_dir.mkdir()
+    expected = _frames(12)
+    for idx, frame in enumerate(expected):
+        cv2.imwrite(str(image_dir / f"frame_{idx}.png"), frame[..., ::-1])
+
+    store = FrameStore.from_images(tmp_path / "frames.cgfs", image_dir)
+    reader = FrameStore(tmp_path / "frames.cgfs")
+
+    assert len(reader) == 12
+    assert reader.frame_shape == (6, 10, 3)
+    assert reader.sources[:3] == ["frame_0.png", "frame_1.png", "frame_2.png"]
+    np.testing.assert_array_equal(reader[:], expected)
+    np.testing.assert_array_equal(reader[3:9:2], expected[3:9:2])
+    assert not reader[4].flags.writeable
+    assert np.shares_memory(reader[4], reader[2:6])
+    store.close()
+
+
+def test_frame_store_append_and_refresh(tmp_path: Path) -> None:
+    """Readers see appended frames after refresh; bad frames are rejected."""
+    path = tmp_path / "frames.cgfs"
+    with FrameStore.create(path, (6, 10, 3)) as store:
+        assert store.append(_frames(3), ["a", "b", "c"]) == 3
+        reader = FrameStore(path)
+        store.append(_frames(1, start=3)[0])
+        with pytest.raises(ValueError, match="Expected uint8"):
+            store.append(iter([*_frames(2, start=4), _frames(1)[0, :3]]))
+
+    assert len(reader) == 3
+    reader.refresh()
+    assert len(reader) == 6
+    assert reader.sources == ["a", "b", "c", None, None, None]
+    np.testing.assert_array_equal(reader[:], _frames(6))
+    with pytest.raises(PermissionError):
+        reader.append(_frames(1))
+    with pytest.raises(FileExistsError):
+        FrameStore.create(path, (6, 10, 3))
+
+
+def test_frame_store_is_valid_during_append(tmp_path: Path) -> None:
+    """Readers opening the store mid-append see the committed frames."""
+    path = tmp_path / "frames.cgfs"
+    store = FrameStore.create(path, (6, 10, 3))
+    store.append(_frames(3), ["a", "b", "c"])
+    seen = []
+
+    def frames() -> Iterator[np.ndarray]:
+        for idx, frame in enumerate(_frames(40, start=3)):
+            with FrameStore(path) as reader:
+                seen.append(len(reader))
+                np.testing.assert_array_equal(reader[:], _frames(3))
+                assert reader.sources == ["a", "b", "c"]
+            yield frame
+            if idx == 29:
+                msg = "interrupted"
+                raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError, match="interrupted"):
+        store.append(frames())
+
+    assert seen == [3] * 30
+    assert len(store) == 33
+    np.testing.assert_array_equal(FrameStore(path)[:], _frames(33))
+    store.append(_frames(7, start=33), [str(idx) for idx in range(7)])
+    assert FrameStore(path).sources[-1] == "6"
+    np.testing.assert_array_equal(FrameStore(path)[:], _frames(40))
+
+
+def test_frame_store_pickles_by_path(tmp_path: Path) -> None:
+    """Pickled stores reopen the file read-only."""
+    path = tmp_path / "frames.cgfs"
+    FrameStore.create(path, (6, 10, 3)).append(_frames(4))
+
+    clone = pickle.loads(pickle.dumps(FrameStore(path, writable=True)))  # noqa: S301
+
+    assert not clone.writable
+    np.testing.assert_array_equal(clone[2], _frames(4)[2])
+
+
+def test_frame_store_from_video(tmp_path: Path) -> None:
+    """Video frames are stored with their frame indices as sources."""
+    with VideoWriter(tmp_path, "clip", frame_rate=10) as writer:
+        for idx in range(10):
+            writer.add_frame(np.full((32, 48, 3), idx * 20, dtype=np.uint8))
+
+    store = FrameStore.from_video(
+        tmp_path / "frames.cgfs", writer.output_path, start_frame=2, stride=3
+    )
+
+    assert len(store) == 3
+    assert store.sources == ["clip.mp4:2", "clip.mp4:5", "clip.mp4:8"]
+    assert [round(frame.mean() / 20) for frame in store] == [2, 5, 8]
@@ -0,0 +1,94 @@
+"""test script of image_cache module."""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+from cogcvutil.image.common.utility.image_cache import ImageCache
+from cogcvutil.image.common.utility.io_util import read_image, save_image
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _save(path: Path, value: int) -> np.ndarray:
+    """Save a constant 8x8 RGB image and return it."""
+    image = np.full((8, 8, 3), value, dtype=np.uint8)
+    save_image(image, path)
+    return image
+
+
+def test_image_cache_hits_and_read_only_views(tmp_path: Path) -> None:
+    """Repeated reads hit the cache and return read-only views."""
+    path = tmp_path / "image.png"
+    _save(path, 10)
+    cache = ImageCache()
+
+    first = cache.read_image(path)
+    second = cache.read_image(str(tmp_path / "image.png"))
+    pil_image = cache.read_image(path, "PIL")
+
+    np.testing.assert_array_equal(first, read_image(path))
+    assert not second.flags.writeable
+    with pytest.raises(ValueError, match="read-only"):
+        second[0, 0, 0] = 0
+    assert np.shares_memory(first, cache.read_image(path))
+    assert pil_image.size == (8, 8)
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["hits"] == 2
+
+
+def test_image_cache_invalidates_on_change(tmp_path: Path) -> None:
+    """A rewritten file is decoded again."""
+    path = tmp_path / "image.png"
+    _save(path, 10)
+    cache = ImageCache()
+    cache.read_image(path)
+
+    _save(path, 20)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert cache.read_image(path)[0, 0, 0] == 20
+    assert cache.stats()["misses"] == 2
+
+
+def test_image_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """The byte budget evicts the least recently used image."""
+    paths = [tmp_path / f"image_{idx}.png" for idx in range(3)]
+    for idx, path in enumerate(paths):
+        _save(path, idx)
+    cache = ImageCache(max_bytes=2 * 8 * 8 * 3)
+
+    cache.read_image(paths[0])
+    cache.read_image(paths[1])
+    cache.read_image(paths[0])
+    cache.read_image(paths[2])
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 2 * 8 * 8 * 3
+    cache.read_image(paths[0])
+    assert cache.stats()["hits"] == 2
+    with pytest.raises(FileNotFoundError):
+        cache.read_image(tmp_path / "missing.png")
+
+
+def test_image_cache_concurrent_reads(tmp_path: Path) -> None:
+    """Concurrent reads of one file decode it once."""
+    path = tmp_path / "image.png"
+    expected = _save(path, 30)
+    cache = ImageCache()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        images = list(executor.map(lambda _: cache.read_image(path), range(64)))
+
+    for image in images:
+        np.testing.assert_array_equal(image, expected)
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 63
@@ -0,0 +1,117 @@
+"""test script of io_util module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import cv2
+import numpy as np
+import pytest
+
+from cogcvutil.image.common.utility.io_util import (
+    iter_images_sorted,
+    read_image,
+    read_images_sorted,
+    save_image,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _write_frames(directory: Path, num_frames: int) -> list[np.ndarray]:
+    """Write numbered BGR frames to a directory and return them as RGB."""
+    frames = []
+    for idx in range(num_frames):
+        frame = np.full((8, 8, 3), idx, dtype=np.uint8)
+        frame[..., 0] = 200
+        cv2.imwrite(str(directory / f"frame_{idx}.png"), frame)
+        frames.append(frame[..., ::-1])
+    return frames
+
+
+def test_iter_images_sorted_matches_read_images_sorted(tmp_path: Path) -> None:
+    """Parallel lazy loading keeps natural order and RGB conversion."""
+    expected = _write_frames(tmp_path, 12)
+    (tmp_path / "notes.txt").write_text("skip me")
+
+    lazy = list(iter_images_sorted(tmp_path, num_workers=3, prefetch=2))
+    eager = read_images_sorted(str(tmp_path))
+
+    assert len(lazy) == len(eager) == 12
+    for got, ref, want in zip(lazy, eager, expected):
+        np.testing.assert_array_equal(got, want)
+        np.testing.assert_array_equal(ref, want)
+
+
+def test_iter_images_sorted_batches(tmp_path: Path) -> None:
+    """Batching stacks images and yields a short final batch."""
+    _write_frames(tmp_path, 10)
+
+    batches = list(iter_images_sorted(tmp_path, batch_size=4))
+
+    assert [batch.shape for batch in batches] == [
+        (4, 8, 8, 3),
+        (4, 8, 8, 3),
+        (2, 8, 8, 3),
+    ]
+    assert batches[2][1, 0, 0, 1] == 9
+
+
+def test_bgr_color_order_round_trips(tmp_path: Path) -> None:
+    """BGR images are read and saved without a channel swap."""
+    expected = _write_frames(tmp_path, 2)
+
+    bgr = read_images_sorted(str(tmp_path), color_order="bgr")
+    np.testing.assert_array_equal(bgr[1], expected[1][..., ::-1])
+
+    save_image(bgr[1], tmp_path / "saved.png", color_order="bgr")
+    np.testing.assert_array_equal(
+        read_image(tmp_path / "saved.png"), expected[1]
+    )
+
+
+def test_read_image_backends_agree(tmp_path: Path) -> None:
+    """Every decoder returns the same RGB pixels for a PNG file."""
+    expected = _write_frames(tmp_path, 3)[2]
+    path = tmp_path / "frame_2.png"
+
+    for backend in ("auto", "PIL", "cv2", "imageio"):
+        np.testing.assert_array_equal(
+            read_image(path, backend=backend), expected
+        )
+    assert read_image(path, "PIL", backend="cv2").size == (8, 8)
+    with pytest.raises(ValueError, match="Unsupported backend"):
+        read_image(path, backend="tiff")
+    with pytest.raises(FileNotFoundError):
+        read_image(tmp_path / "missing.png")
+
+
+@pytest.mark.parametrize("backend", ["PIL", "cv2"])
+def test_read_image_reduced_jpeg(tmp_path: Path, backend: str) -> None:
+    """Reduced JPEG decodes resize to the target size."""
+    ys, xs = np.mgrid[0:480, 0:640]
+    image = np.stack([xs % 256, ys % 256, (xs + ys) % 256], axis=-1)
+    path = tmp_path / "frame.jpg"
+    cv2.imwrite(str(path), image.astype(np.uint8))
+
+    full = read_image(path, backend=backend)
+    reduced = read_image(path, backend=backend, target_size=(150, 120))
+
+    assert reduced.shape == (120, 150, 3)
+    reference = cv2.resize(full, (150, 120), interpolation=cv2.INTER_AREA)
+    assert np.abs(reduced.astype(int) - reference).mean() < 4
+
+
+def test_read_image_torch_is_contiguous_chw(tmp_path: Path) -> None:
+    """Torch images are contiguous (C, H, W) tensors."""
+    torch = pytest.importorskip("torch")
+    expected = _write_frames(tmp_path, 1)[0]
+
+    tensor = read_image(tmp_path / "frame_0.png", "torch")
+
+    assert tensor.shape == (3, 8, 8)
+    assert tensor.is_contiguous()
+    assert torch.equal(
+        tensor, torch.from_numpy(expected.transpose(2, 0, 1).copy())
+    )
@@ -0,0 +1 @@
+"""Package containing image filter tests."""
@@ -0,0 +1,192 @@
+"""test script of image_filter module."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from cogcvutil.image.common.utility.bbox_util import (
+    bbox_to_slices,
+    merge_overlapping_bboxes,
+)
+from cogcvutil.image.filter.image_filter import ImageFilter
+
+BBOXES = [
+    [10, 10, 50, 60],
+    [40, 40, 120, 90],
+    [300, 200, 420, 310],
+    [-5, 250, 30, 299],
+    [150, 150, 140, 140],
+]
+
+
+def _image() -> np.ndarray:
+    """Return a random test image."""
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 255, (300, 400, 3), dtype=np.uint8)
+
+
+def _full_frame_reference(
+    image: np.ndarray, filter_image: np.ndarray
+) -> np.ndarray:
+    """Composite `filter_image` into `image` inside BBOXES."""
+    expected = image.copy()
+    for x1, y1, x2, y2 in bbox_to_slices(BBOXES, image.shape):
+        expected[y1:y2, x1:x2] = filter_image[y1:y2, x1:x2]
+    return expected
+
+
+@pytest.mark.parametrize("blur_radius", [5, 30, 51])
+def test_roi_blur_matches_full_frame_blur(blur_radius: int) -> None:
+    """ROI blurring gives the same pixels as blurring the whole frame."""
+    image_filter = ImageFilter()
+    image = _image()
+    kernel = blur_radius + 1 if blur_radius % 2 == 0 else blur_radius
+    expected = _full_frame_reference(
+        image, image_filter.gaussian_blur(image, kernel)
+    )
+
+    result = image_filter.apply_filter_to_bbox(
+        image, BBOXES, filter_type="blur", blur_radius=blur_radius
+    )
+    inplace = image_filter.apply_filter_to_bbox(
+        image.copy(),
+        np.array(BBOXES),
+        filter_type="blur",
+        blur_radius=blur_radius,
+        inplace=True,
+    )
+
+    np.testing.assert_array_equal(result, expected)
+    np.testing.assert_array_equal(inplace, expected)
+
+
+@pytest.mark.parametrize("blur_radius", [31, 101])
+def test_roi_box_blur_matches_full_frame_box_blur(blur_radius: int) -> None:
+    """The box blur ROIs are padded by the reach of all its passes."""
+    image_filter = ImageFilter()
+    image = _image()
+    expected = _full_frame_reference(
+        image, image_filter.box_blur(image, blur_radius)
+    )
+
+    result = image_filter.apply_filter_to_bbox(
+        image, BBOXES, filter_type="box_blur", blur_radius=blur_radius
+    )
+
+    np.testing.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize("filter_type", ["pyramid_blur", "box_blur"])
+def test_fast_blurs_approximate_gaussian_blur(filter_type: str) -> None:
+    """The radius-independent blurs stay close to the Gaussian."""
+    image_filter = ImageFilter()
+    image = _image().repeat(4, axis=0).repeat(4, axis=1)
+    boxes = [[200, 200, 800, 700]]
+    expected = image_filter.apply_filter_to_bbox(image, boxes, "blur", 101)
+
+    result = image_filter.apply_filter_to_bbox(image, boxes, filter_type, 101)
+
+    error = np.abs(result.astype(np.int16) - expected)[200:700, 200:800]
+    assert error.mean() < 2
+    assert error.max() <= 8
+
+
+def test_mosaic_fills_cells_with_their_mean() -> None:
+    """Mosaic cells are aligned to the frame and hold the cell mean."""
+    image = _image()
+
+    result = ImageFilter().apply_filter_to_bbox(
+        image, [[16, 24, 55, 47]], filter_type="mosaic", blur_radius=8
+    )
+
+    cells = result[24:48, 16:56].reshape(3, 8, 5, 8, 3)
+    means = image[24:48, 16:56].reshape(3, 8, 5, 8, 3).mean(axis=(1, 3))
+    assert (cells == cells[:, :1, :, :1]).all()
+    assert np.abs(cells[:, 0, :, 0] - means).max() <= 1
+    result[24:48, 16:56] = image[24:48, 16:56]
+    np.testing.assert_array_equal(result, image)
+
+
+@pytest.mark.parametrize("cell_size", [1, 7, 16])
+def test_roi_mosaic_matches_full_frame_mosaic(cell_size: int) -> None:
+    """Mosaic cells follow the frame grid, whatever the box position."""
+    image = _image()
+    image_filter = ImageFilter()
+    expected = _full_frame_reference(
+        image, image_filter.mosaic(image, cell_size)
+    )
+
+    result = image_filter.apply_filter_to_bbox(
+        image, BBOXES, filter_type="mosaic", blur_radius=cell_size
+    )
+
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_unsupported_filter_type_raises() -> None:
+    """Unknown filter types are rejected."""
+    with pytest.raises(ValueError, match="Unsupported filter type"):
+        ImageFilter().apply_filter_to_bbox(_image(), BBOXES, "median")
+
+
+def test_black_filter_leaves_input_untouched() -> None:
+    """The black filter only zeroes box pixels in a copy by default."""
+    image = _image()
+    original = image.copy()
+
+    result = ImageFilter().apply_filter_to_bbox(image, BBOXES)
+
+    np.testing.assert_array_equal(image, original)
+    np.testing.assert_array_equal(
+        result, _full_frame_reference(image, np.zeros_like(image))
+    )
+
+
+def test_merge_overlapping_bboxes_groups_chains() -> None:
+    """Chains of overlapping boxes are merged into one group."""
+    regions = np.array(
+        [[0, 0, 10, 10], [50, 50, 60, 60], [8, 8, 20, 20], [18, 0, 30, 10]]
+    )
+
+    groups = merge_overlapping_bboxes(regions)
+
+    assert [group.tolist() for group in groups] == [[0, 2, 3], [1]]
+    assert len(merge_overlapping_bboxes(regions, margin=20)) == 1
+
+
+def test_apply_filter_to_batch_matches_single_frame() -> None:
+    """Ragged and padded batches give the same result as per-frame calls."""
+    image_filter = ImageFilter()
+    frames = np.stack([_image(), _image()[::-1].copy(), _image()[:, ::-1]])
+    ragged = [BBOXES, [], np.array(BBOXES[:2])]
+    padded = np.full((3, len(BBOXES), 4), np.nan)
+    padded[0] = BBOXES
+    padded[2, :2] = BBOXES[:2]
+    expected = np.stack(
+        [
+            image_filter.apply_filter_to_bbox(frame, boxes, "blur", 15)
+            for frame, boxes in zip(frames, ragged)
+        ]
+    )
+
+    result = image_filter.apply_filter_to_batch(
+        frames, ragged, "blur", 15, num_workers=2
+    )
+    buffer = np.empty_like(frames)
+    padded_result = image_filter.apply_filter_to_batch(
+        frames, padded, "blur", 15, out=buffer
+    )
+    image_filter.apply_filter_to_batch(
+        frames,
+        np.nan_to_num(padded),
+        "blur",
+        15,
+        num_boxes=[5, 0, 2],
+        out=frames,
+    )
+
+    np.testing.assert_array_equal(result, expected)
+    assert padded_result is buffer
+    np.testing.assert_array_equal(padded_result, expected)
+    np.testing.assert_array_equal(frames, expected)
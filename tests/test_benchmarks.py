@@ -0,0 +1,31 @@
+"""test script of the benchmark cases."""
+
+from __future__ import annotations
+
+import multiprocessing
+
+import pytest
+
+from benchmarks.cases import CASES
+from benchmarks.run_benchmarks import _format_row, _run_isolated
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_benchmark_case_runs(name: str) -> None:
+    """Every benchmark case sets up and runs on a tiny frame."""
+    func, _ = CASES[name]
+    run, frames_per_call = func((64, 48), 3)
+
+    run()
+
+    assert frames_per_call >= 1
+
+
+def test_failed_case_is_recorded() -> None:
+    """A case whose subprocess dies is recorded instead of hanging."""
+    context = multiprocessing.get_context("spawn")
+
+    result = _run_isolated(context, "missing_case", "720p", 0, 0.0)
+
+    assert result["error"] == "exited with code 1"
+    assert "failed" in _format_row(result)
@@ -0,0 +1,127 @@
+"""test script of the cli module."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import cv2
+import numpy as np
+import pytest
+
+from cogcvutil.cli import load_job, main, parse_shard, plan_units, run_job
+from cogcvutil.video.reader.video_to_images import VideoReader
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _write_job(tmp_path: Path, num_frames: int, output: dict) -> Path:
+    """Write a frame directory, CSV boxes and a job spec blacking them out."""
+    frame_dir = tmp_path / "clip"
+    frame_dir.mkdir()
+    for idx in range(num_frames):
+        frame = np.full((32, 48, 3), 200, dtype=np.uint8)
+        cv2.imwrite(str(frame_dir / f"{idx}.png"), frame)
+    (tmp_path / "boxes.csv").write_text(
+        "input,frame,x1,y1,x2,y2\nclip,1,0,0,10,10\nclip,4,5,5,20,20\n"
+    )
+    job_path = tmp_path / "job.json"
+    job_path.write_text(
+        json.dumps(
+            {
+                "inputs": ["clip"],
+                "boxes": "boxes.csv",
+                "filter": {"type": "black"},
+                "output": {"dir": "out", **output},
+            }
+        )
+    )
+    return job_path
+
+
+def test_shards_split_the_job_and_checkpoints_skip_done_units(
+    tmp_path: Path,
+) -> None:
+    """Two shards cover every frame once and a rerun skips both.
+
+    The one-frame tail is merged into the last unit.
+    """
+    job = load_job(_write_job(tmp_path, 9, {"format": "png"}))
+
+    assert [(unit.start, unit.stop) for unit in plan_units(job, 4)] == [
+        (0, 4),
+        (4, None),
+    ]
+    reports = [run_job(job, (idx, 2), 1, chunk_frames=4) for idx in (0, 1)]
+    rerun = run_job(job, (0, 1), 1, chunk_frames=4)
+
+    assert [report["frames"] for report in reports] == [4, 5]
+    assert rerun["units_skipped"] == 2
+    assert rerun["frames"] == 0
+    frames = sorted((tmp_path / "out" / "clip").iterdir())
+    assert [path.name for path in frames][-1] == "000008.png"
+    assert cv2.imread(str(frames[1]))[:10, :10].max() == 0
+    assert cv2.imread(str(frames[2]))[:10, :10].min() == 200
+
+
+def test_cli_joins_video_segments(
+    tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    """Video output is encoded per unit and joined into one file."""
+    job_path = _write_job(tmp_path, 8, {"format": "mp4", "frame_rate": 10})
+
+    assert (
+        main(
+            [
+                str(job_path),
+                "--workers",
+                "2",
+                "--chunk-frames",
+                "4",
+                "--report",
+                str(tmp_path / "report.json"),
+            ]
+        )
+        == 0
+    )
+
+    assert "8 frames" in capsys.readouterr().out
+    assert json.loads((tmp_path / "report.json").read_text())["units"] == 2
+    with VideoReader(tmp_path / "out" / "clip.mp4") as reader:
+        assert len(list(reader)) == 8
+    assert not (tmp_path / "out" / ".segments" / "clip").exists()
+
+
+def test_join_is_claimed_by_one_shard(tmp_path: Path) -> None:
+    """An input claimed by another shard is left for that shard to join."""
+    job = load_job(_write_job(tmp_path, 8, {"format": "mp4", "frame_rate": 10}))
+    marker = tmp_path / "out" / ".segments" / "clip.joining"
+    marker.parent.mkdir(parents=True)
+    marker.touch()
+
+    run_job(job, (0, 1), 1, chunk_frames=4)
+
+    assert not (tmp_path / "out" / "clip.mp4").exists()
+    assert len(list((tmp_path / "out" / ".segments" / "clip").iterdir())) == 2
+
+    marker.unlink()
+    rerun = run_job(job, (0, 1), 1, chunk_frames=4)
+
+    assert rerun["units_skipped"] == 2
+    with VideoReader(tmp_path / "out" / "clip.mp4") as reader:
+        assert len(list(reader)) == 8
+    assert sorted(path.name for path in (tmp_path / "out").iterdir()) == [
+        ".checkpoints",
+        ".segments",
+        "clip.mp4",
+    ]
+    assert not marker.exists()
+
+
+def test_parse_shard_validates() -> None:
+    """Shards are 'i/N' with 0 <= i < N."""
+    assert parse_shard("1/4") == (1, 4)
+    for shard in ("4/4", "1", "a/b"):
+        with pytest.raises(ValueError, match="Invalid shard"):
+            parse_shard(shard)
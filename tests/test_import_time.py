@@ -0,0 +1,54 @@
+"""test script of the package import time."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("cv2", "numpy", "PIL", "imageio", "imageio_ffmpeg", "torch")
+
+
+def _import_in_subprocess(statement: str) -> dict:
+    """Run `statement` in a fresh interpreter, return the heavy modules."""
+    script = (
+        "import json, sys\n"
+        f"{statement}\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'heavy': heavy}))\n"
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", script],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import cogcvutil",
+        "from cogcvutil.common.converter.color import hex_to_bgr",
+    ],
+)
+def test_import_is_lazy(statement: str) -> None:
+    """Importing the package or a color helper loads no native stack."""
+    report = _import_in_subprocess(statement)
+
+    assert report["heavy"] == []
+
+
+def test_writers_defer_imageio_and_torch() -> None:
+    """The video modules import imageio only when encoding starts."""
+    report = _import_in_subprocess(
+        "import cogcvutil.video.writer.segmented\n"
+        "import cogcvutil.video.reader.video_to_images\n"
+        "from cogcvutil import read_image"
+    )
+
+    assert "imageio" not in report["heavy"]
+    assert "torch" not in report["heavy"]
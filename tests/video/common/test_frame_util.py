@@ -0,0 +1,78 @@
+"""test script of frame_util module."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from cogcvutil.video.common.frame_util import normalize_frame, normalize_frames
+
+
+def test_normalize_frame_passes_uint8_rgb_through() -> None:
+    """Contiguous uint8 RGB frames and stacks are not copied."""
+    frame = np.zeros((4, 6, 3), dtype=np.uint8)
+    stack = np.zeros((20, 4, 6, 3), dtype=np.uint8)
+
+    assert normalize_frame(frame) is frame
+    assert all(np.shares_memory(out, stack) for out in normalize_frames(stack))
+
+
+@pytest.mark.parametrize(
+    ("frame", "expected"),
+    [
+        (np.full((2, 2, 3), 0.5), 128),
+        (np.full((2, 2, 3), 200.4, dtype=np.float32), 200),
+        (np.full((2, 2, 3), 0xABCD, dtype=np.uint16), 0xAB),
+        (np.full((2, 2, 3), 300, dtype=np.int64), 255),
+        (np.ones((2, 2, 3), dtype=bool), 255),
+    ],
+)
+def test_normalize_frame_scales_dtypes(
+    frame: np.ndarray, expected: int
+) -> None:
+    """Floats, uint16, wide integers and bools are scaled to uint8."""
+    out = normalize_frame(frame)
+
+    assert out.dtype == np.uint8
+    assert (out == expected).all()
+
+
+def test_normalize_frames_channel_layouts() -> None:
+    """Gray, BGR and BGRA stacks become contiguous RGB."""
+    gray = np.arange(2 * 3 * 4, dtype=np.uint8).reshape(2, 3, 4)
+    bgra = np.zeros((2, 3, 4, 4), dtype=np.uint8)
+    bgra[..., 0] = 10
+    bgra[..., 2] = 30
+    bgra[..., 3] = 99
+
+    gray_out = list(normalize_frames(gray))
+    bgr_out = list(normalize_frames(bgra[..., :3], color_order="bgr"))
+    bgra_out = list(normalize_frames(iter(bgra), color_order="bgr"))
+
+    np.testing.assert_array_equal(gray_out[1][..., 2], gray[1])
+    for out in bgr_out + bgra_out:
+        assert out.shape == (3, 4, 3)
+        assert out.flags.c_contiguous
+        assert out[0, 0].tolist() == [30, 0, 10]
+    with pytest.raises(ValueError, match="Frames must be"):
+        normalize_frame(np.zeros((3, 4, 2), dtype=np.uint8))
+
+
+def test_normalize_frames_decides_the_float_scale_once() -> None:
+    """A dark byte-scale frame keeps its scale, NaN and Inf are clipped."""
+    bright = np.full((2, 2, 3), 200.0)
+    dark = np.full((2, 2, 3), 0.8)
+
+    stack_out = list(normalize_frames(np.stack([bright, dark])))
+    iter_out = list(normalize_frames(iter([bright, dark])))
+
+    for out in (stack_out, iter_out):
+        assert (out[0] == 200).all()
+        assert (out[1] == 1).all()
+    assert (normalize_frame(dark, value_range="byte") == 1).all()
+    assert (normalize_frame(dark, value_range="unit") == 204).all()
+    special = np.array([np.nan, np.inf, -np.inf], dtype=np.float32)
+    out = normalize_frame(np.broadcast_to(special, (2, 2, 3)))
+    assert out[0, 0].tolist() == [0, 255, 0]
+    with pytest.raises(ValueError, match="value_range must be"):
+        normalize_frame(dark, value_range="percent")
@@ -0,0 +1 @@
+"""Package containing frame pipeline tests."""
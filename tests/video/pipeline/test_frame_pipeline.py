@@ -0,0 +1,62 @@
+"""test script of frame_pipeline module."""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pytest
+
+from cogcvutil.video.pipeline.frame_pipeline import FramePipeline
+
+
+def _frames(num_frames: int) -> list[np.ndarray]:
+    """Return frames whose first pixel holds their index."""
+    return [
+        np.full((4, 4, 3), idx, dtype=np.uint8) for idx in range(num_frames)
+    ]
+
+
+def jitter(frame: np.ndarray) -> np.ndarray:
+    """Sleep for a frame-dependent time so workers finish out of order."""
+    time.sleep(0.001 * (int(frame[0, 0, 0]) % 3))
+    return frame + 1
+
+
+def test_pipeline_preserves_order_and_reports_stats() -> None:
+    """Frames leave a multi-worker pipeline in source order."""
+    written = []
+
+    stats = FramePipeline(
+        _frames(40),
+        [jitter, jitter],
+        written.append,
+        num_workers=[4, 3],
+        queue_size=2,
+    ).run()
+
+    assert [int(frame[0, 0, 0]) for frame in written] == list(range(2, 42))
+    assert stats["frames"] == 40
+    assert [stage["name"] for stage in stats["stages"]] == [
+        "read",
+        "jitter",
+        "jitter",
+        "write",
+    ]
+    assert all(stage["frames"] == 40 for stage in stats["stages"])
+    assert stats["stages"][1]["max_queue_depth"] <= 2
+
+
+def test_pipeline_propagates_stage_errors() -> None:
+    """An exception in a transform stops the pipeline and is re-raised."""
+
+    def fail_on_seven(frame: np.ndarray) -> np.ndarray:
+        if frame[0, 0, 0] == 7:
+            msg = "bad frame"
+            raise RuntimeError(msg)
+        return frame
+
+    with pytest.raises(RuntimeError, match="bad frame"):
+        FramePipeline(
+            _frames(100), [fail_on_seven], lambda _: None, num_workers=2
+        ).run()
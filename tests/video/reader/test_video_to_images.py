@@ -0,0 +1,70 @@
+"""test script of video reader modules."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+from cogcvutil.image.common.utility.io_util import save_image
+from cogcvutil.video.reader.image_directory import ImageDirectoryReader
+from cogcvutil.video.reader.video_to_images import VideoReader
+from cogcvutil.video.writer.images_to_video import VideoWriter
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _frame(value: int) -> np.ndarray:
+    """Return a constant frame whose brightness encodes its index."""
+    return np.full((64, 96, 3), value * 8, dtype=np.uint8)
+
+
+@pytest.fixture
+def video_path(tmp_path: Path) -> Path:
+    """Write a 30 frame, 10 fps test video."""
+    with VideoWriter(tmp_path, "clip", frame_rate=10) as writer:
+        for idx in range(30):
+            writer.add_frame(_frame(idx))
+    return writer.output_path
+
+
+def _indices(frames: list[np.ndarray]) -> list[int]:
+    """Recover frame indices from the encoded brightness."""
+    return [round(frame.mean() / 8) for frame in frames]
+
+
+@pytest.mark.parametrize("backend", ["ffmpeg", "cv2"])
+def test_video_reader_ranges(video_path: Path, backend: str) -> None:
+    """Frame ranges, time ranges, strides and seeks select frames."""
+    reader = VideoReader(video_path, backend=backend, end_frame=12, stride=5)
+    assert len(reader) == 3
+    assert _indices(list(reader)) == [0, 5, 10]
+
+    timed = VideoReader(
+        video_path, backend=backend, start_time=1.0, end_time=1.5, prefetch=2
+    )
+    assert _indices(list(timed)) == [10, 11, 12, 13, 14]
+
+    timed.end_frame = None
+    timed.seek(27)
+    frames = list(timed)
+    assert _indices(frames) == [27, 28, 29]
+    assert frames[0].shape == (64, 96, 3)
+    assert frames[0].flags.writeable
+
+
+def test_reader_chains_into_writer(video_path: Path, tmp_path: Path) -> None:
+    """A reader can feed a writer and a directory reader directly."""
+    image_dir = tmp_path / "frames"
+    image_dir.mkdir()
+    for idx in range(6):
+        save_image(_frame(idx), image_dir / f"{idx}.png")
+
+    with VideoReader(video_path, stride=10) as reader:
+        VideoWriter(tmp_path, "copy", frame_rate=1).write(reader)
+    source = ImageDirectoryReader(image_dir, fps=2, start_time=1, stride=2)
+
+    assert len(VideoReader(tmp_path / "copy.mp4")) == 3
+    assert _indices(list(source)) == [2, 4]
@@ -0,0 +1,127 @@
+"""test script of gif_writer module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+from PIL import Image, ImageSequence
+
+from cogcvutil.video.writer.gif_writer import (
+    GifWriter,
+    median_cut_palette,
+    palette_lut,
+    quantize,
+)
+from cogcvutil.video.writer.images_to_video import VideoWriter
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+COLORS = np.array(
+    [[0, 0, 0], [255, 0, 0], [0, 200, 0], [40, 40, 255], [250, 250, 250]],
+    dtype=np.uint8,
+)
+
+
+def _moving_square(num_frames: int) -> list[np.ndarray]:
+    """Return frames of a square moving over a static background."""
+    frames = []
+    for idx in range(num_frames):
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        frame[:, 32:] = COLORS[3]
+        frame[10:20, 2 * idx : 2 * idx + 10] = COLORS[1 + idx % 2]
+        frame[40:, :8] = COLORS[4]
+        frames.append(frame)
+    return frames
+
+
+def _read_gif(path: Path) -> tuple[list[np.ndarray], list[int]]:
+    """Decode every composited frame and its duration."""
+    with Image.open(path) as gif:
+        frames, durations = [], []
+        for frame in ImageSequence.Iterator(gif):
+            frames.append(np.asarray(frame.convert("RGB")))
+            durations.append(frame.info["duration"])
+    return frames, durations
+
+
+def test_median_cut_palette_and_lut() -> None:
+    """Few distinct colors get exact palette entries and lookups."""
+    pixels = np.repeat(COLORS, 50, axis=0)
+
+    palette = median_cut_palette(pixels, 255)
+    indices = quantize(pixels.reshape(1, -1, 3), palette_lut(palette[:255]))
+
+    np.testing.assert_array_equal(palette[indices[0]], pixels)
+
+
+def test_gif_writer_frame_diff_round_trip(tmp_path: Path) -> None:
+    """Differenced frames decode to the original frames and timing."""
+    expected = _moving_square(12)
+    for frame_diff in (True, False):
+        writer = GifWriter(
+            tmp_path / f"{frame_diff}.gif", fps=30, frame_diff=frame_diff
+        )
+        for frame in expected:
+            writer.append_data(frame)
+        writer.close()
+
+        frames, durations = _read_gif(writer.path)
+        assert len(frames) == 12
+        for got, want in zip(frames, expected):
+            np.testing.assert_array_equal(got, want)
+        assert durations[:3] == [30, 40, 30]
+
+    diffed = (tmp_path / "True.gif").stat().st_size
+    assert diffed < (tmp_path / "False.gif").stat().st_size
+
+
+def test_gif_writer_expands_gray_frames(tmp_path: Path) -> None:
+    """Gray frames are written as RGB, other channel counts are refused."""
+    gray = _moving_square(2)[1][..., 1]
+    writer = GifWriter(tmp_path / "gray.gif")
+    writer.append_data(gray)
+    writer.append_data(gray[..., None])
+    with pytest.raises(ValueError, match="Frames must be"):
+        writer.append_data(np.zeros((*gray.shape, 2), dtype=np.uint8))
+    writer.close()
+
+    frames, _ = _read_gif(writer.path)
+    assert len(frames) == 2
+    for got in frames:
+        np.testing.assert_array_equal(got, np.dstack([gray] * 3))
+
+
+def test_gif_writer_palette_interval(tmp_path: Path) -> None:
+    """Each group of frames gets its own local palette."""
+    first = np.full((16, 16, 3), (10, 20, 200), dtype=np.uint8)
+    second = np.full((16, 16, 3), (230, 120, 5), dtype=np.uint8)
+    writer = GifWriter(tmp_path / "clip.gif", palette_interval=2)
+    for frame in (first, first, second, second, second):
+        writer.append_data(frame)
+    writer.close()
+
+    frames, _ = _read_gif(writer.path)
+    assert [frame[0, 0].tolist() for frame in frames] == [
+        [10, 20, 200],
+        [10, 20, 200],
+        [230, 120, 5],
+        [230, 120, 5],
+        [230, 120, 5],
+    ]
+
+
+def test_video_writer_streams_gif(tmp_path: Path) -> None:
+    """VideoWriter writes GIFs through GifWriter."""
+    with VideoWriter(
+        tmp_path, "clip", output_extension="gif", streaming=True
+    ) as writer:
+        for frame in _moving_square(6):
+            writer.add_frame(frame)
+
+    assert isinstance(writer.video_writer, GifWriter)
+    frames, durations = _read_gif(writer.output_path)
+    assert len(frames) == 6
+    assert durations == [50] * 6
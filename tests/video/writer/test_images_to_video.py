@@ -0,0 +1,114 @@
+"""test script of images_to_video module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import imageio
+import numpy as np
+import pytest
+
+from cogcvutil.video.writer.images_to_video import VideoWriter, encoder_params
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _frames(num_frames: int = 8) -> list[np.ndarray]:
+    """Return a list of small random RGB frames."""
+    rng = np.random.default_rng(0)
+    return [
+        rng.integers(0, 255, (64, 64, 3), dtype=np.uint8)
+        for _ in range(num_frames)
+    ]
+
+
+def test_streaming_add_frame_does_not_buffer(tmp_path: Path) -> None:
+    """Streaming writer encodes frames without keeping them around."""
+    with VideoWriter(tmp_path, "clip", streaming=True) as writer:
+        for frame in _frames():
+            writer.add_frame(frame)
+            assert writer.frame_sequence == []
+
+    assert writer.output_path.exists()
+    assert imageio.get_reader(str(writer.output_path)).count_frames() == 8
+
+
+def test_close_encodes_buffered_frames(tmp_path: Path) -> None:
+    """Buffered frames are encoded by close and close is idempotent."""
+    writer = VideoWriter(tmp_path, "clip")
+    for frame in _frames(4):
+        writer.add_frame(frame)
+    writer.close()
+    writer.close()
+
+    assert imageio.get_reader(str(writer.output_path)).count_frames() == 4
+
+
+def test_read_image_from_dir_is_lazy(tmp_path: Path) -> None:
+    """Frames from a directory are decoded while the video is written."""
+    image_dir = tmp_path / "frames"
+    image_dir.mkdir()
+    for idx, frame in enumerate(_frames(5)):
+        imageio.imwrite(image_dir / f"{idx}.png", frame)
+
+    writer = VideoWriter(tmp_path, "clip", read_image_from_dir=image_dir)
+    assert writer.frame_sequence == []
+    writer.write()
+
+    assert imageio.get_reader(str(writer.output_path)).count_frames() == 5
+
+
+def test_odd_frames_are_padded_not_resized(tmp_path: Path) -> None:
+    """Odd-sized frames are padded to even sizes by edge replication."""
+    frame = np.zeros((45, 63, 3), dtype=np.uint8)
+    frame[:, -1] = 255
+    with VideoWriter(tmp_path, "clip", preset="realtime", threads=2) as writer:
+        for _ in range(3):
+            writer.add_frame(frame)
+
+    reader = imageio.get_reader(str(writer.output_path))
+    assert reader.get_meta_data()["size"] == (64, 46)
+    decoded = reader.get_data(0)
+    assert decoded[:, 62:].mean() > 200
+    assert decoded[:, :60].mean() < 20
+
+
+def test_encoder_params() -> None:
+    """Presets map to ffmpeg options and need an x264/x265 codec."""
+    assert encoder_params("archive", threads=4) == [
+        "-preset",
+        "slow",
+        "-crf",
+        "18",
+        "-threads",
+        "4",
+    ]
+    assert encoder_params() == []
+    with pytest.raises(ValueError, match="Unknown encoder preset"):
+        encoder_params("fastest")
+    with pytest.raises(ValueError, match="libx264"):
+        encoder_params("balanced", codec="mpeg4")
+
+
+def test_write_accepts_float_arrays(tmp_path: Path) -> None:
+    """(N, H, W, C) float stacks in [0, 1] are scaled, not truncated."""
+    frames = np.full((6, 32, 32, 3), 0.75, dtype=np.float32)
+
+    writer = VideoWriter(tmp_path, "clip", frame_sequence=frames)
+    writer.write()
+
+    reader = imageio.get_reader(str(writer.output_path))
+    assert reader.count_frames() == 6
+    assert abs(reader.get_data(0).mean() - 191) < 4
+
+
+def test_streaming_keeps_the_first_float_scale(tmp_path: Path) -> None:
+    """A dark frame after a byte-scale frame is not scaled by 255."""
+    with VideoWriter(tmp_path, "clip", streaming=True) as writer:
+        writer.add_frame(np.full((32, 32, 3), 200.0))
+        writer.add_frame(np.full((32, 32, 3), 0.9))
+
+    assert writer.value_range == "byte"
+    reader = imageio.get_reader(str(writer.output_path))
+    assert reader.get_data(1).mean() < 8
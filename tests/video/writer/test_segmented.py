@@ -0,0 +1,86 @@
+"""test script of segmented module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+from cogcvutil.video.reader.video_to_images import VideoReader
+from cogcvutil.video.writer.images_to_video import VideoWriter
+from cogcvutil.video.writer.segmented import (
+    SegmentedVideoWriter,
+    concat_segments,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _frame(value: int) -> np.ndarray:
+    """Return a constant frame whose brightness encodes its index."""
+    return np.full((48, 64, 3), value * 8, dtype=np.uint8)
+
+
+def test_segmented_writer_matches_single_stream(tmp_path: Path) -> None:
+    """Segments are joined in order into a single-stream-like file."""
+    with SegmentedVideoWriter(
+        tmp_path,
+        "segmented",
+        frame_rate=10,
+        frame_sequence=(_frame(idx) for idx in range(20)),
+        segment_frames=8,
+        gop_size=4,
+        num_workers=2,
+        preset="realtime",
+    ) as writer:
+        for idx in range(20, 25):
+            writer.add_frame(_frame(idx))
+    with VideoWriter(tmp_path, "single", frame_rate=10) as single:
+        for idx in range(25):
+            single.add_frame(_frame(idx))
+
+    with VideoReader(writer.output_path) as reader:
+        frames = list(reader)
+        fps = reader.fps
+    with VideoReader(single.output_path) as reader:
+        assert fps == reader.fps
+
+    assert [round(frame.mean() / 8) for frame in frames] == list(range(25))
+    assert not [path for path in tmp_path.iterdir() if path.is_dir()]
+
+
+def test_segmented_writer_validates_arguments(tmp_path: Path) -> None:
+    """Segments must be GOP aligned and non-empty."""
+    with pytest.raises(ValueError, match="multiple of gop_size"):
+        SegmentedVideoWriter(tmp_path, "clip", segment_frames=10, gop_size=4)
+    with pytest.raises(ValueError, match="empty"):
+        SegmentedVideoWriter(tmp_path, "clip").write()
+
+
+def test_segmented_writer_decides_the_float_scale_once(
+    tmp_path: Path,
+) -> None:
+    """Segments of dark float frames keep the scale of the first frame."""
+    with SegmentedVideoWriter(
+        tmp_path, "clip", segment_frames=4, gop_size=4, num_workers=2
+    ) as writer:
+        for value in [200.0] * 4 + [0.9] * 8:
+            writer.add_frame(np.full((48, 64, 3), value))
+
+    assert writer.writer_kwargs["value_range"] == "byte"
+    with VideoReader(writer.output_path) as reader:
+        frames = list(reader)
+    assert [round(frame.mean()) for frame in frames[3:5]] == [200, 1]
+    assert frames[-1].mean() < 8
+
+
+def test_concat_segments_reports_ffmpeg_errors(tmp_path: Path) -> None:
+    """A failed join raises with ffmpeg's error output."""
+    segments = [tmp_path / "a.mp4", tmp_path / "b.mp4"]
+    for segment in segments:
+        segment.write_bytes(b"not a video")
+
+    with pytest.raises(RuntimeError, match=r"(?s)failed to join.+a\.mp4"):
+        concat_segments(segments, tmp_path / "joined.mp4")